@@ -0,0 +1,133 @@
+"""
+Import-time profile of the editor and the headless renderer.
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 15] [--first-paint]
+
+Every entry module is imported in a fresh interpreter under
+`python -X importtime`. The report gives the median wall time and the
+slowest imports by cumulative time. It also names any module that should
+be loaded on first use but was imported at startup; the exit status is 1
+if there is one. `--first-paint` also measures the time from interpreter
+start to the first paint of the main window, on Qt's offscreen platform.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Entry module -> modules it must not import at startup.
+DEFERRED = {
+    "audio_editor.ui.main_window": [
+        "sounddevice",
+        "audio_editor.infrastructure.audio.sounddevice_backend",
+        "audio_editor.infrastructure.persistence.project_file",
+        "audio_editor.services.file_import",
+        "audio_editor.services.mix_cache",
+        "audio_editor.services.mix_export",
+        "audio_editor.services.playback",
+        "audio_editor.services.stem_export",
+    ],
+    "audio_editor.app.render_cli": [
+        "PySide6",
+        "sounddevice",
+    ],
+}
+
+FIRST_PAINT = """
+import os, sys, time
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from audio_editor.ui.main_window import MainWindow
+window = MainWindow()
+
+class FirstPaint(QObject):
+    def eventFilter(self, target, event):
+        if target is window and event.type() == QEvent.Paint:
+            print(time.time() - float(os.environ["BENCH_START"]))
+            app.quit()
+        return False
+
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+window.show()
+app.exec()
+"""
+
+
+def _env(**extra: str) -> dict:
+    env = dict(os.environ, **extra)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return env
+
+
+def profile_import(module: str) -> tuple[float, dict[str, int], list[str]]:
+    """Wall seconds, cumulative microseconds per imported module, and the deferred modules that were loaded."""
+    check = f"import sys; print(' '.join(m for m in {DEFERRED.get(module, [])!r} if m in sys.modules))"
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; {check}"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+    elapsed = time.perf_counter() - started
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        total, name = parts[1].strip(), parts[2].strip()
+        if total.isdigit():
+            cumulative[name] = int(total)
+    return elapsed, cumulative, result.stdout.split()
+
+
+def first_paint_seconds() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT],
+        capture_output=True,
+        text=True,
+        env=_env(QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"), BENCH_START=repr(time.time())),
+        check=True,
+    )
+    return float(result.stdout.split()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--first-paint", action="store_true")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in DEFERRED:
+        runs = [profile_import(module) for _ in range(args.repeat)]
+        wall = statistics.median(run[0] for run in runs)
+        print(f"{module}: {wall * 1000:.1f} ms median over {args.repeat} run(s)")
+        cumulative = runs[-1][1]
+        for name, micros in sorted(cumulative.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"  {micros / 1000:8.1f} ms  {name}")
+        loaded = runs[-1][2]
+        if loaded:
+            failed = True
+            print(f"  imported at startup but should be deferred: {', '.join(loaded)}")
+
+    if args.first_paint:
+        times = [first_paint_seconds() for _ in range(args.repeat)]
+        print(f"first paint: {statistics.median(times) * 1000:.1f} ms median over {args.repeat} run(s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+`vibecore-render`: headless project renderer.
+
+Loads a project with the domain layer only and writes its mix or stems
+as WAV files, optionally limited to some tracks and a time region.
+Nothing reachable from here imports Qt or an audio device library, so it
+runs on servers without a display or sound card.
+
+    vibecore-render info song.vcoreproj
+    vibecore-render mix song.vcoreproj song.wav --format pcm24 --start 30 --end 90
+    vibecore-render stems song.vcoreproj stems/ --group "Drums=Kick,Snare" --track Bass
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.wav_file import SAMPLE_FORMATS
+from audio_editor.infrastructure.persistence.project_file import load_project
+from audio_editor.services.mix_export import export_mix_wav
+from audio_editor.services.stem_export import Stem, StemExportJob, track_stems
+
+
+class CommandError(Exception):
+    """A problem with the command line that is reported without a traceback."""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vibecore-render", description="Render VibeCore projects without the editor.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="list the tracks of a project")
+    info.add_argument("project")
+
+    for name, target, summary in (
+        ("mix", "output", "write the mix to one WAV file"),
+        ("stems", "directory", "write one WAV file per track or group"),
+    ):
+        command = commands.add_parser(name, help=summary)
+        command.add_argument("project")
+        command.add_argument(target)
+        command.add_argument("--format", choices=sorted(SAMPLE_FORMATS), default="pcm16")
+        command.add_argument("--start", type=float, default=0.0, metavar="SECONDS", help="region start")
+        command.add_argument("--end", type=float, default=None, metavar="SECONDS", help="region end (default: project end)")
+        command.add_argument(
+            "--track",
+            action="append",
+            default=[],
+            metavar="NAME_OR_ID",
+            help="only use this track; may be repeated",
+        )
+        command.add_argument("--workers", type=int, default=None, help="render threads (default: one per core)")
+    commands.choices["stems"].add_argument(
+        "--group",
+        action="append",
+        default=[],
+        metavar="NAME=TRACK,TRACK",
+        help="mix these tracks into one stem; may be repeated",
+    )
+    return parser
+
+
+def _find_track(tracks: Sequence[AudioTrack], key: str) -> AudioTrack:
+    for track in tracks:
+        if track.track_id == key:
+            return track
+    matches = [track for track in tracks if track.name == key]
+    if len(matches) != 1:
+        reason = "no track" if not matches else f"{len(matches)} tracks"
+        raise CommandError(f"{reason} named {key!r}; use a track id from `vibecore-render info`")
+    return matches[0]
+
+
+def _selected_tracks(tracks: Sequence[AudioTrack], keys: Sequence[str]) -> list[AudioTrack]:
+    if not keys:
+        return list(tracks)
+    return [_find_track(tracks, key) for key in keys]
+
+
+def _region(tracks: Sequence[AudioTrack], start: float, end: float | None) -> tuple[int, int | None]:
+    sample_rate = tracks[0].sample_rate if tracks else 44100
+    if start < 0 or (end is not None and end <= start):
+        raise CommandError("the region must satisfy 0 <= --start < --end")
+    return round(start * sample_rate), None if end is None else round(end * sample_rate)
+
+
+def _parse_group(tracks: Sequence[AudioTrack], spec: str) -> Stem:
+    name, separator, members = spec.partition("=")
+    keys = [key.strip() for key in members.split(",") if key.strip()]
+    if not separator or not name.strip() or not keys:
+        raise CommandError(f"bad --group {spec!r}; expected NAME=TRACK,TRACK")
+    return Stem(name.strip(), tuple(_find_track(tracks, key) for key in keys))
+
+
+def _info(args: argparse.Namespace) -> int:
+    project = load_project(args.project)
+    print(f"{project.name}: {project.track_count()} track(s)")
+    for track in project.tracks:
+        flags = " muted" if track.muted else ""
+        seconds = track.sample_count / max(track.sample_rate, 1)
+        print(f"  {track.track_id}  {track.name!r}  {track.sample_rate} Hz  {seconds:.3f} s  volume {track.volume:g}{flags}")
+    return 0
+
+
+def _mix(args: argparse.Namespace) -> int:
+    project = load_project(args.project)
+    tracks = _selected_tracks(project.tracks, args.track)
+    start, stop = _region(tracks, args.start, args.end)
+    frames = export_mix_wav(
+        tracks,
+        args.output,
+        sample_format=args.format,
+        workers=args.workers,
+        start=start,
+        stop=stop,
+    )
+    print(f"Wrote {args.output} ({frames} frames)")
+    return 0
+
+
+def _stems(args: argparse.Namespace) -> int:
+    project = load_project(args.project)
+    tracks = project.tracks
+    stems = [_parse_group(tracks, spec) for spec in args.group]
+    if args.track or not stems:
+        stems += track_stems(_selected_tracks(tracks, args.track))
+    if not stems:
+        raise CommandError("nothing to export")
+    start, stop = _region(tracks, args.start, args.end)
+    job = StemExportJob(stems, args.directory, args.format, max_workers=args.workers, start=start, stop=stop)
+    job.directory.mkdir(parents=True, exist_ok=True)
+    job.start()
+    failed = 0
+    try:
+        for exported in job.wait():
+            if exported.error is None:
+                print(f"Wrote {exported.path} ({exported.frames} frames)")
+            else:
+                failed += 1
+                print(f"Failed {exported.path}: {exported.error}", file=sys.stderr)
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        print("Cancelled", file=sys.stderr)
+        return 130
+    return 1 if failed else 0
+
+
+COMMANDS = {"info": _info, "mix": _mix, "stems": _stems}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except (CommandError, OSError, ValueError) as exc:
+        print(f"vibecore-render: {exc}", file=sys.stderr)
+        return 2 if isinstance(exc, CommandError) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
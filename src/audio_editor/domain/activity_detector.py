@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import weakref
+from bisect import bisect_right
+
+import numpy as np
+
+from .audio_track import AudioTrack
+
+
+def moving_average_envelope(samples: np.ndarray, window: int) -> np.ndarray:
+    """
+    Centered moving average of |samples| over `window` samples.
+
+    Equivalent to `np.convolve(abs, ones(window) / window, mode="same")`, but
+    computed from one cumulative sum, so the cost does not depend on the window.
+    """
+    magnitudes = np.abs(np.asarray(samples, dtype=np.float32))
+    if window <= 1 or magnitudes.size == 0:
+        return magnitudes
+    n = magnitudes.size
+    cumulative = np.empty(n + 1, dtype=np.float64)
+    cumulative[0] = 0.0
+    np.cumsum(magnitudes, dtype=np.float64, out=cumulative[1:])
+    index = np.arange(n)
+    lo = np.maximum(index - window // 2, 0)
+    hi = np.minimum(index + (window - 1) // 2 + 1, n)
+    return ((cumulative[hi] - cumulative[lo]) / float(window)).astype(np.float32)
+
+
+def mask_runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (starts, ends) of the True runs in a boolean mask, ends exclusive."""
+    padded = np.concatenate(([False], np.asarray(mask, dtype=bool), [False]))
+    edges = np.flatnonzero(np.diff(padded.view(np.int8)))
+    return edges[0::2], edges[1::2]
+
+
+def merge_close_runs(starts: np.ndarray, ends: np.ndarray, max_gap: int) -> tuple[np.ndarray, np.ndarray]:
+    """Merge consecutive runs separated by at most `max_gap` samples."""
+    if starts.size <= 1:
+        return starts, ends
+    separate = (starts[1:] - ends[:-1]) > max_gap
+    keep_start = np.concatenate(([True], separate))
+    keep_end = np.concatenate((separate, [True]))
+    return starts[keep_start], ends[keep_end]
+
+
+class ActivityDetector:
+    """
+    Finds regions of audible material ("clips") in a track.
+
+    The envelope is a 20 ms moving average of the magnitude, runs closer
+    than 200 ms are merged so a single clip is not split at quiet moments.
+    Results are cached per track and sample version, so repeated hit tests
+    on an unchanged track cost a binary search.
+    """
+
+    ENVELOPE_SECONDS = 0.02
+    MERGE_GAP_SECONDS = 0.2
+
+    def __init__(self) -> None:
+        self._cache: dict[int, tuple[weakref.ref, tuple, list[tuple[int, int]]]] = {}
+
+    def detect(self, samples: np.ndarray, sample_rate: int, threshold: float = 1e-3) -> list[tuple[int, int]]:
+        """Audio runs in a raw sample array as (start, end) pairs, end exclusive."""
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.size == 0:
+            return []
+        rate = max(int(sample_rate), 1)
+        window = max(1, int(rate * self.ENVELOPE_SECONDS))
+        envelope = moving_average_envelope(samples, window)
+        # More permissive floor for whole-clip picking in None tool mode.
+        mask = envelope > max(1e-6, threshold * 0.25)
+        starts, ends = mask_runs(mask)
+        if starts.size == 0:
+            return []
+        merge_gap = max(1, int(rate * self.MERGE_GAP_SECONDS))
+        starts, ends = merge_close_runs(starts, ends, merge_gap)
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def runs(self, track: AudioTrack, threshold: float = 1e-3) -> list[tuple[int, int]]:
+        """Cached audio runs for a track; recomputed only after its samples change."""
+        key = (track.sample_version, track.sample_rate, float(threshold))
+        cached = self._cache.get(id(track))
+        if cached is not None and cached[0]() is track and cached[1] == key:
+            return cached[2]
+        runs = self.detect(track.data, track.sample_rate, threshold)
+        self._cache = {k: v for k, v in self._cache.items() if v[0]() is not None}
+        self._cache[id(track)] = (weakref.ref(track), key, runs)
+        return runs
+
+    def run_boundaries(self, track: AudioTrack, threshold: float = 1e-3) -> set[int]:
+        """Start (when > 0) and end sample of every audio run."""
+        boundaries: set[int] = set()
+        for start, end in self.runs(track, threshold):
+            if start > 0:
+                boundaries.add(start)
+            boundaries.add(end)
+        return boundaries
+
+    def run_at(self, track: AudioTrack, sample_index: int, threshold: float = 1e-3) -> tuple[int, int] | None:
+        """The audio run containing sample_index, if any."""
+        runs = self.runs(track, threshold)
+        pos = bisect_right(runs, (int(sample_index), float("inf"))) - 1
+        if pos >= 0 and runs[pos][0] <= sample_index < runs[pos][1]:
+            return runs[pos]
+        return None
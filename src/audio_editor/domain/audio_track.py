@@ -1,13 +1,25 @@
+from __future__ import annotations
+
+import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable
+
 import numpy as np
 
+from .peak_pyramid import PeakPyramid
+from .sample_store import SampleStore
+from .segment_index import SegmentIndex
+
 
 @dataclass
 class AudioTrack:
     """ 
     Core domain entity representing an audio track.
     Holds name, sample_rate, waveform data, and optional file path.
+
+    Samples live in a piece-table `SampleStore`; `data` is a read-only
+    contiguous view that is only materialized on first access after an edit.
     """
     name: str
     sample_rate: int
@@ -15,100 +27,228 @@ class AudioTrack:
     file_path: Path | None = None
     volume: float = 1.0  # 100% by default
     muted: bool = False
-    sample_boundaries: list[int] = field(default_factory=list)
+    sample_boundaries: SegmentIndex = field(default_factory=SegmentIndex)
+    # Stable identity for lookups, UI state and project files; survives undo and reload.
+    track_id: str = field(default_factory=lambda: uuid.uuid4().hex, compare=False)
+
+    # Set by EditHistory while an undo transaction is open; called after every splice.
+    _edit_recorder: Callable[[AudioTrack, int, list[np.ndarray], int], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Set by the owning Project; called as (track, kind, start, stop) after every change.
+    _change_listener: Callable[[AudioTrack, str, int, int], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Sample range edited since the last take_dirty_range(); see dirty_range.
+    _dirty_range: tuple[int, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _PARAM_FIELDS = frozenset({"name", "sample_rate", "file_path", "volume", "muted", "sample_boundaries"})
 
     def __post_init__(self) -> None:
-        self.set_data(self.data, reset_boundaries=True)
+        self.reset_boundaries()
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == "data":
+            if "_store" in self.__dict__:
+                self._splice(0, self.sample_count, value)
+            else:
+                store = SampleStore(value)
+                super().__setattr__("_store", store)
+                super().__setattr__("_peaks", PeakPyramid(store))
+                super().__setattr__("_version", 0)
+            return
+        if name == "sample_boundaries" and not isinstance(value, SegmentIndex):
+            value = SegmentIndex(value)
+        super().__setattr__(name, value)
+        if name in self._PARAM_FIELDS and "_store" in self.__dict__:
+            self._notify("params_changed")
+
+    def __getattr__(self, name: str):
+        # Only reached when `data` has not been materialized since the last edit.
+        if name == "data" and "_store" in self.__dict__:
+            flat = self._store.to_array()
+            self.__dict__["data"] = flat
+            return flat
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._store)
+
+    @property
+    def version(self) -> int:
+        """Increases on every change to samples, parameters or boundaries."""
+        return self._version
+
+    @property
+    def sample_version(self) -> int:
+        """Increases on every sample edit; use it to key caches derived from samples."""
+        return self._store.version
+
+    @property
+    def dirty_range(self) -> tuple[int, int] | None:
+        """Sample range [start, stop) edited since the last `take_dirty_range()`."""
+        return self._dirty_range
+
+    def take_dirty_range(self) -> tuple[int, int] | None:
+        dirty = self._dirty_range
+        self._dirty_range = None
+        return dirty
+
+    def _notify(self, kind: str, start: int = 0, stop: int = 0) -> None:
+        self.__dict__["_version"] = self.__dict__.get("_version", 0) + 1
+        if self._change_listener is not None:
+            self._change_listener(self, kind, start, stop)
+
+    @property
+    def peaks(self) -> PeakPyramid:
+        """Per-track min/max/RMS pyramid; stale buckets are rebuilt on `refresh()`."""
+        return self._peaks
+
+    def restore_peaks(self, sample_count: int, bucket_sizes: tuple[int, ...], levels) -> bool:
+        """Adopt precomputed pyramid levels (e.g. from a sidecar file) if they fit the current samples."""
+        try:
+            pyramid = PeakPyramid.from_raw_levels(self._store, sample_count, bucket_sizes, levels)
+        except ValueError:
+            return False
+        self._peaks = pyramid
+        return True
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return samples in [start, stop) without materializing the whole track."""
+        return self._store.read(start, stop)
+
+    def sample_snapshot(self) -> SampleStore:
+        """Frozen copy of the current samples that shares buffers with the track."""
+        return self._store.snapshot()
+
+    def detach_samples(self, predicate: Callable[[np.ndarray], bool]) -> int:
+        """Copy the sample pieces `predicate` selects into private memory, dropping any `data` view of them."""
+        copied = self._store.detach(predicate)
+        if copied:
+            self.__dict__.pop("data", None)
+        return copied
+
+    def _splice(self, start: int, stop: int, incoming=None) -> list[np.ndarray]:
+        old_len = len(self._store)
+        start = int(min(max(start, 0), old_len))
+        removed = self._store.splice(start, stop, incoming)
+        removed_len = sum(piece.size for piece in removed)
+        inserted_len = len(self._store) - old_len + removed_len
+        self._peaks.invalidate(start, start + removed_len, start + inserted_len)
+        self.__dict__.pop("data", None)
+        # A length change moves every later sample, so the dirty range runs to the end.
+        stop = start + inserted_len if inserted_len == removed_len else len(self._store)
+        if removed or inserted_len:
+            previous = self.__dict__.get("_dirty_range")
+            if previous is not None:
+                start_d, stop_d = min(previous[0], start), min(max(previous[1], stop), len(self._store))
+            else:
+                start_d, stop_d = start, stop
+            self.__dict__["_dirty_range"] = (start_d, stop_d)
+            self._notify("samples_changed", start, stop)
+        if self._edit_recorder is not None:
+            self._edit_recorder(self, start, removed, inserted_len)
+        return removed
+
+    def is_silent(self, start: int, stop: int, threshold: float = 1e-6) -> bool:
+        """True if no |sample| in [start, stop) exceeds threshold (O(log n) via the peak index)."""
+        return self._peaks.max_abs(start, stop) <= threshold
+
+    def next_audio_index(self, start: int, threshold: float = 1e-6) -> int | None:
+        """First sample at or after start whose magnitude exceeds threshold."""
+        return self._peaks.first_above(start, threshold)
+
+    def _has_audio(self, start: int, stop: int, threshold: float) -> bool:
+        return not self.is_silent(start, stop, threshold)
 
     def set_data(self, data: np.ndarray, reset_boundaries: bool = True) -> None:
-        arr = np.asarray(data, dtype=np.float32).flatten()
-        self.data = arr
+        self._splice(0, self.sample_count, data)
         if reset_boundaries:
-            self.sample_boundaries = [len(arr)] if len(arr) > 0 else []
+            self.reset_boundaries()
         else:
             self._normalize_boundaries()
 
+    def reset_boundaries(self) -> None:
+        length = self.sample_count
+        self.sample_boundaries = SegmentIndex([length] if length > 0 else [])
+
+    def set_boundaries(self, boundaries) -> None:
+        """Replace all boundaries, dropping any outside (0, sample_count]."""
+        self.sample_boundaries = SegmentIndex(boundaries)
+        self._normalize_boundaries()
+
     def append_data(self, data: np.ndarray, as_new_segment: bool = True) -> None:
-        incoming = np.asarray(data, dtype=np.float32).flatten()
+        incoming = np.asarray(data, dtype=np.float32).reshape(-1)
         if incoming.size == 0:
             return
 
-        current = np.asarray(self.data, dtype=np.float32).flatten()
-        prev_len = len(current)
-        self.data = np.concatenate([current, incoming])
+        prev_len = self.sample_count
+        self._splice(prev_len, prev_len, incoming)
+        new_len = self.sample_count
 
         if as_new_segment:
-            if prev_len > 0 and prev_len not in self.sample_boundaries:
-                self.sample_boundaries.append(prev_len)
-            self.sample_boundaries.append(len(self.data))
+            if prev_len > 0:
+                self.sample_boundaries.add(prev_len)
+            self.sample_boundaries.add(new_len)
         else:
-            if self.sample_boundaries:
-                self.sample_boundaries[-1] = len(self.data)
-            else:
-                self.sample_boundaries = [len(self.data)]
+            self.sample_boundaries.replace_last(new_len)
 
         self._normalize_boundaries()
 
     def split_sample_at(self, sample_index: int) -> bool:
-        if len(self.data) < 2:
+        length = self.sample_count
+        if length < 2:
             return False
-        idx = int(np.clip(sample_index, 0, len(self.data)))
-        if idx <= 0 or idx >= len(self.data):
+        idx = int(np.clip(sample_index, 0, length))
+        if idx <= 0 or idx >= length:
             return False
-        if idx in self.sample_boundaries:
+        if not self.sample_boundaries.add(idx):
             return False
-
-        self.sample_boundaries.append(idx)
-        self._normalize_boundaries()
+        self._notify("params_changed")
         return True
 
     def nearest_boundary(self, sample_index: int) -> int:
-        idx = int(np.clip(sample_index, 0, len(self.data)))
-        candidates = [0, *self.sample_boundaries]
-        return min(candidates, key=lambda boundary: abs(boundary - idx))
+        idx = int(np.clip(sample_index, 0, self.sample_count))
+        nearest = self.sample_boundaries.nearest(idx)
+        # The track start (0) is always a candidate and wins ties.
+        if nearest is None or idx <= abs(nearest - idx):
+            return 0
+        return nearest
 
     def next_boundary_after(self, sample_index: int) -> int:
-        idx = int(np.clip(sample_index, 0, len(self.data)))
-        for boundary in self.sample_boundaries:
-            if boundary > idx:
-                return boundary
-        return len(self.data)
+        idx = int(np.clip(sample_index, 0, self.sample_count))
+        boundary = self.sample_boundaries.next_after(idx)
+        return self.sample_count if boundary is None else boundary
 
     def previous_boundary_before(self, sample_index: int) -> int:
-        idx = int(np.clip(sample_index, 0, len(self.data)))
-        prev = 0
-        for boundary in self.sample_boundaries:
-            if boundary >= idx:
-                return prev
-            prev = boundary
-        return prev
+        idx = int(np.clip(sample_index, 0, self.sample_count))
+        boundary = self.sample_boundaries.previous_before(idx)
+        return 0 if boundary is None else boundary
 
     def cut_range(self, start_index: int, end_index: int) -> bool:
-        if len(self.data) == 0:
+        length = self.sample_count
+        if length == 0:
             return False
 
-        start = int(np.clip(start_index, 0, len(self.data)))
-        end = int(np.clip(end_index, 0, len(self.data)))
+        start = int(np.clip(start_index, 0, length))
+        end = int(np.clip(end_index, 0, length))
         if end <= start:
             return False
 
-        arr = np.asarray(self.data, dtype=np.float32).flatten()
-        remove_len = end - start
-        self.data = np.concatenate([arr[:start], arr[end:]])
-
-        updated_boundaries: list[int] = []
-        for boundary in self.sample_boundaries:
-            if boundary <= start:
-                updated_boundaries.append(boundary)
-            elif boundary <= end:
-                continue
-            else:
-                updated_boundaries.append(boundary - remove_len)
-
-        self.sample_boundaries = updated_boundaries
+        self._splice(start, end)
+        self.sample_boundaries.ripple_cut(start, end)
         self._normalize_boundaries()
         return True
 
+    def clear_range(self, start_index: int, end_index: int) -> bool:
+        """Overwrite [start, end) with silence, keeping the track length."""
+        start = int(np.clip(start_index, 0, self.sample_count))
+        end = int(np.clip(end_index, 0, self.sample_count))
+        if end <= start:
+            return False
+        self._splice(start, end, np.zeros(end - start, dtype=np.float32))
+        return True
+
     def insert_data(
         self,
         insert_index: int,
@@ -116,53 +256,36 @@ class AudioTrack:
         as_new_segment: bool = True,
         allow_gaps: bool = False,
     ) -> bool:
-        incoming = np.asarray(data, dtype=np.float32).flatten()
+        incoming = np.asarray(data, dtype=np.float32).reshape(-1)
         if incoming.size == 0:
             return False
 
-        arr = np.asarray(self.data, dtype=np.float32).flatten()
+        length = self.sample_count
         idx = int(max(0, insert_index))
 
-        if allow_gaps and idx > len(arr):
-            gap_len = idx - len(arr)
-            gap = np.zeros(gap_len, dtype=np.float32)
-            self.data = np.concatenate([arr, gap, incoming])
-            self.sample_boundaries = list(self.sample_boundaries)
+        if allow_gaps and idx > length:
+            gap = np.zeros(idx - length, dtype=np.float32)
+            has_audio_before = self._has_audio(0, length, 1e-6)
+            self._splice(length, length, [gap, incoming])
             if as_new_segment:
-                start_idx = idx
-                end_idx = idx + incoming.size
-                has_audio_before = np.any(np.abs(arr[:start_idx]) > 1e-6)
-                if start_idx > 0 and has_audio_before and start_idx not in self.sample_boundaries:
-                    self.sample_boundaries.append(start_idx)
-                if end_idx not in self.sample_boundaries:
-                    self.sample_boundaries.append(end_idx)
+                if idx > 0 and has_audio_before:
+                    self.sample_boundaries.add(idx)
+                self.sample_boundaries.add(idx + incoming.size)
             else:
-                if self.sample_boundaries:
-                    self.sample_boundaries[-1] = len(self.data)
-                else:
-                    self.sample_boundaries = [len(self.data)]
+                self.sample_boundaries.replace_last(self.sample_count)
             self._normalize_boundaries()
             return True
 
-        idx = int(np.clip(idx, 0, len(arr)))
-        self.data = np.concatenate([arr[:idx], incoming, arr[idx:]])
+        idx = int(np.clip(idx, 0, length))
+        has_audio_before = as_new_segment and self._has_audio(0, idx, 1e-6)
+        self._splice(idx, idx, incoming)
 
         shift = incoming.size
-        shifted_boundaries: list[int] = []
-        for boundary in self.sample_boundaries:
-            if boundary >= idx:
-                shifted_boundaries.append(boundary + shift)
-            else:
-                shifted_boundaries.append(boundary)
-
-        self.sample_boundaries = shifted_boundaries
+        self.sample_boundaries.shift_from(idx, shift)
         if as_new_segment:
-            has_audio_before = np.any(np.abs(arr[:idx]) > 1e-6)
-            if idx > 0 and has_audio_before and idx not in self.sample_boundaries:
-                self.sample_boundaries.append(idx)
-            end_idx = idx + shift
-            if end_idx not in self.sample_boundaries:
-                self.sample_boundaries.append(end_idx)
+            if idx > 0 and has_audio_before:
+                self.sample_boundaries.add(idx)
+            self.sample_boundaries.add(idx + shift)
         self._normalize_boundaries()
         return True
 
@@ -174,50 +297,43 @@ class AudioTrack:
         overwrite_silence_only: bool = True,
         silence_threshold: float = 1e-6,
     ) -> bool:
-        incoming = np.asarray(data, dtype=np.float32).flatten()
+        incoming = np.asarray(data, dtype=np.float32).reshape(-1)
         if incoming.size == 0:
             return False
 
         start = int(max(0, start_index))
         end = start + incoming.size
-        arr = np.asarray(self.data, dtype=np.float32).flatten().copy()
-
-        if end > len(arr):
-            arr = np.pad(arr, (0, end - len(arr)))
+        length = self.sample_count
+        overlap_end = min(end, length)
 
-        if overwrite_silence_only:
-            target = arr[start:end]
-            if np.any(np.abs(target) > silence_threshold):
+        if overwrite_silence_only and start < overlap_end:
+            if self._has_audio(start, overlap_end, silence_threshold):
                 return False
 
-        arr[start:end] = incoming
-        self.data = arr
+        if start > length:
+            self._splice(length, length, [np.zeros(start - length, dtype=np.float32), incoming])
+        else:
+            self._splice(start, overlap_end, incoming)
 
         if as_new_segment:
-            has_audio_before = np.any(np.abs(arr[:start]) > silence_threshold)
-            if start > 0 and has_audio_before and start not in self.sample_boundaries:
-                self.sample_boundaries.append(start)
-            if end not in self.sample_boundaries:
-                self.sample_boundaries.append(end)
+            if start > 0 and self._has_audio(0, start, silence_threshold):
+                self.sample_boundaries.add(start)
+            self.sample_boundaries.add(end)
         else:
-            if self.sample_boundaries:
-                self.sample_boundaries[-1] = len(self.data)
-            else:
-                self.sample_boundaries = [len(self.data)]
+            self.sample_boundaries.replace_last(self.sample_count)
 
         self._normalize_boundaries()
         return True
+
     def _normalize_boundaries(self) -> None:
-        max_len = len(self.data)
-        cleaned = sorted({int(b) for b in self.sample_boundaries if 0 < int(b) <= max_len})
-        self.sample_boundaries = cleaned
+        self.sample_boundaries.clip(self.sample_count)
 
     @property
     def duration_seconds(self) -> float:
         """Return the duration of the track in seconds."""
         if self.sample_rate == 0:
             return 0.0
-        return len(self.data) / self.sample_rate
+        return self.sample_count / self.sample_rate
 
     def rename(self, new_name: str) -> None:
         """Rename the track."""
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from .audio_track import AudioTrack
+from .project import Project
+
+
+@dataclass(frozen=True)
+class TrackState:
+    """Non-sample track state (name, mix parameters, boundaries) kept for undo."""
+    name: str
+    sample_rate: int
+    volume: float
+    muted: bool
+    file_path: Path | None
+    boundaries: tuple[int, ...]
+
+    @classmethod
+    def capture(cls, track: AudioTrack) -> TrackState:
+        return cls(
+            name=track.name,
+            sample_rate=track.sample_rate,
+            volume=track.volume,
+            muted=track.muted,
+            file_path=track.file_path,
+            boundaries=tuple(track.sample_boundaries),
+        )
+
+    def apply(self, track: AudioTrack) -> None:
+        track.name = self.name
+        track.sample_rate = self.sample_rate
+        track.volume = self.volume
+        track.muted = self.muted
+        track.file_path = self.file_path
+        track.set_boundaries(self.boundaries)
+
+    @property
+    def nbytes(self) -> int:
+        return 64 + 8 * len(self.boundaries)
+
+
+def _resident_nbytes(piece: np.ndarray) -> int:
+    """Bytes a piece keeps in memory; views of memory-mapped files cost nothing."""
+    base: object = piece
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            return 0
+        base = base.base
+    return 0 if isinstance(base, mmap.mmap) else piece.nbytes
+
+
+def _private_copy(piece: np.ndarray) -> np.ndarray:
+    copy = piece.copy()
+    copy.flags.writeable = False
+    return copy
+
+
+@dataclass
+class SampleDelta:
+    """One splice on a track: `removed` samples were replaced by `inserted_len` new ones at `start`."""
+    track: AudioTrack
+    start: int
+    removed: list[np.ndarray]
+    inserted_len: int
+
+    @property
+    def nbytes(self) -> int:
+        return sum(_resident_nbytes(piece) for piece in self.removed)
+
+
+@dataclass
+class EditTransaction:
+    """All deltas recorded between two undo points, plus caller-supplied UI context."""
+    context: dict[str, Any]
+    before_order: list[AudioTrack]
+    after_order: list[AudioTrack] | None = None
+    deltas: list[SampleDelta] = field(default_factory=list)
+    # (track, state before, state after) for tracks whose parameters or boundaries changed.
+    state_changes: list[tuple[AudioTrack, TrackState, TrackState]] = field(default_factory=list)
+    _before_states: dict[int, TrackState] = field(default_factory=dict, repr=False)
+
+    @property
+    def order_changed(self) -> bool:
+        after = self.after_order if self.after_order is not None else self.before_order
+        return [id(t) for t in self.before_order] != [id(t) for t in after]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.deltas and not self.state_changes and not self.order_changed
+
+    @property
+    def nbytes(self) -> int:
+        total = sum(delta.nbytes for delta in self.deltas)
+        total += sum(before.nbytes + after.nbytes for _, before, after in self.state_changes)
+        # Tracks that exist on only one side of the edit are kept alive by history.
+        before_ids = {id(t) for t in self.before_order}
+        after = self.after_order or []
+        after_ids = {id(t) for t in after}
+        for track in [*self.before_order, *after]:
+            if (id(track) in before_ids) != (id(track) in after_ids):
+                total += track.sample_count * 4
+        return total
+
+    def record_splice(self, track: AudioTrack, start: int, removed: list[np.ndarray], inserted_len: int) -> None:
+        self.deltas.append(SampleDelta(track, start, removed, inserted_len))
+
+
+class EditHistory:
+    """
+    Delta-based undo/redo history.
+
+    `begin()` opens a transaction at an undo point. While it is open, every
+    sample splice on the project's tracks is recorded as a delta (the removed
+    pieces and the inserted length), so history costs memory proportional to
+    what was edited. Track parameters and boundaries are compared when the
+    transaction closes and only changed tracks are kept. Undo and redo
+    replay deltas in time proportional to the edit, and the oldest entries
+    are dropped once the history exceeds `memory_budget_bytes`.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+    def __init__(self, memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self.memory_budget_bytes = int(memory_budget_bytes)
+        self._undo: list[EditTransaction] = []
+        self._redo: list[EditTransaction] = []
+        self._open: EditTransaction | None = None
+        self._open_tracks: list[AudioTrack] = []
+
+    def can_undo(self) -> bool:
+        return bool(self._undo) or self._open is not None
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(txn.nbytes for txn in [*self._undo, *self._redo])
+
+    def clear(self) -> None:
+        self._detach()
+        self._open = None
+        self._undo.clear()
+        self._redo.clear()
+
+    def detach(self, predicate: Callable[[np.ndarray], bool]) -> None:
+        """Copy the pieces `predicate` selects out of every removed range and every track history keeps."""
+        transactions = [*self._undo, *self._redo, *([self._open] if self._open is not None else [])]
+        tracks = {}
+        for transaction in transactions:
+            for delta in transaction.deltas:
+                delta.removed = [_private_copy(piece) if predicate(piece) else piece for piece in delta.removed]
+                tracks[id(delta.track)] = delta.track
+            for track in [*transaction.before_order, *(transaction.after_order or [])]:
+                tracks[id(track)] = track
+        for track in tracks.values():
+            track.detach_samples(predicate)
+        self._enforce_budget()
+
+    def begin(self, project: Project, context: dict[str, Any] | None = None) -> None:
+        """Mark an undo point; edits until the next `begin()` form one transaction."""
+        self.close(project)
+        tracks = list(project.get_tracks())
+        transaction = EditTransaction(context=dict(context or {}), before_order=tracks)
+        transaction._before_states = {id(track): TrackState.capture(track) for track in tracks}
+        for track in tracks:
+            track._edit_recorder = transaction.record_splice
+        self._open = transaction
+        self._open_tracks = tracks
+        self._redo.clear()
+
+    def close(self, project: Project) -> None:
+        """Finish the open transaction, keeping only the state that changed."""
+        transaction = self._open
+        if transaction is None:
+            return
+        self._detach()
+        self._open = None
+        transaction.after_order = list(project.get_tracks())
+        for track in transaction.before_order:
+            before = transaction._before_states.get(id(track))
+            after = TrackState.capture(track)
+            if before is not None and before != after:
+                transaction.state_changes.append((track, before, after))
+        transaction._before_states = {}
+        if transaction.is_empty:
+            return
+        self._undo.append(transaction)
+        self._enforce_budget()
+
+    def _detach(self) -> None:
+        for track in self._open_tracks:
+            track._edit_recorder = None
+        self._open_tracks = []
+
+    def _enforce_budget(self) -> None:
+        total = self.nbytes
+        while total > self.memory_budget_bytes and len(self._undo) > 1:
+            total -= self._undo.pop(0).nbytes
+
+    def undo(self, project: Project, context: dict[str, Any] | None = None) -> EditTransaction | None:
+        """Revert the latest transaction; returns it so callers can restore its context."""
+        self.close(project)
+        if not self._undo:
+            return None
+        transaction = self._undo.pop()
+        self._redo.append(self._invert(transaction, project, context))
+        return transaction
+
+    def redo(self, project: Project, context: dict[str, Any] | None = None) -> EditTransaction | None:
+        self.close(project)
+        if not self._redo:
+            return None
+        transaction = self._redo.pop()
+        self._undo.append(self._invert(transaction, project, context))
+        self._enforce_budget()
+        return transaction
+
+    @staticmethod
+    def _invert(
+        transaction: EditTransaction,
+        project: Project,
+        context: dict[str, Any] | None,
+    ) -> EditTransaction:
+        """Apply the inverse of a transaction and return the transaction that re-applies it."""
+        inverse = EditTransaction(
+            context=dict(context or {}),
+            before_order=list(transaction.after_order or transaction.before_order),
+            after_order=list(transaction.before_order),
+        )
+        for delta in reversed(transaction.deltas):
+            restored = sum(piece.size for piece in delta.removed)
+            removed = delta.track._splice(delta.start, delta.start + delta.inserted_len, delta.removed)
+            inverse.deltas.append(SampleDelta(delta.track, delta.start, removed, restored))
+        for track, before, after in transaction.state_changes:
+            before.apply(track)
+            inverse.state_changes.append((track, after, before))
+        if transaction.order_changed:
+            project.replace_tracks(transaction.before_order)
+        return inverse
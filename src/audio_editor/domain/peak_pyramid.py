@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .range_max_tree import RangeMaxTree
+
+
+def _backing(level: np.ndarray) -> np.ndarray:
+    """The grown buffer a level is a view of, or the level itself."""
+    return level.base if isinstance(level.base, np.ndarray) else level
+
+
+class PeakPyramid:
+    """
+    Multi-resolution min/max/RMS summary of a sample source.
+
+    Level 0 summarizes the source in buckets of `bucket_sizes[0]` samples;
+    every coarser level is reduced from level 0, never from raw samples.
+    Edits only invalidate the buckets they touch (plus the tail when the
+    length changes), and `refresh()` recomputes just those buckets.
+
+    The source is any object with `__len__` and `read(start, stop)`, such as
+    a `SampleStore`.
+    """
+
+    BUCKET_SIZES = (256, 4096, 65536)
+
+    def __init__(self, source, bucket_sizes: tuple[int, ...] = BUCKET_SIZES) -> None:
+        sizes = tuple(sorted(int(size) for size in bucket_sizes))
+        if any(size % sizes[0] for size in sizes):
+            raise ValueError("Bucket sizes must be multiples of the finest bucket size.")
+        self._source = source
+        self.bucket_sizes = sizes
+        self._mins: list[np.ndarray] = [np.zeros(0, dtype=np.float32) for _ in sizes]
+        self._maxs: list[np.ndarray] = [np.zeros(0, dtype=np.float32) for _ in sizes]
+        self._sumsq: list[np.ndarray] = [np.zeros(0, dtype=np.float64) for _ in sizes]
+        # Range-max over level-0 |peak| per bucket, for silence queries.
+        self._magnitude_tree = RangeMaxTree()
+        self._sample_count = 0
+        # Level-0 buckets below this index are valid; dirty holds extra bucket ranges.
+        self._valid_buckets = 0
+        self._dirty: list[tuple[int, int]] = []
+        self.version = 0
+        # Set while a snapshot() shares the arrays; the next refresh that changes them copies first.
+        self._shared = False
+
+    @property
+    def sample_count(self) -> int:
+        return self._sample_count
+
+    def invalidate(self, start: int, old_stop: int, new_stop: int) -> None:
+        """Record that source samples [start, old_stop) became [start, new_stop)."""
+        base = self.bucket_sizes[0]
+        first = max(0, int(start)) // base
+        if old_stop - start == new_stop - start:
+            last = -(-int(new_stop) // base)
+            if first < last:
+                self._dirty.append((first, last))
+        else:
+            # Everything after a length-changing edit moved; keep the prefix only.
+            self._valid_buckets = min(self._valid_buckets, first)
+        self.version += 1
+
+    def fork(self, source) -> PeakPyramid:
+        """Copy of this (refreshed) pyramid for a source that starts with the same samples."""
+        self.refresh()
+        clone = PeakPyramid(source, self.bucket_sizes)
+        clone._mins = [level.copy() for level in self._mins]
+        clone._maxs = [level.copy() for level in self._maxs]
+        clone._sumsq = [level.copy() for level in self._sumsq]
+        clone._magnitude_tree = RangeMaxTree(self._bucket_magnitudes(0, self._mins[0].size))
+        clone._sample_count = self._sample_count
+        clone._valid_buckets = self._valid_buckets
+        return clone
+
+    def snapshot(self, source) -> PeakPyramid:
+        """
+        Refreshed pyramid for `source`, an unchanging copy of this one's source.
+
+        The arrays are shared, not copied: this pyramid copies them before
+        its next change, so the snapshot can be queried from another thread
+        while the original follows edits.
+        """
+        self.refresh()
+        clone = PeakPyramid(source, self.bucket_sizes)
+        clone._mins = list(self._mins)
+        clone._maxs = list(self._maxs)
+        clone._sumsq = list(self._sumsq)
+        clone._magnitude_tree = self._magnitude_tree
+        clone._sample_count = self._sample_count
+        clone._valid_buckets = self._valid_buckets
+        clone.version = self.version
+        clone._shared = self._shared = True
+        return clone
+
+    def _unshare(self) -> None:
+        if self._shared:
+            self._mins = [level.copy() for level in self._mins]
+            self._maxs = [level.copy() for level in self._maxs]
+            self._sumsq = [level.copy() for level in self._sumsq]
+            self._magnitude_tree = self._magnitude_tree.copy()
+            self._shared = False
+
+    def raw_levels(self) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(mins, maxs, sumsq) per level after a refresh, e.g. for caching on disk; do not modify."""
+        self.refresh()
+        return list(zip(self._mins, self._maxs, self._sumsq))
+
+    @classmethod
+    def from_raw_levels(cls, source, sample_count: int, bucket_sizes: tuple[int, ...], levels) -> PeakPyramid:
+        """Rebuild a pyramid for `source` from `raw_levels()` output without reading samples."""
+        pyramid = cls(source, bucket_sizes)
+        if sample_count != len(source):
+            raise ValueError("Stored peaks do not match the source length.")
+        if len(levels) != len(pyramid.bucket_sizes):
+            raise ValueError("Level count does not match the bucket sizes.")
+        for level, (size, (mins, maxs, sumsq)) in enumerate(zip(pyramid.bucket_sizes, levels)):
+            count = -(-sample_count // size)
+            if not len(mins) == len(maxs) == len(sumsq) == count:
+                raise ValueError("Stored peaks do not match the source length.")
+            pyramid._mins[level] = np.array(mins, dtype=np.float32)
+            pyramid._maxs[level] = np.array(maxs, dtype=np.float32)
+            pyramid._sumsq[level] = np.array(sumsq, dtype=np.float64)
+        pyramid._sample_count = sample_count
+        pyramid._valid_buckets = pyramid._mins[0].size
+        pyramid._magnitude_tree = RangeMaxTree(pyramid._bucket_magnitudes(0, pyramid._mins[0].size))
+        return pyramid
+
+    def invalidate_all(self) -> None:
+        self._valid_buckets = 0
+        self._dirty.clear()
+        self.version += 1
+
+    @staticmethod
+    def _summarize(samples: np.ndarray, bucket: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        count = -(-samples.size // bucket)
+        if count == 0:
+            empty = np.zeros(0, dtype=np.float32)
+            return empty, empty, np.zeros(0, dtype=np.float64)
+        starts = np.arange(0, samples.size, bucket)
+        mins = np.minimum.reduceat(samples, starts)
+        maxs = np.maximum.reduceat(samples, starts)
+        sq = np.square(samples, dtype=np.float64)
+        sumsq = np.add.reduceat(sq, starts)
+        return mins.astype(np.float32), maxs.astype(np.float32), sumsq
+
+    def _resize_levels(self, sample_count: int) -> None:
+        # Levels are views into geometrically grown buffers, so a source that
+        # grows a little at a time (a live recording) is not copied every time.
+        for level, size in enumerate(self.bucket_sizes):
+            count = -(-sample_count // size)
+            if count == self._mins[level].size:
+                continue
+            backing = _backing(self._mins[level])
+            if count > backing.size:
+                capacity = max(count, 2 * backing.size)
+                current = self._mins[level].size
+                for arrays in (self._mins, self._maxs, self._sumsq):
+                    grown = np.zeros(capacity, dtype=arrays[level].dtype)
+                    grown[:current] = arrays[level]
+                    arrays[level] = grown[:count]
+            else:
+                for arrays in (self._mins, self._maxs, self._sumsq):
+                    arrays[level] = _backing(arrays[level])[:count]
+
+    def _rebuild_base(self, first: int, last: int) -> None:
+        base = self.bucket_sizes[0]
+        samples = np.asarray(self._source.read(first * base, last * base), dtype=np.float32)
+        mins, maxs, sumsq = self._summarize(samples, base)
+        stop = first + mins.size
+        self._mins[0][first:stop] = mins
+        self._maxs[0][first:stop] = maxs
+        self._sumsq[0][first:stop] = sumsq
+        self._magnitude_tree.update(first, self._bucket_magnitudes(first, stop))
+
+    def _bucket_magnitudes(self, first: int, last: int, level: int = 0) -> np.ndarray:
+        return np.maximum(np.abs(self._mins[level][first:last]), np.abs(self._maxs[level][first:last]))
+
+    def bucket_magnitudes(self, level: int, first: int = 0, last: int | None = None) -> np.ndarray:
+        """Largest |sample| per bucket for buckets [first, last) of one level."""
+        self.refresh()
+        return self._bucket_magnitudes(first, self._mins[level].size if last is None else last, level)
+
+    def _rebuild_upper(self, first: int, last: int) -> None:
+        """Reduce level-0 buckets [first, last) into every coarser level."""
+        base = self.bucket_sizes[0]
+        for level in range(1, len(self.bucket_sizes)):
+            ratio = self.bucket_sizes[level] // base
+            lo = first // ratio
+            hi = min(-(-last // ratio), self._mins[level].size)
+            if hi <= lo:
+                continue
+            src_lo = lo * ratio
+            src_hi = min(hi * ratio, self._mins[0].size)
+            starts = np.arange(src_lo, src_hi, ratio) - src_lo
+            self._mins[level][lo:hi] = np.minimum.reduceat(self._mins[0][src_lo:src_hi], starts)
+            self._maxs[level][lo:hi] = np.maximum.reduceat(self._maxs[0][src_lo:src_hi], starts)
+            self._sumsq[level][lo:hi] = np.add.reduceat(self._sumsq[0][src_lo:src_hi], starts)
+
+    def refresh(self) -> PeakPyramid:
+        """Recompute invalidated buckets from the source; cheap when nothing changed."""
+        sample_count = len(self._source)
+        base = self.bucket_sizes[0]
+        if sample_count != self._sample_count or self._dirty or self._valid_buckets < self._mins[0].size:
+            self._unshare()
+        if sample_count != self._sample_count:
+            # A partially filled last bucket must be recomputed when the source grows.
+            self._valid_buckets = min(self._valid_buckets, self._sample_count // base)
+            self._sample_count = sample_count
+            self._resize_levels(sample_count)
+            self._magnitude_tree.resize(self._mins[0].size)
+            self.version += 1
+
+        total = self._mins[0].size
+        self._valid_buckets = min(self._valid_buckets, total)
+        ranges = [(lo, min(hi, self._valid_buckets)) for lo, hi in self._dirty]
+        if self._valid_buckets < total:
+            ranges.append((self._valid_buckets, total))
+        for lo, hi in ranges:
+            if lo < hi:
+                self._rebuild_base(lo, hi)
+                self._rebuild_upper(lo, hi)
+        self._valid_buckets = total
+        self._dirty.clear()
+        return self
+
+    def max_abs(self, start: int, stop: int) -> float:
+        """
+        Largest |sample| in [start, stop).
+
+        Whole buckets are answered by the range-max tree in O(log n); only the
+        partial buckets at either end are read from the source.
+        """
+        self.refresh()
+        start = max(0, int(start))
+        stop = min(int(stop), self._sample_count)
+        if stop <= start:
+            return 0.0
+        base = self.bucket_sizes[0]
+        first_full = -(-start // base)
+        last_full = stop // base
+        if first_full >= last_full:
+            return self._raw_max_abs(start, stop)
+        best = self._magnitude_tree.query(first_full, last_full)
+        if start < first_full * base:
+            best = max(best, self._raw_max_abs(start, first_full * base))
+        if last_full * base < stop:
+            best = max(best, self._raw_max_abs(last_full * base, stop))
+        return best
+
+    def first_above(self, start: int, threshold: float, stop: int | None = None) -> int | None:
+        """Index of the first sample in [start, stop) with |sample| > threshold, if any."""
+        self.refresh()
+        start = max(0, int(start))
+        stop = self._sample_count if stop is None else min(int(stop), self._sample_count)
+        base = self.bucket_sizes[0]
+        while start < stop:
+            bucket = self._magnitude_tree.first_above(start // base, threshold, -(-stop // base))
+            if bucket is None:
+                return None
+            lo = max(start, bucket * base)
+            hi = min(stop, (bucket + 1) * base)
+            hits = np.flatnonzero(np.abs(self._source.read(lo, hi)) > threshold)
+            if hits.size:
+                return lo + int(hits[0])
+            # The loud part of this bucket lies before `start`; continue after it.
+            start = hi
+        return None
+
+    def audible_spans(self, start: int, stop: int, threshold: float = 0.0, span_buckets: int = 16) -> list[tuple[int, int]]:
+        """
+        Sample ranges within [start, stop) that may hold |sample| > threshold.
+
+        Answered from the range-max index alone, at bucket resolution: the
+        spans cover every loud sample, and silent stretches are jumped over
+        in O(log n). Call `refresh()` first; no samples are read.
+        """
+        base = self.bucket_sizes[0]
+        start = max(0, int(start))
+        stop = min(int(stop), self._sample_count)
+        first = start // base
+        last = -(-stop // base)
+        spans = []
+        tree = self._magnitude_tree
+        while first < last:
+            bucket = tree.first_above(first, threshold, last)
+            if bucket is None:
+                break
+            end = min(bucket + span_buckets, last)
+            while end < last and tree.query(end, end + span_buckets) > threshold:
+                end = min(end + span_buckets, last)
+            spans.append((max(start, bucket * base), min(stop, end * base)))
+            first = end
+        return spans
+
+    def _raw_max_abs(self, start: int, stop: int) -> float:
+        samples = self._source.read(start, stop)
+        return float(np.max(np.abs(samples))) if len(samples) else 0.0
+
+    def level_for(self, samples_per_bin: float) -> int | None:
+        """Index of the coarsest level whose buckets fit in one bin, if any."""
+        best = None
+        for level, size in enumerate(self.bucket_sizes):
+            if size <= samples_per_bin:
+                best = level
+        return best
+
+    def level(self, level: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (mins, maxs, rms) arrays for one level."""
+        size = self.bucket_sizes[level]
+        counts = np.full(self._mins[level].size, size, dtype=np.float64)
+        if counts.size:
+            counts[-1] = self._sample_count - size * (counts.size - 1)
+        rms = np.sqrt(self._sumsq[level] / np.maximum(counts, 1.0)).astype(np.float32)
+        return self._mins[level], self._maxs[level], rms
+
+    def peak_envelope(self, bins: int, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        Peak magnitude per bin for samples [start, stop), read from the closest level.
+
+        Costs O(bins) bucket reads once refreshed; only very deep zoom levels
+        (fewer samples per bin than the finest bucket) read raw samples.
+        """
+        if bins <= 0:
+            return np.array([], dtype=np.float32)
+        self.refresh()
+        stop = self._sample_count if stop is None else min(int(stop), self._sample_count)
+        start = max(0, int(start))
+        if stop <= start:
+            return np.zeros(bins, dtype=np.float32)
+
+        chunk = max(1, int(np.ceil((stop - start) / bins)))
+        bin_starts = np.arange(start, stop, chunk)
+        level = self.level_for(chunk)
+        if level is None:
+            magnitudes = np.abs(np.asarray(self._source.read(start, stop), dtype=np.float32))
+            indices = bin_starts - start
+        else:
+            size = self.bucket_sizes[level]
+            first_bucket = start // size
+            last_bucket = -(-stop // size)
+            magnitudes = np.maximum(
+                np.abs(self._mins[level][first_bucket:last_bucket]),
+                np.abs(self._maxs[level][first_bucket:last_bucket]),
+            )
+            indices = bin_starts // size - first_bucket
+
+        peaks = np.minimum(np.maximum.reduceat(magnitudes, indices), 1.0).astype(np.float32)
+        if peaks.size < bins:
+            peaks = np.concatenate([peaks, np.zeros(bins - peaks.size, dtype=np.float32)])
+        return peaks[:bins]
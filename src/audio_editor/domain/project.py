@@ -1,22 +1,141 @@
-from typing import List
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Callable, Iterator, List
 from .audio_track import AudioTrack
 
+TRACK_ADDED = "track_added"
+TRACK_REMOVED = "track_removed"
+TRACKS_REORDERED = "tracks_reordered"
+SAMPLES_CHANGED = "samples_changed"
+PARAMS_CHANGED = "params_changed"
+
+
+@dataclass(frozen=True)
+class ProjectChange:
+    """
+    One change notification from a Project.
+
+    For SAMPLES_CHANGED, [start, stop) is the affected sample range in the
+    track's new coordinates (it extends to the end when the length changed).
+    """
+    kind: str
+    track: AudioTrack | None = None
+    start: int = 0
+    stop: int = 0
+
+
+class TrackListView(Sequence):
+    """Read-only, non-copying view of a project's track list."""
+
+    def __init__(self, tracks: List[AudioTrack]):
+        self._tracks = tracks
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __getitem__(self, index):
+        return self._tracks[index]
+
+    def __iter__(self) -> Iterator[AudioTrack]:
+        return iter(self._tracks)
+
+
 class Project:
     """Represents a project containing multiple audio tracks."""
 
     def __init__(self, name: str):
         self.name = name
         self._tracks: List[AudioTrack] = []
+        self._by_id: dict[str, AudioTrack] = {}
+        self._index_by_id: dict[str, int] | None = None
+        self._listeners: List[Callable[[ProjectChange], None]] = []
+
+    @property
+    def tracks(self) -> TrackListView:
+        """Live view of the tracks; use get_tracks() for a copy that is safe to keep."""
+        return TrackListView(self._tracks)
+
+    def get_track(self, track_id: str | None) -> AudioTrack | None:
+        """O(1) lookup by the track's stable id."""
+        return self._by_id.get(track_id) if track_id is not None else None
+
+    def index_of(self, track_id: str) -> int:
+        """Position of a track in the project, or -1."""
+        if self._index_by_id is None:
+            self._index_by_id = {track.track_id: index for index, track in enumerate(self._tracks)}
+        return self._index_by_id.get(track_id, -1)
+
+    def subscribe(self, listener: Callable[[ProjectChange], None]) -> None:
+        """Call listener synchronously for every ProjectChange."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ProjectChange], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, change: ProjectChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+
+    def _on_track_changed(self, track: AudioTrack, kind: str, start: int, stop: int) -> None:
+        self._emit(ProjectChange(kind, track, start, stop))
+
+    def _check_new_id(self, track: AudioTrack) -> None:
+        if track.track_id in self._by_id:
+            raise ValueError(f"Track id {track.track_id} is already in the project.")
+
+    def _attach(self, track: AudioTrack) -> None:
+        self._by_id[track.track_id] = track
+        self._index_by_id = None
+        track._change_listener = self._on_track_changed
+        self._emit(ProjectChange(TRACK_ADDED, track))
+
+    def _detach(self, track: AudioTrack) -> None:
+        if self._by_id.get(track.track_id) is track:
+            del self._by_id[track.track_id]
+        self._index_by_id = None
+        if track._change_listener == self._on_track_changed:
+            track._change_listener = None
+        self._emit(ProjectChange(TRACK_REMOVED, track))
 
     def add_track(self, track: AudioTrack) -> None:
+        self._check_new_id(track)
         self._tracks.append(track)
+        self._attach(track)
 
     def remove_track(self, track: AudioTrack) -> None:
-        self._tracks.remove(track)
+        index = self.index_of(track.track_id)
+        if index < 0 or self._tracks[index] is not track:
+            raise ValueError("Track is not in the project.")
+        del self._tracks[index]
+        self._detach(track)
 
     def insert_track_after(self, existing_track: AudioTrack, new_track: AudioTrack) -> None:
-        index = self._tracks.index(existing_track)
+        index = self.index_of(existing_track.track_id)
+        if index < 0:
+            raise ValueError("Track is not in the project.")
+        self._check_new_id(new_track)
         self._tracks.insert(index + 1, new_track)
+        self._attach(new_track)
+
+    def replace_tracks(self, tracks: List[AudioTrack]) -> None:
+        """Replace the track list, e.g. after a reorder or an undo."""
+        new_by_id = {track.track_id: track for track in tracks}
+        if len(new_by_id) != len(tracks):
+            raise ValueError("Track ids must be unique within a project.")
+        # A different object under a known id (e.g. a reloaded project) counts as a replacement.
+        removed = [track for track in self._tracks if new_by_id.get(track.track_id) is not track]
+        added = [track for track in tracks if self._by_id.get(track.track_id) is not track]
+        kept_old = [track.track_id for track in self._tracks if new_by_id.get(track.track_id) is track]
+        kept_new = [track.track_id for track in tracks if self._by_id.get(track.track_id) is track]
+        self._tracks = list(tracks)
+        self._index_by_id = None
+        for track in removed:
+            self._detach(track)
+        for track in added:
+            self._attach(track)
+        if kept_old != kept_new:
+            self._emit(ProjectChange(TRACKS_REORDERED))
 
     def get_tracks(self) -> List[AudioTrack]:
         return list(self._tracks)
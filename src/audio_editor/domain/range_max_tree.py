@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class RangeMaxTree:
+    """
+    Array-backed segment tree answering range-max queries over non-negative values.
+
+    Leaves can be rewritten in blocks (`update`) at O(block + log n) cost, so
+    the tree can follow incremental edits of the values it summarizes.
+    """
+
+    def __init__(self, values: np.ndarray | None = None) -> None:
+        self._size = 0
+        self._capacity = 1
+        self._tree = np.zeros(2, dtype=np.float32)
+        if values is not None:
+            self.resize(len(values))
+            self.update(0, values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> RangeMaxTree:
+        clone = RangeMaxTree()
+        clone._size = self._size
+        clone._capacity = self._capacity
+        clone._tree = self._tree.copy()
+        return clone
+
+    def resize(self, size: int) -> None:
+        """Set the number of leaves; new leaves are 0 and dropped leaves are cleared."""
+        size = int(size)
+        if size > self._capacity:
+            capacity = self._capacity
+            while capacity < size:
+                capacity *= 2
+            leaves = np.zeros(capacity, dtype=np.float32)
+            leaves[: self._size] = self._tree[self._capacity : self._capacity + self._size]
+            self._capacity = capacity
+            self._tree = np.zeros(2 * capacity, dtype=np.float32)
+            self._size = size
+            self._tree[capacity:] = leaves
+            self._rebuild_parents(0, capacity)
+            return
+        if size < self._size:
+            self._tree[self._capacity + size : self._capacity + self._size] = 0.0
+            self._rebuild_parents(size, self._size)
+        self._size = size
+
+    def update(self, start: int, values: np.ndarray) -> None:
+        """Overwrite leaves [start, start + len(values)) and fix their ancestors."""
+        values = np.asarray(values, dtype=np.float32)
+        stop = start + values.size
+        if values.size == 0:
+            return
+        if stop > self._size:
+            raise IndexError("RangeMaxTree.update past the last leaf")
+        self._tree[self._capacity + start : self._capacity + stop] = values
+        self._rebuild_parents(start, stop)
+
+    def _rebuild_parents(self, lo: int, hi: int) -> None:
+        lo += self._capacity
+        hi += self._capacity
+        while lo > 1:
+            lo //= 2
+            hi = (hi + 1) // 2
+            children = self._tree[2 * lo : 2 * hi]
+            self._tree[lo:hi] = np.maximum(children[0::2], children[1::2])
+
+    def query(self, start: int, stop: int) -> float:
+        """Max over leaves [start, stop); 0.0 for an empty range."""
+        lo = max(0, int(start)) + self._capacity
+        hi = min(int(stop), self._size) + self._capacity
+        best = 0.0
+        while lo < hi:
+            if lo & 1:
+                best = max(best, float(self._tree[lo]))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = max(best, float(self._tree[hi]))
+            lo //= 2
+            hi //= 2
+        return best
+
+    def first_above(self, start: int, threshold: float, stop: int | None = None) -> int | None:
+        """Index of the first leaf in [start, stop) whose value exceeds threshold."""
+        stop = self._size if stop is None else min(int(stop), self._size)
+        lo = max(0, int(start)) + self._capacity
+        hi = stop + self._capacity
+        left_nodes: list[int] = []
+        right_nodes: list[int] = []
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo //= 2
+            hi //= 2
+        for node in left_nodes + right_nodes[::-1]:
+            if self._tree[node] > threshold:
+                while node < self._capacity:
+                    node = 2 * node if self._tree[2 * node] > threshold else 2 * node + 1
+                return node - self._capacity
+        return None
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+
+class SampleStore:
+    """
+    Piece-table storage for mono float32 sample data.
+
+    The signal is kept as an ordered list of read-only buffers ("pieces").
+    Inserts, cuts and overwrites splice the piece list instead of rebuilding
+    one large array, so an edit costs O(edit size + number of pieces).
+    A contiguous copy is only built by `to_array()` and is cached until the
+    next edit.
+    """
+
+    # Above this many pieces, runs of small neighbouring pieces are merged.
+    COMPACT_PIECE_LIMIT = 512
+    COMPACT_MERGE_SAMPLES = 1 << 16
+
+    def __init__(self, data: np.ndarray | Sequence[np.ndarray] | None = None) -> None:
+        self._pieces: list[np.ndarray] = self._freeze_all(data)
+        self._starts: list[int] = []
+        self._length = 0
+        self._flat: np.ndarray | None = None
+        self.version = 0
+        self._reindex()
+
+    @staticmethod
+    def _freeze(data: np.ndarray) -> np.ndarray:
+        arr = np.asarray(data)
+        if arr.dtype == np.float32 and arr.ndim == 1 and not arr.flags.writeable:
+            # Read-only float32 buffers (earlier pieces, memory maps) are shared as-is.
+            return arr
+        frozen = np.array(arr, dtype=np.float32).reshape(-1)
+        frozen.flags.writeable = False
+        return frozen
+
+    @staticmethod
+    def _seal(arr: np.ndarray) -> np.ndarray:
+        """Mark a freshly allocated buffer read-only without copying it."""
+        arr.flags.writeable = False
+        return arr
+
+    @classmethod
+    def _freeze_all(cls, data: np.ndarray | Sequence[np.ndarray] | None) -> list[np.ndarray]:
+        if data is None:
+            return []
+        if isinstance(data, (list, tuple)) and all(isinstance(item, np.ndarray) for item in data):
+            items = [cls._freeze(item) for item in data]
+        else:
+            items = [cls._freeze(np.asarray(data))]
+        return [item for item in items if item.size > 0]
+
+    def _reindex(self) -> None:
+        starts: list[int] = []
+        total = 0
+        for piece in self._pieces:
+            starts.append(total)
+            total += piece.size
+        self._starts = starts
+        self._length = total
+
+    def __len__(self) -> int:
+        return self._length
+
+    def snapshot(self) -> SampleStore:
+        """Return an independent store sharing the current (immutable) pieces."""
+        clone = SampleStore()
+        clone._pieces = list(self._pieces)
+        clone._reindex()
+        return clone
+
+    @property
+    def piece_count(self) -> int:
+        return len(self._pieces)
+
+    def _clamp(self, index: int) -> int:
+        return int(min(max(int(index), 0), self._length))
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return (piece index, offset inside piece) for a sample index < len."""
+        piece_idx = bisect_right(self._starts, index) - 1
+        return piece_idx, index - self._starts[piece_idx]
+
+    def iter_chunks(self, start: int, stop: int, reverse: bool = False) -> Iterator[np.ndarray]:
+        """Yield read-only views covering [start, stop) piece by piece."""
+        start = self._clamp(start)
+        stop = self._clamp(stop)
+        if stop <= start:
+            return
+        first, first_offset = self._locate(start)
+        last, last_offset = self._locate(stop - 1)
+        indices = range(last, first - 1, -1) if reverse else range(first, last + 1)
+        for idx in indices:
+            piece = self._pieces[idx]
+            lo = first_offset if idx == first else 0
+            hi = last_offset + 1 if idx == last else piece.size
+            yield piece[lo:hi]
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return samples in [start, stop); a view when the range sits in one piece."""
+        chunks = list(self.iter_chunks(start, stop))
+        if not chunks:
+            return np.array([], dtype=np.float32)
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks)
+
+    def any_above(self, start: int, stop: int, threshold: float, reverse: bool = False) -> bool:
+        """Return True if any |sample| in [start, stop) exceeds threshold, stopping early."""
+        for chunk in self.iter_chunks(start, stop, reverse=reverse):
+            if np.any(np.abs(chunk) > threshold):
+                return True
+        return False
+
+    def splice(
+        self,
+        start: int,
+        stop: int,
+        incoming: np.ndarray | Sequence[np.ndarray] | None = None,
+    ) -> list[np.ndarray]:
+        """Replace [start, stop) with incoming data and return the removed pieces."""
+        start = self._clamp(start)
+        stop = max(start, self._clamp(stop))
+        inserted = self._freeze_all(incoming)
+        removed = list(self.iter_chunks(start, stop))
+        if not removed and not inserted:
+            return removed
+
+        head: list[np.ndarray] = []
+        tail: list[np.ndarray] = []
+        if self._pieces:
+            if start < self._length:
+                idx, offset = self._locate(start)
+                head = self._pieces[:idx]
+                if offset > 0:
+                    head.append(self._pieces[idx][:offset])
+            else:
+                head = list(self._pieces)
+            if stop < self._length:
+                idx, offset = self._locate(stop)
+                tail = [self._pieces[idx][offset:], *self._pieces[idx + 1 :]]
+
+        self._pieces = head + inserted + tail
+        self._flat = None
+        self.version += 1
+        self._reindex()
+        if len(self._pieces) > self.COMPACT_PIECE_LIMIT:
+            self._coalesce_small_pieces()
+        return removed
+
+    def _coalesce_small_pieces(self) -> None:
+        merged: list[np.ndarray] = []
+        pending: list[np.ndarray] = []
+        pending_size = 0
+        for piece in self._pieces:
+            if piece.size >= self.COMPACT_MERGE_SAMPLES:
+                if pending:
+                    merged.append(self._merge(pending))
+                    pending, pending_size = [], 0
+                merged.append(piece)
+                continue
+            pending.append(piece)
+            pending_size += piece.size
+            if pending_size >= self.COMPACT_MERGE_SAMPLES:
+                merged.append(self._merge(pending))
+                pending, pending_size = [], 0
+        if pending:
+            merged.append(self._merge(pending))
+        self._pieces = merged
+        self._reindex()
+
+    def _merge(self, pieces: list[np.ndarray]) -> np.ndarray:
+        return pieces[0] if len(pieces) == 1 else self._seal(np.concatenate(pieces))
+
+    def detach(self, predicate: Callable[[np.ndarray], bool]) -> int:
+        """Replace the pieces `predicate` selects with private copies; returns the bytes copied."""
+        copied = 0
+        for idx, piece in enumerate(self._pieces):
+            if predicate(piece):
+                self._pieces[idx] = self._seal(piece.copy())
+                copied += piece.nbytes
+        if copied:
+            self._flat = None
+        return copied
+
+    def to_array(self) -> np.ndarray:
+        """Return the whole signal as one read-only contiguous array."""
+        if self._flat is not None:
+            return self._flat
+        if not self._pieces:
+            flat = self._seal(np.array([], dtype=np.float32))
+        elif len(self._pieces) == 1:
+            flat = self._pieces[0]
+        else:
+            flat = self._seal(np.concatenate(self._pieces))
+            # The flat copy replaces the pieces so later edits start compact.
+            self._pieces = [flat]
+            self._reindex()
+        self._flat = flat
+        return flat
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from numbers import Integral
+from typing import Iterable, Iterator
+
+
+class SegmentIndex:
+    """
+    Sorted, de-duplicated set of segment boundary sample indices.
+
+    Boundaries are kept in a blocked sorted list: consecutive sorted blocks
+    of at most `2 * LOAD` items plus the last item of each block. Lookups
+    (nearest / next / previous / membership) bisect the block maxima and
+    then one block, and an insert or removal shifts at most one block, so
+    neither depends on the total number of boundaries. Ripple edits shift
+    every boundary after an edit point in bulk instead of re-sorting.
+    """
+
+    LOAD = 256
+
+    def __init__(self, boundaries: Iterable[int] = ()) -> None:
+        self._blocks: list[list[int]] = []
+        self._maxes: list[int] = []
+        self._len = 0
+        self._reset(sorted({int(b) for b in boundaries}))
+
+    def _reset(self, items: list[int]) -> None:
+        """Rebuild the blocks from an already sorted, de-duplicated list."""
+        load = self.LOAD
+        self._blocks = [items[pos : pos + load] for pos in range(0, len(items), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._blocks)
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def __contains__(self, boundary: object) -> bool:
+        if not isinstance(boundary, Integral):
+            return False
+        return self._ceiling(int(boundary)) == int(boundary)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SegmentIndex):
+            return self.tolist() == other.tolist()
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SegmentIndex({self.tolist()!r})"
+
+    def copy(self) -> SegmentIndex:
+        clone = SegmentIndex()
+        clone._blocks = [list(block) for block in self._blocks]
+        clone._maxes = list(self._maxes)
+        clone._len = self._len
+        return clone
+
+    def tolist(self) -> list[int]:
+        return list(chain.from_iterable(self._blocks))
+
+    def add(self, boundary: int) -> bool:
+        """Insert a boundary; return False if it was already present."""
+        boundary = int(boundary)
+        if not self._blocks:
+            self._blocks.append([boundary])
+            self._maxes.append(boundary)
+            self._len = 1
+            return True
+        pos = bisect_left(self._maxes, boundary)
+        if pos == len(self._blocks):
+            pos -= 1
+        block = self._blocks[pos]
+        at = bisect_left(block, boundary)
+        if at < len(block) and block[at] == boundary:
+            return False
+        block.insert(at, boundary)
+        self._maxes[pos] = block[-1]
+        self._len += 1
+        if len(block) > 2 * self.LOAD:
+            half = len(block) // 2
+            self._blocks[pos : pos + 1] = [block[:half], block[half:]]
+            self._maxes[pos : pos + 1] = [block[half - 1], block[-1]]
+        return True
+
+    def discard(self, boundary: int) -> bool:
+        boundary = int(boundary)
+        pos = bisect_left(self._maxes, boundary)
+        if pos == len(self._blocks):
+            return False
+        block = self._blocks[pos]
+        at = bisect_left(block, boundary)
+        if block[at] != boundary:
+            return False
+        del block[at]
+        self._len -= 1
+        if block:
+            self._maxes[pos] = block[-1]
+        else:
+            del self._blocks[pos]
+            del self._maxes[pos]
+        return True
+
+    def replace_last(self, boundary: int) -> None:
+        """Move the final boundary (the track end marker) to a new position."""
+        if self._blocks:
+            self.discard(self._maxes[-1])
+        self.add(boundary)
+
+    def _ceiling(self, index: int) -> int | None:
+        """Smallest boundary >= index."""
+        pos = bisect_left(self._maxes, index)
+        if pos == len(self._blocks):
+            return None
+        block = self._blocks[pos]
+        return block[bisect_left(block, index)]
+
+    def next_after(self, index: int) -> int | None:
+        """Smallest boundary strictly greater than index."""
+        pos = bisect_right(self._maxes, index)
+        if pos == len(self._blocks):
+            return None
+        block = self._blocks[pos]
+        return block[bisect_right(block, index)]
+
+    def previous_before(self, index: int) -> int | None:
+        """Largest boundary strictly smaller than index."""
+        pos = bisect_left(self._maxes, index)
+        if pos < len(self._blocks):
+            block = self._blocks[pos]
+            at = bisect_left(block, index)
+            if at > 0:
+                return block[at - 1]
+        return self._maxes[pos - 1] if pos > 0 else None
+
+    def nearest(self, index: int) -> int | None:
+        """Closest boundary to index; ties resolve to the smaller boundary."""
+        best: int | None = None
+        for candidate in (self.previous_before(index), self._ceiling(index)):
+            if candidate is not None and (best is None or abs(candidate - index) < abs(best - index)):
+                best = candidate
+        return best
+
+    def shift_from(self, index: int, delta: int) -> None:
+        """Shift every boundary >= index by delta (ripple insert)."""
+        pos = bisect_left(self._maxes, index)
+        if pos == len(self._blocks) or not delta:
+            return
+        block = self._blocks[pos]
+        at = bisect_left(block, index)
+        block[at:] = [b + delta for b in block[at:]]
+        for later in range(pos + 1, len(self._blocks)):
+            self._blocks[later] = [b + delta for b in self._blocks[later]]
+        self._maxes[pos:] = [b + delta for b in self._maxes[pos:]]
+
+    def ripple_cut(self, start: int, end: int) -> None:
+        """Drop boundaries in (start, end] and pull later ones back by end - start."""
+        items = self.tolist()
+        lo = bisect_right(items, start)
+        hi = bisect_right(items, end)
+        remove_len = end - start
+        self._reset(items[:lo] + [b - remove_len for b in items[hi:]])
+
+    def clip(self, max_index: int) -> None:
+        """Keep only boundaries in (0, max_index]."""
+        items = self.tolist()
+        lo = bisect_right(items, 0)
+        hi = bisect_right(items, max_index)
+        if lo > 0 or hi < len(items):
+            self._reset(items[lo:hi])
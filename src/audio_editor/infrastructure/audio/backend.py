@@ -0,0 +1,92 @@
+"""
+Audio device backends behind `AudioEngine`.
+
+A backend opens callback-driven input and output streams and plays one-off
+buffers. Callbacks use sounddevice's signature, `callback(data, frames,
+time, status)` with `data` shaped (frames, channels), and end a stream by
+raising `CallbackStop`.
+
+`default_backend()` picks the implementation from the VIBECORE_AUDIO_BACKEND
+environment variable: "sounddevice" (the default) or "offline", the
+deterministic stand-in for machines without sound hardware.
+"""
+
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+BACKEND_ENV = "VIBECORE_AUDIO_BACKEND"
+
+StreamCallback = Callable[[np.ndarray, int, "StreamTime", object], None]
+
+
+class CallbackStop(Exception):
+    """Raise from a stream callback to finish the stream after the current block."""
+
+
+@dataclass(frozen=True)
+class StreamTime:
+    """Timestamps passed to callbacks by non-sounddevice backends; field names follow PortAudio's."""
+    currentTime: float
+    inputBufferAdcTime: float
+    outputBufferDacTime: float
+
+
+class AudioStream(ABC):
+    """A stream returned by `AudioBackend.open_input`/`open_output`."""
+
+    @abstractmethod
+    def start(self) -> None:
+        """Begin running the callback."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop running the callback; `start()` resumes it."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stop and release the stream for good."""
+
+
+class AudioBackend(ABC):
+    """Source of audio streams for `AudioEngine`; see the module docstring for the callback contract."""
+
+    name = "abstract"
+
+    def prepare(self) -> None:
+        """Do the slow part of opening a device ahead of time; the default has nothing to do."""
+
+    @abstractmethod
+    def open_input(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> AudioStream:
+        """An input stream, not yet started; `block_size=0` lets the backend choose."""
+
+    @abstractmethod
+    def open_output(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> AudioStream:
+        """An output stream, not yet started; the callback fills `data` in place."""
+
+    @abstractmethod
+    def play(self, data: np.ndarray, sample_rate: int) -> None:
+        """Start playing `data` in the background, replacing any earlier `play()`."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop what `play()` started."""
+
+
+def default_backend() -> AudioBackend:
+    """The backend named by VIBECORE_AUDIO_BACKEND, imported only when asked for."""
+    name = os.environ.get(BACKEND_ENV, "sounddevice").strip().lower()
+    if name == "offline":
+        from audio_editor.infrastructure.audio.offline_backend import OfflineBackend
+
+        return OfflineBackend(speed=1.0)
+    if name != "sounddevice":
+        raise ValueError(f"Unknown {BACKEND_ENV}: {name!r} (expected 'sounddevice' or 'offline')")
+    from audio_editor.infrastructure.audio.sounddevice_backend import SoundDeviceBackend
+
+    return SoundDeviceBackend()
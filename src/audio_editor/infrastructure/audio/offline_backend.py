@@ -0,0 +1,334 @@
+"""
+Deterministic stand-in for a sound card.
+
+Streams are driven by a simulated clock instead of hardware. Input streams
+read from a fixed source: an array, a WAV file, or a function of the frame
+position. Output can be kept in memory (`capture=True`, for tests) and
+streamed to a WAV file. With `speed=None` the clock only moves when the caller calls
+`advance()` or `run_until_idle()`, so callbacks run on the caller's thread
+at exactly reproducible stream times. Otherwise a clock thread runs the
+callbacks at `speed` times real time, or as fast as possible for
+`speed=math.inf`. Every stream counts its callbacks, frames and the wall
+time spent inside the callback, for measuring latency and throughput.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time as wall_time
+from dataclasses import dataclass
+from typing import Callable, Union
+
+import numpy as np
+
+from audio_editor.infrastructure.audio.backend import (
+    AudioBackend,
+    AudioStream,
+    CallbackStop,
+    StreamCallback,
+    StreamTime,
+)
+from audio_editor.infrastructure.audio.wav_file import WavWriter, read_wav
+
+# An array of samples, a WAV file, or f(start_frame, frames) -> samples.
+InputSource = Union[np.ndarray, str, os.PathLike, Callable[[int, int], np.ndarray], None]
+
+INPUT = "input"
+OUTPUT = "output"
+
+
+@dataclass
+class StreamStats:
+    """What one offline stream has done so far."""
+    callbacks: int = 0
+    frames: int = 0
+    busy_seconds: float = 0.0
+    max_callback_seconds: float = 0.0
+
+
+class OfflineStream(AudioStream):
+    """A stream of an OfflineBackend; delivers fixed-size blocks when the backend clock reaches them."""
+
+    def __init__(
+        self,
+        backend: OfflineBackend,
+        kind: str,
+        sample_rate: int,
+        channels: int,
+        callback: StreamCallback,
+        block_size: int,
+    ) -> None:
+        self.backend = backend
+        self.kind = kind
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.callback = callback
+        self.block_size = int(block_size) or backend.DEFAULT_BLOCK_SIZE
+        self.position = 0
+        self.active = False
+        self.closed = False
+        self.stats = StreamStats()
+        # Clock time of frame 0; set when the stream starts.
+        self._origin = 0.0
+        self._buffer = np.zeros((self.block_size, self.channels), dtype=np.float32)
+
+    @property
+    def due_time(self) -> float:
+        """Clock time at which the next block is complete."""
+        return self._origin + (self.position + self.block_size) / self.sample_rate
+
+    @property
+    def load(self) -> float:
+        """Callback time as a fraction of the audio time delivered; above 1.0 a real device would drop out."""
+        audio_seconds = self.stats.frames / self.sample_rate
+        return self.stats.busy_seconds / audio_seconds if audio_seconds else 0.0
+
+    def start(self) -> None:
+        with self.backend._lock:
+            if self.closed:
+                raise RuntimeError("Stream is closed.")
+            if not self.active:
+                self._origin = self.backend.time - self.position / self.sample_rate
+                self.active = True
+                self.backend._ensure_clock()
+
+    def stop(self) -> None:
+        with self.backend._lock:
+            self.active = False
+
+    def close(self) -> None:
+        with self.backend._lock:
+            self.active = False
+            if not self.closed:
+                self.closed = True
+                self.backend._streams.remove(self)
+
+    def _step(self) -> None:
+        backend = self.backend
+        frames = self.block_size
+        buffer = self._buffer
+        now = backend.time
+        if self.kind == INPUT:
+            backend._read_input(buffer, round(self._origin * self.sample_rate) + self.position)
+            stream_time = StreamTime(now, now - frames / self.sample_rate, 0.0)
+        else:
+            buffer.fill(0.0)
+            stream_time = StreamTime(now, 0.0, now + backend.latency)
+        finished = False
+        started = wall_time.perf_counter()
+        try:
+            self.callback(buffer, frames, stream_time, None)
+        except CallbackStop:
+            finished = True
+        elapsed = wall_time.perf_counter() - started
+        stats = self.stats
+        stats.callbacks += 1
+        stats.frames += frames
+        stats.busy_seconds += elapsed
+        stats.max_callback_seconds = max(stats.max_callback_seconds, elapsed)
+        if self.kind == OUTPUT:
+            backend._capture(buffer, self.sample_rate)
+        self.position += frames
+        if finished:
+            self.active = False
+
+
+class OfflineBackend(AudioBackend):
+    """
+    Audio backend without hardware; see the module docstring.
+
+    `input` feeds every input stream, indexed by clock time so a stream
+    started later reads later samples, like a live microphone. No
+    resampling is done: samples are taken at the stream's rate. With
+    `capture=True` output blocks of all streams are kept in callback
+    order for `captured_output()`; memory then grows with the session, so
+    it is off by default. `output_path` streams them to a float32 WAV
+    file instead, at the rate and channel count of the first output stream. `latency` is added to the
+    output timestamps passed to callbacks.
+    """
+
+    name = "offline"
+    DEFAULT_BLOCK_SIZE = 512
+    # How often a paced clock thread wakes up while waiting for the next block.
+    POLL_SECONDS = 0.005
+
+    def __init__(
+        self,
+        input: InputSource = None,
+        speed: float | None = None,
+        output_path: str | os.PathLike | None = None,
+        latency: float = 0.0,
+        capture: bool = False,
+    ) -> None:
+        if isinstance(input, (str, os.PathLike)):
+            input, _ = read_wav(input)
+        self.input = input
+        self.speed = speed
+        self.output_path = output_path
+        self.latency = float(latency)
+        self.capture = capture
+        self.time = 0.0
+        self._lock = threading.RLock()
+        self._streams: list[OfflineStream] = []
+        self._captured: list[np.ndarray] = []
+        self._writer: WavWriter | None = None
+        self._clock_thread: threading.Thread | None = None
+        self._closed = False
+        self._play_stream: OfflineStream | None = None
+
+    def open_input(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> OfflineStream:
+        return self._open(INPUT, sample_rate, channels, callback, block_size)
+
+    def open_output(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> OfflineStream:
+        return self._open(OUTPUT, sample_rate, channels, callback, block_size)
+
+    def _open(self, kind: str, sample_rate: int, channels: int, callback: StreamCallback, block_size: int) -> OfflineStream:
+        stream = OfflineStream(self, kind, sample_rate, channels, callback, block_size)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Backend is closed.")
+            self._streams.append(stream)
+        return stream
+
+    def play(self, data: np.ndarray, sample_rate: int) -> None:
+        self.stop()
+        samples = np.asarray(data, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples[:, np.newaxis]
+        position = 0
+
+        def callback(out, frames, time, status):
+            nonlocal position
+            chunk = samples[position : position + frames]
+            out[: chunk.shape[0]] = chunk
+            position += frames
+            if position >= samples.shape[0]:
+                raise CallbackStop
+
+        stream = self.open_output(sample_rate, samples.shape[1], callback)
+        self._play_stream = stream
+        stream.start()
+
+    def stop(self) -> None:
+        stream, self._play_stream = self._play_stream, None
+        if stream is not None:
+            stream.close()
+
+    @property
+    def streams(self) -> list[OfflineStream]:
+        with self._lock:
+            return list(self._streams)
+
+    def captured_output(self) -> np.ndarray:
+        """Everything output streams have produced: mono samples, or (frames, channels) for wider streams."""
+        if not self.capture:
+            raise RuntimeError("Output is only kept with OfflineBackend(capture=True).")
+        with self._lock:
+            blocks = list(self._captured)
+        if not blocks:
+            return np.zeros(0, dtype=np.float32)
+        samples = np.concatenate(blocks)
+        return samples[:, 0] if samples.shape[1] == 1 else samples
+
+    def advance(self, seconds: float) -> int:
+        """Move the clock forward, running every block that falls due in time order; returns the block count."""
+        with self._lock:
+            target = self.time + float(seconds)
+            count = 0
+            while True:
+                stream = self._next_due()
+                if stream is None or stream.due_time > target:
+                    break
+                self.time = max(self.time, stream.due_time)
+                stream._step()
+                count += 1
+            self.time = max(self.time, target)
+            return count
+
+    def run_until_idle(self, max_seconds: float = 3600.0) -> int:
+        """Advance until no stream is active (or `max_seconds` of clock time passed); returns the block count."""
+        with self._lock:
+            limit = self.time + float(max_seconds)
+            count = 0
+            while True:
+                stream = self._next_due()
+                if stream is None or stream.due_time > limit:
+                    return count
+                self.time = max(self.time, stream.due_time)
+                stream._step()
+                count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for stream in list(self._streams):
+                stream.close()
+            writer, self._writer = self._writer, None
+        thread = self._clock_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        if writer is not None:
+            writer.close()
+
+    def __enter__(self) -> OfflineBackend:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _next_due(self) -> OfflineStream | None:
+        active = [stream for stream in self._streams if stream.active]
+        return min(active, key=lambda stream: stream.due_time, default=None)
+
+    def _read_input(self, buffer: np.ndarray, start: int) -> None:
+        frames = buffer.shape[0]
+        source = self.input
+        if source is None:
+            buffer.fill(0.0)
+            return
+        if callable(source):
+            samples = np.asarray(source(start, frames), dtype=np.float32)
+        else:
+            samples = source[start : start + frames]
+        count = min(samples.shape[0], frames)
+        block = samples[:count]
+        buffer[:count] = block if block.ndim == 2 else block[:, np.newaxis]
+        buffer[count:] = 0.0
+
+    def _capture(self, buffer: np.ndarray, sample_rate: int) -> None:
+        if self.capture:
+            self._captured.append(buffer.copy())
+        if self.output_path is not None:
+            if self._writer is None:
+                self._writer = WavWriter(self.output_path, sample_rate, "float32", channels=buffer.shape[1])
+            if self._writer.channels == buffer.shape[1]:
+                self._writer.write(buffer)
+
+    def _ensure_clock(self) -> None:
+        if self.speed is None or self._clock_thread is not None:
+            return
+        self._clock_thread = threading.Thread(
+            target=self._run_clock, args=(self.speed,), name="offline-audio-clock", daemon=True
+        )
+        self._clock_thread.start()
+
+    def _run_clock(self, speed: float) -> None:
+        wall_origin = wall_time.perf_counter()
+        clock_origin = self.time
+        while True:
+            with self._lock:
+                stream = None if self._closed else self._next_due()
+                if stream is None:
+                    self._clock_thread = None
+                    return
+                due = stream.due_time
+                delay = 0.0
+                if not math.isinf(speed):
+                    delay = wall_origin + (due - clock_origin) / speed - wall_time.perf_counter()
+                if delay <= 0:
+                    self.time = max(self.time, due)
+                    stream._step()
+                    continue
+            wall_time.sleep(min(delay, self.POLL_SECONDS))
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import sounddevice as sd
+
+from audio_editor.infrastructure.audio.backend import AudioBackend, CallbackStop, StreamCallback
+
+
+def _wrap(callback: StreamCallback):
+    def wrapped(data, frames, time, status):
+        try:
+            callback(data, frames, time, status)
+        except CallbackStop:
+            raise sd.CallbackStop
+    return wrapped
+
+
+class SoundDeviceBackend(AudioBackend):
+    """PortAudio devices through the sounddevice package."""
+
+    name = "sounddevice"
+
+    def prepare(self) -> None:
+        # PortAudio is initialized on import; resolving the default devices
+        # makes the host API probe its drivers before the first stream opens.
+        sd.query_devices(kind="output")
+        sd.query_devices(kind="input")
+
+    def open_input(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> sd.InputStream:
+        return sd.InputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            dtype="float32",
+            blocksize=block_size,
+            callback=_wrap(callback),
+        )
+
+    def open_output(self, sample_rate: int, channels: int, callback: StreamCallback, block_size: int = 0) -> sd.OutputStream:
+        return sd.OutputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            dtype="float32",
+            blocksize=block_size,
+            callback=_wrap(callback),
+        )
+
+    def play(self, data: np.ndarray, sample_rate: int) -> None:
+        sd.play(data, samplerate=sample_rate)
+
+    def stop(self) -> None:
+        sd.stop()
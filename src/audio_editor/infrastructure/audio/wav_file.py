@@ -0,0 +1,348 @@
+"""
+RIFF/RF64 WAVE reading and writing without the stdlib `wave` module.
+
+The header is parsed directly, so `probe_wav` can report the format and
+length of a file without touching its samples. `read_wav` maps the `data`
+chunk with `np.memmap` and converts it to mono float32 in fixed-size
+blocks, so decoding needs the output array plus one block of scratch
+space, whatever the file size.
+
+Supported sample formats are 8/16/24/32-bit PCM and 32-bit IEEE float,
+in plain or WAVE_FORMAT_EXTENSIBLE `fmt` chunks. Files whose data passes
+the 4 GB RIFF limit use RF64, where a `ds64` chunk carries 64-bit sizes.
+`WavWriter` reserves room for that chunk up front and upgrades the file
+to RF64 on close only when it has grown past the limit.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterable
+
+import numpy as np
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+READ_BLOCK_FRAMES = 1 << 16
+# Sample formats accepted by WavWriter: (format tag, bytes per sample).
+SAMPLE_FORMATS = {
+    "pcm16": (WAVE_FORMAT_PCM, 2),
+    "pcm24": (WAVE_FORMAT_PCM, 3),
+    "pcm32": (WAVE_FORMAT_PCM, 4),
+    "float32": (WAVE_FORMAT_IEEE_FLOAT, 4),
+}
+_PCM_SCALE = {2: 32767.0, 3: 8388607.0, 4: 2147483647.0}
+_RIFF_LIMIT = 0xFFFFFFFF
+_CHUNK_HEADER = struct.Struct("<4sI")
+_FMT = struct.Struct("<HHIIHH")
+# cbSize, valid bits, channel mask, sub-format GUID.
+_FMT_EXTENSIBLE = struct.Struct("<HHI16s")
+_CHANNEL_MASKS = {1: 0x4, 2: 0x3}
+_DS64 = struct.Struct("<QQQI")
+# KSDATAFORMAT_SUBTYPE_* GUIDs share this tail after the 16-bit format tag.
+_GUID_TAIL = b"\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """Format and layout of a WAV file, as read from its header."""
+    sample_rate: int
+    channels: int
+    sample_width: int
+    format_tag: int
+    frames: int
+    data_offset: int
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def is_float(self) -> bool:
+        return self.format_tag == WAVE_FORMAT_IEEE_FLOAT
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+
+def probe_wav(file_path: str | os.PathLike) -> WavInfo:
+    """Read only the RIFF/RF64 header and chunk table of a WAV file."""
+    file_size = os.path.getsize(file_path)
+    with open(file_path, "rb") as handle:
+        riff, _ = _CHUNK_HEADER.unpack(_read_exact(handle, _CHUNK_HEADER.size))
+        if riff not in (b"RIFF", b"RF64", b"BW64") or handle.read(4) != b"WAVE":
+            raise ValueError("Not a RIFF/WAVE file.")
+        fmt: tuple | None = None
+        format_tag = 0
+        ds64_data_size: int | None = None
+        while True:
+            header = handle.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                raise ValueError("WAV file has no data chunk.")
+            chunk_id, chunk_size = _CHUNK_HEADER.unpack(header)
+            body = chunk_size + (chunk_size & 1)
+            if chunk_id == b"ds64":
+                _, ds64_data_size, _, _ = _DS64.unpack(_read_exact(handle, _DS64.size))
+                handle.seek(body - _DS64.size, os.SEEK_CUR)
+            elif chunk_id == b"fmt ":
+                raw = _read_exact(handle, chunk_size)
+                fmt = _FMT.unpack_from(raw)
+                format_tag = fmt[0]
+                if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                    if chunk_size < _FMT.size + _FMT_EXTENSIBLE.size:
+                        raise ValueError("Truncated WAVE_FORMAT_EXTENSIBLE header.")
+                    _, _, _, subformat = _FMT_EXTENSIBLE.unpack_from(raw, _FMT.size)
+                    format_tag = struct.unpack_from("<H", subformat)[0]
+                handle.seek(body - chunk_size, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("WAV data chunk precedes its fmt chunk.")
+                data_offset = handle.tell()
+                if chunk_size == _RIFF_LIMIT and ds64_data_size is not None:
+                    chunk_size = ds64_data_size
+                break
+            else:
+                handle.seek(body, os.SEEK_CUR)
+
+    _, channels, sample_rate, _, block_align, bits = fmt
+    sample_width = (bits + 7) // 8
+    if format_tag == WAVE_FORMAT_PCM:
+        supported = sample_width in (1, 2, 3, 4)
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        supported = sample_width == 4
+    else:
+        raise ValueError(f"Unsupported WAV format tag: {format_tag:#06x}")
+    if channels < 1 or not supported or block_align != channels * sample_width:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+    # Truncated recordings often carry the size they were meant to reach.
+    data_size = min(chunk_size, file_size - data_offset)
+    return WavInfo(
+        sample_rate=sample_rate,
+        channels=channels,
+        sample_width=sample_width,
+        format_tag=format_tag,
+        frames=data_size // block_align,
+        data_offset=data_offset,
+    )
+
+
+def read_wav(
+    file_path: str | os.PathLike,
+    block_frames: int = READ_BLOCK_FRAMES,
+    progress: Callable[[int], None] | None = None,
+) -> tuple[np.ndarray, int]:
+    """
+    Decode a WAV file to mono float32 in [-1, 1]; returns (samples, sample_rate).
+
+    `progress` is called with the number of frames decoded so far after each
+    block; an exception raised from it aborts the read.
+    """
+    info = probe_wav(file_path)
+    out = np.empty(info.frames, dtype=np.float32)
+    if info.frames == 0:
+        return out, info.sample_rate
+    mapped = np.memmap(
+        file_path,
+        dtype=np.uint8,
+        mode="r",
+        offset=info.data_offset,
+        shape=(info.frames * info.block_align,),
+    )
+    try:
+        decoder = _BlockDecoder(info, block_frames)
+        for start in range(0, info.frames, block_frames):
+            stop = min(start + block_frames, info.frames)
+            raw = mapped[start * info.block_align : stop * info.block_align]
+            decoder.decode(raw, out[start:stop])
+            if progress is not None:
+                progress(stop)
+    finally:
+        del mapped
+    return out, info.sample_rate
+
+
+class _BlockDecoder:
+    """Converts one block of interleaved sample bytes to mono float32, reusing its scratch buffers."""
+
+    def __init__(self, info: WavInfo, block_frames: int) -> None:
+        self.info = info
+        count = block_frames * info.channels
+        self._samples = np.empty(count, dtype=np.float32)
+        # 24-bit samples are widened by placing their bytes in the top of an int32.
+        self._wide = np.zeros((count if info.sample_width == 3 else 0, 4), dtype=np.uint8)
+
+    def decode(self, raw: np.ndarray, out: np.ndarray) -> None:
+        info = self.info
+        count = out.size * info.channels
+        samples = self._samples[:count]
+        width = info.sample_width
+        if info.is_float:
+            np.copyto(samples, raw.view("<f4"))
+        elif width == 1:
+            np.subtract(raw, np.float32(128.0), out=samples, dtype=np.float32)
+            samples *= np.float32(1.0 / 128.0)
+        elif width == 2:
+            np.multiply(raw.view("<i2"), np.float32(1.0 / 32768.0), out=samples, dtype=np.float32)
+        elif width == 3:
+            wide = self._wide[:count]
+            wide[:, 1:] = raw.reshape(count, 3)
+            np.multiply(wide.view("<i4")[:, 0], np.float32(1.0 / 2147483648.0), out=samples, dtype=np.float32)
+        else:
+            np.multiply(raw.view("<i4"), np.float32(1.0 / 2147483648.0), out=samples, dtype=np.float32)
+
+        if info.channels > 1:
+            samples.reshape(-1, info.channels).mean(axis=1, out=out)
+        else:
+            out[:] = samples
+        np.clip(out, -1.0, 1.0, out=out)
+
+
+class WavWriter:
+    """
+    Streams float samples to a WAV file in one of `SAMPLE_FORMATS`.
+
+    PCM formats clip and quantize each block through a reused scratch
+    buffer; float32 blocks are written from the caller's memory as-is.
+    Input is mono, or interleaved frames for `channels > 1`.
+    """
+
+    def __init__(
+        self,
+        file_path: str | os.PathLike,
+        sample_rate: int,
+        sample_format: str = "pcm16",
+        channels: int = 1,
+    ) -> None:
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+        self.sample_rate = int(sample_rate)
+        self.sample_format = sample_format
+        self.channels = int(channels)
+        self.format_tag, self.sample_width = SAMPLE_FORMATS[sample_format]
+        self.data_bytes = 0
+        self._allocate(0)
+        self._handle: BinaryIO = open(file_path, "wb")
+        try:
+            self._write_header()
+        except BaseException:
+            self._handle.close()
+            raise
+
+    @property
+    def frames(self) -> int:
+        return self.data_bytes // (self.channels * self.sample_width)
+
+    def _write_header(self) -> None:
+        handle = self._handle
+        handle.write(_CHUNK_HEADER.pack(b"RIFF", 0) + b"WAVE")
+        # Placeholder that becomes the ds64 chunk if the file outgrows RIFF.
+        self._junk_offset = handle.tell()
+        handle.write(_CHUNK_HEADER.pack(b"JUNK", _DS64.size) + bytes(_DS64.size))
+        block_align = self.channels * self.sample_width
+        fmt = _FMT.pack(
+            self.format_tag if self.sample_width <= 2 and self.channels <= 2 else WAVE_FORMAT_EXTENSIBLE,
+            self.channels,
+            self.sample_rate,
+            self.sample_rate * block_align,
+            block_align,
+            self.sample_width * 8,
+        )
+        if self.sample_width > 2 or self.channels > 2:
+            subformat = struct.pack("<H", self.format_tag) + _GUID_TAIL
+            fmt += _FMT_EXTENSIBLE.pack(
+                _FMT_EXTENSIBLE.size - 2,
+                self.sample_width * 8,
+                _CHANNEL_MASKS.get(self.channels, 0),
+                subformat,
+            )
+        handle.write(_CHUNK_HEADER.pack(b"fmt ", len(fmt)) + fmt)
+        self._data_header_offset = handle.tell()
+        handle.write(_CHUNK_HEADER.pack(b"data", 0))
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append a block of float samples; PCM formats clip them to [-1, 1]."""
+        samples = np.asarray(samples)
+        if samples.size == 0:
+            return
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            block = np.ascontiguousarray(samples, dtype="<f4")
+            self._handle.write(block.data.cast("B"))
+            self.data_bytes += block.nbytes
+            return
+        count = samples.size
+        if self._wide.size < count:
+            self._allocate(count)
+        wide = self._wide[:count]
+        np.clip(samples.reshape(-1), -1.0, 1.0, out=wide)
+        np.multiply(wide, _PCM_SCALE[self.sample_width], out=wide)
+        pcm = self._pcm[:count]
+        np.copyto(pcm, wide, casting="unsafe")
+        if self.sample_width == 3:
+            packed = self._packed[:count]
+            np.copyto(packed, pcm.view(np.uint8).reshape(count, 4)[:, :3])
+            pcm = packed
+        self._handle.write(pcm.data.cast("B"))
+        self.data_bytes += count * self.sample_width
+
+    def _allocate(self, count: int) -> None:
+        # float64 keeps full-scale 32-bit values exact; narrower formats fit in float32.
+        self._wide = np.empty(count, dtype=np.float64 if self.sample_width == 4 else np.float32)
+        self._pcm = np.empty(count, dtype="<i2" if self.sample_width == 2 else "<i4")
+        self._packed = np.empty((count if self.sample_width == 3 else 0, 3), dtype=np.uint8)
+
+    def close(self) -> None:
+        """Pad the data chunk, fill in chunk sizes and switch to RF64 when needed."""
+        handle = self._handle
+        if handle.closed:
+            return
+        try:
+            if self.data_bytes & 1:
+                handle.write(b"\x00")
+            riff_size = handle.tell() - _CHUNK_HEADER.size
+            if riff_size > _RIFF_LIMIT or self.data_bytes > _RIFF_LIMIT:
+                handle.seek(0)
+                handle.write(_CHUNK_HEADER.pack(b"RF64", _RIFF_LIMIT))
+                handle.seek(self._junk_offset)
+                handle.write(_CHUNK_HEADER.pack(b"ds64", _DS64.size))
+                handle.write(_DS64.pack(riff_size, self.data_bytes, self.frames, 0))
+                handle.seek(self._data_header_offset)
+                handle.write(_CHUNK_HEADER.pack(b"data", _RIFF_LIMIT))
+            else:
+                handle.seek(0)
+                handle.write(_CHUNK_HEADER.pack(b"RIFF", riff_size))
+                handle.seek(self._data_header_offset)
+                handle.write(_CHUNK_HEADER.pack(b"data", self.data_bytes))
+        finally:
+            handle.close()
+
+    def __enter__(self) -> WavWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_wav(
+    file_path: str | os.PathLike,
+    samples: np.ndarray | Iterable[np.ndarray],
+    sample_rate: int,
+    sample_format: str = "pcm16",
+) -> int:
+    """Write mono samples, or an iterable of sample blocks, to a WAV file; returns the frame count."""
+    blocks = [samples] if isinstance(samples, np.ndarray) else samples
+    with WavWriter(file_path, sample_rate, sample_format) as writer:
+        for block in blocks:
+            writer.write(block)
+    return writer.frames
+
+
+def _read_exact(handle, size: int) -> bytes:
+    data = handle.read(size)
+    if len(data) < size:
+        raise ValueError("Unexpected end of WAV header.")
+    return data
@@ -0,0 +1,141 @@
+"""
+`.vcpeaks` sidecar files: cached peak pyramids stored next to the media
+file or project they were computed from.
+
+    magic    8 bytes   b"VCPEAKS\\0"
+    version  uint32 LE
+    length   uint32 LE manifest size in bytes
+    manifest UTF-8 JSON: the source fingerprint and, per key (a track id,
+             or MEDIA_KEY for an imported file), the bucket sizes and
+             the blob offset of every level
+    blobs    per level: mins <f4, maxs <f4, sumsq <f8 (offsets are
+             relative to the end of the manifest)
+
+The fingerprint is the source's size, mtime and a BLAKE2 hash of its first
+and last FINGERPRINT_SPAN bytes. A sidecar whose fingerprint does not match
+its source is stale and ignored; sidecars are a cache, so failing to read
+or write one is never an error.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.peak_pyramid import PeakPyramid
+
+
+PEAKS_SUFFIX = ".vcpeaks"
+MAGIC = b"VCPEAKS\0"
+FORMAT_VERSION = 1
+# Key of the single pyramid in a sidecar written for an imported media file.
+MEDIA_KEY = "mono"
+FINGERPRINT_SPAN = 1 << 16
+_HEADER = struct.Struct("<8sII")
+_LEVEL_DTYPES: tuple[np.dtype, ...] = (np.dtype("<f4"), np.dtype("<f4"), np.dtype("<f8"))
+
+
+@dataclass(frozen=True)
+class StoredPeaks:
+    """Pyramid levels read from a sidecar, as accepted by `AudioTrack.restore_peaks`."""
+    sample_count: int
+    bucket_sizes: tuple[int, ...]
+    levels: list[tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+def restore_track_peaks(track: AudioTrack, stored: StoredPeaks | None) -> bool:
+    """Give `track` the stored pyramid if there is one and it matches the track's samples."""
+    if stored is None:
+        return False
+    return track.restore_peaks(stored.sample_count, stored.bucket_sizes, stored.levels)
+
+
+def peak_file_path(source_path: str | os.PathLike) -> Path:
+    return Path(os.fspath(source_path) + PEAKS_SUFFIX)
+
+
+def source_fingerprint(source_path: str | os.PathLike) -> dict:
+    """Cheap identity of a file: size, mtime and a hash of its head and tail."""
+    stat = os.stat(source_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(stat.st_size.to_bytes(8, "little"))
+    with open(source_path, "rb") as handle:
+        digest.update(handle.read(FINGERPRINT_SPAN))
+        if stat.st_size > FINGERPRINT_SPAN:
+            handle.seek(max(FINGERPRINT_SPAN, stat.st_size - FINGERPRINT_SPAN))
+            digest.update(handle.read(FINGERPRINT_SPAN))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest.hexdigest()}
+
+
+def save_peaks(source_path: str | os.PathLike, pyramids: dict[str, PeakPyramid]) -> bool:
+    """Write the pyramids to the source's sidecar; returns False if it could not be written."""
+    target = peak_file_path(source_path)
+    entries = {}
+    blobs: list[np.ndarray] = []
+    cursor = 0
+    for key, pyramid in pyramids.items():
+        offsets = []
+        for arrays in pyramid.raw_levels():
+            offsets.append(cursor)
+            for array, dtype in zip(arrays, _LEVEL_DTYPES):
+                blob = np.ascontiguousarray(array, dtype=dtype)
+                blobs.append(blob)
+                cursor += blob.nbytes
+        entries[key] = {
+            "sample_count": pyramid.sample_count,
+            "bucket_sizes": list(pyramid.bucket_sizes),
+            "levels": offsets,
+        }
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        manifest = json.dumps({"source": source_fingerprint(source_path), "pyramids": entries}).encode("utf-8")
+        with open(tmp_path, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(manifest)))
+            handle.write(manifest)
+            for blob in blobs:
+                handle.write(blob.data.cast("B"))
+        os.replace(tmp_path, target)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_peaks(source_path: str | os.PathLike) -> dict[str, StoredPeaks]:
+    """Pyramids from the source's sidecar, or {} when it is missing, stale or unreadable."""
+    path = peak_file_path(source_path)
+    try:
+        with open(path, "rb") as handle:
+            magic, version, manifest_length = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return {}
+            manifest = json.loads(handle.read(manifest_length).decode("utf-8"))
+            if manifest.get("source") != source_fingerprint(source_path):
+                return {}
+            blob_start = handle.tell()
+            stored = {}
+            for key, entry in manifest["pyramids"].items():
+                sample_count = int(entry["sample_count"])
+                sizes = tuple(int(size) for size in entry["bucket_sizes"])
+                levels = []
+                for size, offset in zip(sizes, entry["levels"]):
+                    count = -(-sample_count // size)
+                    handle.seek(blob_start + int(offset))
+                    mins, maxs, sumsq = (np.fromfile(handle, dtype=dtype, count=count) for dtype in _LEVEL_DTYPES)
+                    if any(array.size != count for array in (mins, maxs, sumsq)):
+                        return {}
+                    levels.append((mins, maxs, sumsq))
+                stored[key] = StoredPeaks(sample_count, sizes, levels)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return {}
+    return stored
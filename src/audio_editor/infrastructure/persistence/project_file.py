@@ -0,0 +1,214 @@
+"""
+`.vcoreproj` container (version 2):
+
+    magic    8 bytes   b"VCOREPRJ"
+    version  uint32 LE
+    length   uint32 LE manifest size in bytes
+    manifest UTF-8 JSON: project name and per-track metadata, where each
+             track's samples are described by {"offset", "length"}
+    blobs    raw little-endian float32 samples, each starting on a
+             BLOB_ALIGNMENT boundary (offsets are absolute)
+
+Version 1 projects were a single JSON document with samples stored as
+lists of floats; `load_project` still reads them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.edit_history import EditHistory
+from audio_editor.domain.project import Project
+from audio_editor.infrastructure.persistence.peak_file import load_peaks, restore_track_peaks, save_peaks
+
+
+MAGIC = b"VCOREPRJ"
+FORMAT_VERSION = 2
+BLOB_ALIGNMENT = 64
+SAMPLE_DTYPE = np.dtype("<f4")
+_HEADER = struct.Struct("<8sII")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // BLOB_ALIGNMENT) * BLOB_ALIGNMENT
+
+
+def _track_manifest(track: AudioTrack, offset: int) -> dict:
+    return {
+        "id": track.track_id,
+        "name": track.name,
+        "sample_rate": track.sample_rate,
+        "file_path": str(track.file_path) if track.file_path else None,
+        "volume": track.volume,
+        "muted": track.muted,
+        "sample_boundaries": list(track.sample_boundaries),
+        "samples": {"offset": offset, "length": track.sample_count, "dtype": SAMPLE_DTYPE.str},
+    }
+
+
+def _track_from_manifest(item: dict, data: np.ndarray) -> AudioTrack:
+    identity: dict[str, Any] = {"track_id": str(item["id"])} if item.get("id") else {}
+    track = AudioTrack(
+        name=item["name"],
+        sample_rate=int(item["sample_rate"]),
+        data=data,
+        file_path=Path(item["file_path"]) if item.get("file_path") else None,
+        volume=float(item.get("volume", 1.0)),
+        muted=bool(item.get("muted", False)),
+        **identity,
+    )
+    track.set_boundaries(item.get("sample_boundaries", []))
+    return track
+
+
+def _maps_file(path: Path):
+    """Predicate selecting pieces that are views of a memory map of `path`."""
+    target = os.path.normcase(os.path.abspath(path))
+
+    def maps(piece: np.ndarray) -> bool:
+        base: object = piece
+        while isinstance(base, np.ndarray):
+            if isinstance(base, np.memmap):
+                return base.filename is not None and os.path.normcase(base.filename) == target
+            base = base.base
+        return False
+
+    return maps
+
+
+def save_project(project: Project, file_path: str | os.PathLike, history: EditHistory | None = None) -> None:
+    """
+    Write the project as a binary container and refresh its peak sidecar; samples are streamed piece by piece.
+
+    Samples still mapped from the file being overwritten, in the project's
+    tracks or in `history`, are copied into memory first: Windows refuses
+    to replace a file that is mapped. Callers must also release other
+    snapshots of those tracks, such as running playback and mix caches.
+    """
+    tracks = project.get_tracks()
+
+    # Blob offsets are stored in the manifest, so repeat the layout until its size settles.
+    def layout(data_start: int) -> tuple[list[dict], list[int]]:
+        offsets = []
+        cursor = data_start
+        for track in tracks:
+            offsets.append(cursor)
+            cursor = _align(cursor + track.sample_count * SAMPLE_DTYPE.itemsize)
+        return [_track_manifest(t, o) for t, o in zip(tracks, offsets)], offsets
+
+    data_start = 0
+    while True:
+        entries, offsets = layout(data_start)
+        manifest = json.dumps({"name": project.name, "tracks": entries}).encode("utf-8")
+        needed = _align(_HEADER.size + len(manifest))
+        if needed == data_start:
+            break
+        data_start = needed
+
+    path = Path(file_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as out_file:
+        out_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(manifest)))
+        out_file.write(manifest)
+        for track, offset in zip(tracks, offsets):
+            out_file.write(b"\0" * (offset - out_file.tell()))
+            for chunk in track._store.iter_chunks(0, track.sample_count):
+                out_file.write(memoryview(chunk.astype(SAMPLE_DTYPE, copy=False)).cast("B"))
+    if path.exists():
+        mapped = _maps_file(path)
+        for track in tracks:
+            track.detach_samples(mapped)
+        if history is not None:
+            history.detach(mapped)
+    os.replace(tmp_path, path)
+    save_peaks(path, {track.track_id: track.peaks for track in tracks})
+
+
+def _read_manifest(in_file, file_path: Path) -> dict:
+    magic, version, manifest_len = _HEADER.unpack(in_file.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{file_path.name} is not a VibeCore project")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported project version: {version}")
+    return json.loads(in_file.read(manifest_len).decode("utf-8"))
+
+
+def _read_blob(in_file, item: dict) -> np.ndarray:
+    blob = item["samples"]
+    data = np.empty(int(blob["length"]), dtype=SAMPLE_DTYPE)
+    in_file.seek(int(blob["offset"]))
+    if in_file.readinto(data.data.cast("B")) != data.nbytes:
+        raise ValueError(f"Truncated sample data for track {item['name']!r}")
+    return data
+
+
+def _map_blob(mapped: np.memmap, item: dict) -> np.ndarray:
+    blob = item["samples"]
+    offset = int(blob["offset"])
+    length = int(blob["length"])
+    if offset + length * SAMPLE_DTYPE.itemsize > mapped.size:
+        raise ValueError(f"Truncated sample data for track {item['name']!r}")
+    # A plain read-only view of the mapping: pages are only read when touched.
+    return np.ndarray((length,), dtype=SAMPLE_DTYPE, buffer=mapped, offset=offset)
+
+
+def _load_container(in_file, file_path: Path, mmap: bool) -> Project:
+    manifest = _read_manifest(in_file, file_path)
+    mapped = None
+    if mmap and os.fstat(in_file.fileno()).st_size > 0:
+        mapped = np.memmap(file_path, dtype=np.uint8, mode="r")
+
+    project = Project(str(manifest.get("name", "My Project")))
+    for item in manifest.get("tracks", []):
+        if mapped is not None:
+            data = _map_blob(mapped, item)
+        else:
+            data = _read_blob(in_file, item)
+            data.flags.writeable = False
+        # Read-only float32 buffers are adopted by the track's sample store without
+        # a copy; edits splice new pieces around them, so only edited ranges
+        # ever become private memory.
+        project.add_track(_track_from_manifest(item, data.astype(np.float32, copy=False)))
+    return project
+
+
+def _load_json_v1(file_path: Path) -> Project:
+    with open(file_path, "r", encoding="utf-8") as in_file:
+        payload = json.load(in_file)
+    project = Project(str(payload.get("name", "My Project")))
+    for item in payload.get("tracks", []):
+        data = np.asarray(item.get("data", []), dtype=np.float32)
+        project.add_track(_track_from_manifest(item, data))
+    return project
+
+
+def load_project(file_path: str | os.PathLike, mmap: bool = True) -> Project:
+    """
+    Load a binary container or a legacy version-1 JSON project.
+
+    With `mmap=True` container samples stay on disk: tracks are backed by
+    read-only memory-mapped views, so opening is independent of project size.
+    Peak pyramids come from the project's `.vcpeaks` sidecar when it is
+    current, so nothing has to scan the samples to draw the waveforms.
+    """
+    path = Path(file_path)
+    with open(path, "rb") as in_file:
+        if in_file.read(len(MAGIC)) == MAGIC:
+            in_file.seek(0)
+            project = _load_container(in_file, path, mmap)
+        else:
+            project = None
+    if project is None:
+        return _load_json_v1(path)
+    # Peaks cached by the last save let lanes draw without reading the samples.
+    stored = load_peaks(path)
+    for track in project.tracks:
+        restore_track_peaks(track, stored.get(track.track_id))
+    return project
@@ -1,59 +1,87 @@
-import sounddevice as sd
+from __future__ import annotations
+
+import threading
 import numpy as np
-from typing import List
+from typing import TYPE_CHECKING, List
+
+from audio_editor.infrastructure.audio.backend import AudioBackend, AudioStream, CallbackStop, default_backend
+from audio_editor.services.recording_buffer import RecordingBuffer
+
+if TYPE_CHECKING:
+    from audio_editor.services.mix_cache import MixCache
+    from audio_editor.services.playback import ProjectPlayback
 
 class AudioEngine:
-    def __init__(self):
-        self._input_stream = None
-        self._recording_buffer = []
+    def __init__(self, backend: AudioBackend | None = None):
+        # sounddevice unless VIBECORE_AUDIO_BACKEND says otherwise; tests pass an OfflineBackend.
+        # The default is only loaded on first use or by warm_up(): initializing
+        # PortAudio can take longer than building the whole window.
+        self._backend: AudioBackend | None = backend
+        self._backend_lock = threading.Lock()
+        self._input_stream: AudioStream | None = None
+        self._recording_buffer = RecordingBuffer()
         self._is_recording = False
+        self._output_stream: AudioStream | None = None
+        self._playback: ProjectPlayback | None = None
+
+    @property
+    def backend(self) -> AudioBackend:
+        with self._backend_lock:
+            if self._backend is None:
+                self._backend = default_backend()
+            return self._backend
+
+    def warm_up(self) -> bool:
+        """Load and initialize the backend ahead of first use; safe to call from any thread."""
+        try:
+            self.backend.prepare()
+        except Exception as exc:
+            # Reported again, with the real traceback, when audio is first used.
+            print(f"Audio backend unavailable: {exc}")
+            return False
+        return True
 
     def start_recording(self, sample_rate: int):
         if self._is_recording:
             return
 
-        self._recording_buffer = []
+        self._recording_buffer = RecordingBuffer()
         self._is_recording = True
+        buffer = self._recording_buffer
 
         def callback(indata, frames, time, status):
             if status:
                 print(status)
-            # Keep callback lightweight
-            self._recording_buffer.append(indata.copy())
-
-        self._input_stream = sd.InputStream(
-            samplerate=sample_rate,
-            channels=1,
-            dtype="float32",
-            callback=callback,
-        )
+            # Keep callback lightweight: copy into preallocated chunks only.
+            buffer.write(indata)
 
-        self._input_stream.start()
+        stream = self.backend.open_input(sample_rate, 1, callback)
+        self._input_stream = stream
+        stream.start()
 
     def stop_recording(self) -> np.ndarray:
-        if not self._is_recording:
+        stream = self._input_stream
+        if not self._is_recording or stream is None:
             return np.array([], dtype="float32")
 
-        self._input_stream.stop()
-        self._input_stream.close()
+        stream.stop()
+        stream.close()
+        self._input_stream = None
 
         self._is_recording = False
+        return self._recording_buffer.read()
 
-        if not self._recording_buffer:
-            return np.array([], dtype="float32")
+    def recorded_frame_count(self) -> int:
+        """Number of frames captured so far in the current (or last) take."""
+        return self._recording_buffer.frames
 
-        audio = np.concatenate(self._recording_buffer, axis=0)
-        return audio.flatten()
+    def read_recording_since(self, position: int) -> tuple[np.ndarray, int]:
+        """Return frames captured after `position` and the position to resume from."""
+        return self._recording_buffer.read_since(position)
 
     def get_recording_preview(self) -> np.ndarray:
         """Return currently buffered recording audio without stopping the stream."""
-        if not self._recording_buffer:
-            return np.array([], dtype="float32")
-        try:
-            audio = np.concatenate(list(self._recording_buffer), axis=0)
-        except ValueError:
-            return np.array([], dtype="float32")
-        return audio.flatten()
+        return self._recording_buffer.read()
 
     def is_recording(self) -> bool:
         return self._is_recording
@@ -61,42 +89,46 @@ class AudioEngine:
     def play(self, data: np.ndarray, sample_rate: int):
         if len(data) == 0:
             return
-        sd.play(data, samplerate=sample_rate)
+        self._close_output_stream()
+        self.backend.play(data, sample_rate)
 
     def stop(self):
-        sd.stop()
+        self._close_output_stream()
+        self.backend.stop()
 
-    def play_project(self, tracks: List):
+    def play_project(self, tracks: List, block_size: int = 2048, mix_cache: MixCache | None = None):
         """
-        Mix all tracks together and play as a single audio stream.
-        Handles different lengths by padding shorter tracks.
+        Stream a live mix of all tracks through an output stream.
+
+        Blocks are mixed on demand in the stream callback, so playback starts
+        immediately regardless of project length. With a `mix_cache`, blocks
+        rendered by earlier playbacks are reused.
         """
+        self._close_output_stream()
         if not tracks:
             return
 
-        # Find max length
-        max_length = max((len(t.data) for t in tracks if len(t.data) > 0), default=0)
+        from audio_editor.services.playback import ProjectPlayback
 
-        if max_length == 0:
+        playback = ProjectPlayback(tracks, block_size=block_size, mix_cache=mix_cache)
+        if playback.finished:
             return
 
-        # Initialize mix
-        mix = np.zeros(max_length, dtype=np.float32)
-
-        # Sum tracks
-        for t in tracks:
-            if len(t.data) == 0 or t.muted:
-                continue
-            track_data = np.array(t.data, dtype=np.float32)
-            track_data *= t.volume  # Apply volume
-            # Pad if shorter
-            if len(track_data) < max_length:
-                track_data = np.pad(track_data, (0, max_length - len(track_data)))
-            mix += track_data
-
-        # Normalize to avoid clipping
-        max_val = np.max(np.abs(mix))
-        if max_val > 1.0:
-            mix = mix / max_val
-
-        sd.play(mix, samplerate=tracks[0].sample_rate)
+        def callback(outdata, frames, time, status):
+            if status:
+                print(status)
+            if not playback.render(outdata[:, 0]):
+                raise CallbackStop
+
+        stream = self.backend.open_output(playback.sample_rate, 1, callback, block_size)
+        self._playback = playback
+        self._output_stream = stream
+        stream.start()
+
+    def _close_output_stream(self):
+        stream = self._output_stream
+        self._output_stream = None
+        self._playback = None
+        if stream is not None:
+            stream.stop()
+            stream.close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.wav_file import probe_wav, read_wav
+from audio_editor.infrastructure.persistence.peak_file import MEDIA_KEY, load_peaks, restore_track_peaks, save_peaks
+
+
+class ImportCancelled(Exception):
+    """Raised inside a worker when its import job has been cancelled."""
+
+
+@dataclass
+class ImportedFile:
+    """Outcome of decoding one selected file; exactly one of track/error is set."""
+    index: int
+    path: Path
+    track: AudioTrack | None = None
+    error: Exception | None = None
+
+
+class FileImportJob:
+    """
+    Decodes audio files on a thread pool and hands them back in selection order.
+
+    Headers are probed up front so progress can be reported in frames across
+    all files. Each worker decodes its file block by block (NumPy releases
+    the GIL during conversion) and builds the track's peak pyramid in the
+    same pass, or takes it from the file's `.vcpeaks` sidecar and writes
+    one when missing, so the UI thread only has to add finished tracks.
+    `take_ready()` returns results as soon as every earlier file is done.
+    """
+
+    def __init__(self, paths: Iterable[str | os.PathLike], max_workers: int | None = None) -> None:
+        self.paths = [Path(path) for path in paths]
+        self.max_workers = max_workers or max(1, min(len(self.paths), os.cpu_count() or 1))
+        self._cancelled = threading.Event()
+        self._frames_total = [0] * len(self.paths)
+        self._frames_done = [0] * len(self.paths)
+        self._futures: list[Future] = []
+        self._next = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import")
+        for index, path in enumerate(self.paths):
+            try:
+                self._frames_total[index] = probe_wav(path).frames
+            except Exception as exc:
+                failed: Future = Future()
+                failed.set_result(ImportedFile(index, path, error=exc))
+                self._futures.append(failed)
+                continue
+            self._futures.append(self._executor.submit(self._load, index, path))
+        self._executor.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        """Stop queued files from starting and abort running decodes at their next block."""
+        self._cancelled.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of all probed frames decoded so far."""
+        total = sum(self._frames_total)
+        if total == 0:
+            return 1.0 if self.finished else 0.0
+        return sum(self._frames_done) / total
+
+    @property
+    def finished(self) -> bool:
+        return self._next >= len(self._futures)
+
+    def take_ready(self) -> list[ImportedFile]:
+        """Results whose predecessors are all done, in selection order; never blocks."""
+        ready = []
+        while self._next < len(self._futures) and self._futures[self._next].done():
+            ready.append(self._result(self._next))
+            self._next += 1
+        return ready
+
+    def wait(self) -> list[ImportedFile]:
+        """Block until every remaining file is done and return their results in order."""
+        ready = []
+        while self._next < len(self._futures):
+            ready.append(self._result(self._next))
+            self._next += 1
+        return ready
+
+    def _result(self, index: int) -> ImportedFile:
+        future = self._futures[index]
+        if future.cancelled():
+            return ImportedFile(index, self.paths[index], error=ImportCancelled())
+        return future.result()
+
+    def _load(self, index: int, path: Path) -> ImportedFile:
+        def advance(frames: int) -> None:
+            if self._cancelled.is_set():
+                raise ImportCancelled()
+            self._frames_done[index] = frames
+
+        try:
+            advance(0)
+            samples, sample_rate = read_wav(path, progress=advance)
+            track = AudioTrack(name=path.stem, sample_rate=sample_rate, data=samples, file_path=path)
+            if not restore_track_peaks(track, load_peaks(path).get(MEDIA_KEY)):
+                track.peaks.refresh()
+                save_peaks(path, {MEDIA_KEY: track.peaks})
+        except Exception as exc:
+            return ImportedFile(index, path, error=exc)
+        return ImportedFile(index, path, track=track)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import queue
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.project import (
+    SAMPLES_CHANGED,
+    TRACK_REMOVED,
+    Project,
+    ProjectChange,
+)
+from audio_editor.services.mixer import Mixer, MixSource
+
+
+@dataclass
+class _MixBlock:
+    """Pre-normalization mix of one time block and the track gains it was rendered with."""
+    samples: np.ndarray
+    gains: dict[str, float]
+    # Gain-only updates applied since the last full render; bounded to limit rounding drift.
+    updates: int = 0
+
+
+@dataclass
+class MixCacheStats:
+    hits: int = 0
+    rendered: int = 0
+    updated: int = 0
+
+
+class MixCache:
+    """
+    Rendered project mix, kept in fixed-size time blocks across playbacks.
+
+    Each block remembers the effective gain (volume, or 0 when muted) of
+    every track it was mixed from. Sample edits reported by the project
+    drop only the blocks they overlap; when a track's gain changed, a
+    block is patched by adding that track's samples times the gain
+    difference, which reads one track instead of re-mixing all of them.
+    Blocks are stored before normalization, so the gain can change freely.
+    Memory is bounded by `max_bytes`, least recently used blocks first.
+
+    Blocks are filled on a background worker, never in the audio callback:
+    a callback that misses mixes just its own window and queues the block.
+    The callback only reads the block table and posts to the worker's
+    queue, so it never waits on the lock edits take.
+    """
+
+    BLOCK_FRAMES = 1 << 15
+    MAX_UPDATES = 8
+
+    def __init__(self, project: Project, block_frames: int = BLOCK_FRAMES, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.project = project
+        self.block_frames = int(block_frames)
+        self.max_bytes = int(max_bytes)
+        self.stats = MixCacheStats()
+        self._blocks: OrderedDict[int, _MixBlock] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; renders started before a bump are not stored.
+        self._epoch = 0
+        self._sample_rate: int | None = None
+        # Sample version and length of each track as of the last edit this cache saw.
+        self._seen: dict[str, tuple[int, int]] = {}
+        # (mix, block index) requests for the worker thread; None stops it.
+        self._requests: queue.SimpleQueue[tuple[CachedMix, int] | None] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        project.subscribe(self._on_project_changed)
+
+    def close(self) -> None:
+        """Stop listening to the project and wait for queued fills to finish."""
+        self.project.unsubscribe(self._on_project_changed)
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            self._requests.put(None)
+            worker.join()
+        self.clear()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._blocks) * self.block_frames * 4
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self._epoch += 1
+
+    def invalidate(self, start: int, stop: int) -> None:
+        """Drop the blocks overlapping samples [start, stop)."""
+        first = max(0, int(start)) // self.block_frames
+        last = -(-int(stop) // self.block_frames)
+        with self._lock:
+            for index in [i for i in self._blocks if first <= i < last]:
+                del self._blocks[index]
+            self._epoch += 1
+
+    def _on_project_changed(self, change: ProjectChange) -> None:
+        track = change.track
+        if track is None:
+            return
+        if change.kind == SAMPLES_CHANGED:
+            # A shortened track also leaves stale samples past its new end.
+            _, old_length = self._seen.get(track.track_id, (0, track.sample_count))
+            stop = change.stop if old_length == track.sample_count else max(change.stop, old_length)
+            self.invalidate(change.start, stop)
+            self._seen[track.track_id] = (track.sample_version, track.sample_count)
+        elif change.kind == TRACK_REMOVED:
+            # The removed track's samples are gone, so its share cannot be subtracted.
+            self.invalidate(0, track.sample_count)
+            self._seen.pop(track.track_id, None)
+
+    def prepare(self, tracks: List[AudioTrack], peak_level: int = -1) -> CachedMix:
+        """Capture the tracks for rendering through the cache; call on the thread that edits them."""
+        sample_rate = tracks[0].sample_rate if tracks else 44100
+        if sample_rate != self._sample_rate:
+            self.clear()
+            self._sample_rate = sample_rate
+        for track in tracks:
+            known = self._seen.get(track.track_id)
+            if known is not None and known[0] != track.sample_version:
+                # Edited without this cache hearing about it; nothing cached can be trusted.
+                self.clear()
+            self._seen[track.track_id] = (track.sample_version, track.sample_count)
+        if self._worker is None:
+            # The thread only holds the queue, so a cache nobody closed can still be collected.
+            self._worker = threading.Thread(target=_run_worker, args=(self._requests,), name="mix-cache", daemon=True)
+            self._worker.start()
+            weakref.finalize(self, self._requests.put, None)
+        return CachedMix(self, tracks, peak_level)
+
+    def _peek(self, index: int) -> _MixBlock | None:
+        """Lock-free read for the audio thread; single dict reads are atomic."""
+        return self._blocks.get(index)
+
+    def _lookup(self, index: int) -> _MixBlock | None:
+        with self._lock:
+            block = self._blocks.get(index)
+            if block is not None:
+                self._blocks.move_to_end(index)
+            return block
+
+    def _store(self, index: int, block: _MixBlock, epoch: int) -> None:
+        """Keep a block unless the cache was invalidated after `epoch`, the one its snapshots belong to."""
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self._blocks[index] = block
+            self._blocks.move_to_end(index)
+            while self._blocks and self.nbytes > self.max_bytes:
+                self._blocks.popitem(last=False)
+
+
+def _run_worker(requests: queue.SimpleQueue[tuple[CachedMix, int] | None]) -> None:
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        mix, index = request
+        mix._fill_queued(index)
+        del mix, request
+
+
+@dataclass
+class CachedMix:
+    """A `Mixer` look-alike that serves blocks from a MixCache and fills in what is missing."""
+    cache: MixCache
+    tracks: List[AudioTrack]
+    peak_level: int = -1
+    mixer: Mixer = field(init=False)
+    gains: dict[str, float] = field(init=False)
+    sources: dict[str, MixSource] = field(init=False)
+    # Cache epoch the snapshots were taken at; blocks mixed from them are only stored while it holds.
+    epoch: int = field(init=False)
+    _pending: set[int] = field(init=False, default_factory=set)
+
+    def __post_init__(self) -> None:
+        self.epoch = self.cache._epoch
+        self.mixer = Mixer(self.tracks, peak_level=self.peak_level, scratch_size=self.cache.block_frames)
+        non_empty = [t for t in self.tracks if t.sample_count > 0]
+        self.gains = {t.track_id: 0.0 if t.muted else float(np.float32(t.volume)) for t in non_empty}
+        # Muted tracks are kept too, so muting can be patched out of cached blocks.
+        self.sources = {t.track_id: MixSource.capture(t) for t in non_empty}
+
+    @property
+    def sample_rate(self) -> int:
+        return self.mixer.sample_rate
+
+    @property
+    def length(self) -> int:
+        return self.mixer.length
+
+    @property
+    def gain(self) -> np.float32:
+        return self.mixer.gain
+
+    def render(self, start: int, stop: int, out: np.ndarray) -> int:
+        """
+        Same contract as `Mixer.render`, served from cached blocks where possible.
+
+        Windows without a current block are mixed directly, at the size
+        asked for, and their block is filled in the background; the block
+        after each served one is queued too, so playback runs ahead of it.
+        """
+        frames = max(0, int(stop) - int(start))
+        size = self.cache.block_frames
+        position = int(start)
+        while position < stop:
+            index = position // size
+            block_start = index * size
+            take = min(stop, block_start + size) - position
+            target = out[position - start : position - start + take]
+            if block_start >= self.length:
+                target.fill(0.0)
+            else:
+                samples = self._current(index)
+                if samples is None:
+                    self.mixer.render(position, position + take, target)
+                    self._queue(index)
+                else:
+                    np.multiply(samples[position - block_start : position - block_start + take], self.gain, out=target)
+                    self._queue(index + 1)
+            position += take
+        return frames
+
+    def fill(self, start: int, stop: int) -> None:
+        """Bring every block overlapping [start, stop) up to date on the calling thread."""
+        size = self.cache.block_frames
+        for index in range(max(0, int(start)) // size, -(-min(int(stop), self.length) // size)):
+            self._block(index)
+
+    def _current(self, index: int) -> np.ndarray | None:
+        """The cached block if its samples match the current gains; runs on the audio thread, so nothing is mixed or locked."""
+        block = self.cache._peek(index)
+        if block is None:
+            return None
+        changed = self._gain_changes(block, index)
+        if changed is None:
+            self.cache.stats.hits += 1
+            return block.samples
+        if not changed:
+            # Only tracks that end before this block changed gain; the worker records the new gains.
+            self.cache.stats.hits += 1
+            self._queue(index)
+            return block.samples
+        return None
+
+    def _queue(self, index: int) -> None:
+        cache = self.cache
+        if cache._worker is None or index * cache.block_frames >= self.length or index in self._pending:
+            return
+        block = cache._peek(index)
+        if block is not None and self._gain_changes(block, index) is None:
+            return
+        self._pending.add(index)
+        cache._requests.put((self, index))
+
+    def _fill_queued(self, index: int) -> None:
+        try:
+            self._block(index)
+        finally:
+            self._pending.discard(index)
+
+    def _block(self, index: int) -> np.ndarray:
+        cache = self.cache
+        block = cache._lookup(index)
+        if block is not None:
+            changed = self._gain_changes(block, index)
+            if changed is None:
+                cache.stats.hits += 1
+                return block.samples
+            if not changed:
+                cache.stats.hits += 1
+                cache._store(index, _MixBlock(block.samples, dict(self.gains), block.updates), self.epoch)
+                return block.samples
+            if block.updates < cache.MAX_UPDATES:
+                block = self._patch(block, index, changed)
+                cache.stats.updated += 1
+                cache._store(index, block, self.epoch)
+                return block.samples
+        samples = np.empty(cache.block_frames, dtype=np.float32)
+        start = index * cache.block_frames
+        self.mixer.render(start, start + cache.block_frames, samples, apply_gain=False)
+        cache.stats.rendered += 1
+        cache._store(index, _MixBlock(samples, dict(self.gains)), self.epoch)
+        return samples
+
+    def _gain_changes(self, block: _MixBlock, index: int) -> dict[str, float] | None:
+        """Gain differences of tracks that reach into the block; None when it is current."""
+        if any(track_id not in self.gains for track_id in block.gains):
+            return {track_id: float("nan") for track_id in block.gains}
+        start = index * self.cache.block_frames
+        changed = {}
+        for track_id, gain in self.gains.items():
+            old = block.gains.get(track_id, 0.0)
+            if gain != old and len(self.sources[track_id].store) > start:
+                changed[track_id] = gain - old
+        if changed or block.gains != self.gains:
+            return changed
+        return None
+
+    def _patch(self, block: _MixBlock, index: int, changed: dict[str, float]) -> _MixBlock:
+        if any(np.isnan(delta) for delta in changed.values()):
+            # A track the block was mixed from is gone; fall back to a full render.
+            samples = np.empty(self.cache.block_frames, dtype=np.float32)
+            start = index * self.cache.block_frames
+            self.mixer.render(start, start + self.cache.block_frames, samples, apply_gain=False)
+            return _MixBlock(samples, dict(self.gains))
+        # Readers may still hold the old array, so patch a copy.
+        samples = block.samples.copy()
+        start = index * self.cache.block_frames
+        stop = start + self.cache.block_frames
+        for track_id, delta in changed.items():
+            source = self.sources[track_id]
+            for span_start, span_stop in source.audible_spans(start, stop):
+                offset = span_start - start
+                for chunk in source.store.iter_chunks(span_start, span_stop):
+                    target = samples[offset : offset + chunk.size]
+                    target += chunk * np.float32(delta)
+                    offset += chunk.size
+        return _MixBlock(samples, dict(self.gains), block.updates + 1)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.wav_file import WavWriter
+from audio_editor.services.mixer import Mixer
+
+EXPORT_BLOCK_FRAMES = 1 << 16
+
+
+def export_mix_wav(
+    tracks: List[AudioTrack],
+    path: str | Path,
+    block_size: int = EXPORT_BLOCK_FRAMES,
+    sample_format: str = "pcm16",
+    workers: int | None = None,
+    start: int = 0,
+    stop: int | None = None,
+) -> int:
+    """
+    Stream the project mix to a mono WAV file and return the frame count.
+
+    The mix is rendered and written one block at a time (the writer
+    quantizes PCM formats in place and writes float32 blocks as they are),
+    so the working memory is a few blocks regardless of project length.
+    Loud mixes are scaled by a gain derived from the tracks' finest cached
+    peaks before the first block is rendered.
+
+    Blocks are mixed on `workers` threads (default: one per core) and
+    written in order as they complete; NumPy releases the GIL while mixing.
+    `start`/`stop` limit the export to a region of the project, mixed with
+    the gain of the whole project.
+    """
+    mixer = Mixer([t for t in tracks if t.sample_count > 0], peak_level=0, scratch_size=block_size)
+    workers = workers or os.cpu_count() or 1
+    start, stop = export_region(mixer.length, start, stop)
+    with WavWriter(path, mixer.sample_rate, sample_format) as writer:
+        for block in mixer.iter_blocks(start, stop, block_size, workers):
+            writer.write(block)
+    return stop - start
+
+
+def export_region(length: int, start: int = 0, stop: int | None = None) -> tuple[int, int]:
+    """Clamp an export region to [0, length); an open `stop` runs to the end."""
+    stop = length if stop is None else min(int(stop), length)
+    start = min(max(0, int(start)), max(stop, 0))
+    return start, max(start, stop)
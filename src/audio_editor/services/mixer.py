@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.peak_pyramid import PeakPyramid
+from audio_editor.domain.sample_store import SampleStore
+
+
+def mix_peak_bound(tracks: List[AudioTrack], level: int = -1, window: int = 1 << 16) -> float:
+    """
+    Upper bound on |mix| of the given tracks, from their cached peak pyramids.
+
+    Per-bucket peaks of one pyramid level are scaled by track volume and
+    summed across tracks, `window` buckets at a time, so the scan needs a
+    fixed amount of memory however long the project is. Finer levels give
+    a tighter bound; level 0 is exact for a single track.
+    """
+    pyramids = [(track.peaks.refresh(), abs(float(track.volume))) for track in tracks]
+    if not pyramids:
+        return 0.0
+    if len({pyramid.bucket_sizes[level] for pyramid, _ in pyramids}) != 1:
+        # Buckets do not line up; fall back to the sum of per-track peaks.
+        return sum(pyramid.max_abs(0, pyramid.sample_count) * gain for pyramid, gain in pyramids)
+    size = pyramids[0][0].bucket_sizes[level]
+    buckets = max(-(-pyramid.sample_count // size) for pyramid, _ in pyramids)
+    bound = np.empty(min(window, buckets), dtype=np.float64)
+    peak = 0.0
+    for first in range(0, buckets, window):
+        last = min(first + window, buckets)
+        acc = bound[: last - first]
+        acc.fill(0.0)
+        for pyramid, gain in pyramids:
+            magnitudes = pyramid.bucket_magnitudes(level, first, last)
+            acc[: magnitudes.size] += magnitudes * gain
+        peak = max(peak, float(acc.max()))
+    return peak
+
+
+def mix_gain(tracks: List[AudioTrack], level: int = -1) -> float:
+    """Normalization gain that keeps the mix of `tracks` within [-1, 1]."""
+    peak = mix_peak_bound(tracks, level)
+    return 1.0 / peak if peak > 1.0 else 1.0
+
+
+@dataclass(frozen=True)
+class MixSource:
+    """One audible track as captured for mixing: frozen samples plus what is needed to skip its silence."""
+    track: AudioTrack
+    store: SampleStore
+    peaks: PeakPyramid
+    sample_version: int
+    gain: np.float32
+
+    @classmethod
+    def capture(cls, track: AudioTrack) -> MixSource:
+        store = track.sample_snapshot()
+        # The pyramid snapshot describes these samples for good; the live one
+        # is resized by edits on the UI thread while renders query this one.
+        return cls(track, store, track.peaks.snapshot(store), track.sample_version, np.float32(track.volume))
+
+    def audible_spans(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """Sub-ranges of [start, stop) that can contain non-zero samples."""
+        stop = min(stop, len(self.store))
+        if stop <= start:
+            return []
+        return self.peaks.audible_spans(start, stop)
+
+
+class Mixer:
+    """
+    Vectorized mixer shared by playback and export.
+
+    Tracks are captured as piece-table snapshots, so later edits never race
+    with a render on another thread. `render()` mixes any [start, stop)
+    window into a caller-provided buffer: each source is multiplied into a
+    per-thread scratch buffer and added onto a slice of the output in
+    place, and runs of silence found in the peak index are skipped without
+    touching their samples. The normalization gain is derived from cached
+    peaks up front; `peak_level` trades precision (0) for speed (-1). A
+    fixed `gain` can be passed instead, e.g. to render parts of a larger mix.
+
+    Windows share no state, so `render()` may run on several threads at
+    once; `iter_blocks()` uses that to mix consecutive blocks in parallel.
+    """
+
+    def __init__(
+        self,
+        tracks: List[AudioTrack],
+        peak_level: int = -1,
+        scratch_size: int = 1 << 16,
+        gain: float | None = None,
+    ) -> None:
+        audible = [t for t in tracks if t.sample_count > 0 and not t.muted]
+        self.sample_rate = tracks[0].sample_rate if tracks else 44100
+        self.length = max((t.sample_count for t in tracks), default=0)
+        self.sources = [MixSource.capture(t) for t in audible]
+        if gain is None:
+            gain = mix_gain(audible, peak_level)
+        self.gain = np.float32(gain)
+        self._scratch_size = scratch_size
+        self._local = threading.local()
+        self._local.scratch = np.zeros(scratch_size, dtype=np.float32)
+
+    def _scratch(self, size: int) -> np.ndarray:
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None or scratch.size < size:
+            scratch = self._local.scratch = np.zeros(max(size, self._scratch_size), dtype=np.float32)
+        return scratch[:size]
+
+    def render(self, start: int, stop: int, out: np.ndarray, apply_gain: bool = True) -> int:
+        """
+        Write the mix of [start, stop) to out[: stop - start] and return that frame count.
+
+        Frames past the end of the project are silent. With `apply_gain=False`
+        the normalization gain is left for the caller to apply.
+        """
+        frames = max(0, int(stop) - int(start))
+        block = out[:frames]
+        block.fill(0.0)
+        for source in self.sources:
+            for span_start, span_stop in source.audible_spans(start, stop):
+                offset = span_start - start
+                for chunk in source.store.iter_chunks(span_start, span_stop):
+                    n = chunk.size
+                    scratch = self._scratch(n)
+                    np.multiply(chunk, source.gain, out=scratch)
+                    target = block[offset : offset + n]
+                    np.add(target, scratch, out=target)
+                    offset += n
+        if apply_gain and self.gain != 1.0:
+            np.multiply(block, self.gain, out=block)
+        return frames
+
+    def iter_blocks(self, start: int, stop: int, block_size: int, workers: int = 1) -> Iterator[np.ndarray]:
+        """
+        Yield the mix of [start, stop) as consecutive blocks of `block_size` frames.
+
+        With `workers` > 1, up to `2 * workers` upcoming blocks are mixed
+        ahead on a thread pool while the caller consumes the current one;
+        blocks still come out in order. Each yielded array is reused, so it
+        is only valid until the next block is requested.
+        """
+        positions = range(int(start), int(stop), block_size)
+        if workers <= 1:
+            block = np.empty(block_size, dtype=np.float32)
+            for position in positions:
+                frames = self.render(position, min(position + block_size, stop), block)
+                yield block[:frames]
+            return
+
+        depth = 2 * workers
+        # One buffer per block in flight plus the one the caller holds.
+        buffers = [np.empty(block_size, dtype=np.float32) for _ in range(depth + 1)]
+        pending: deque = deque()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mix")
+
+        def submit(index: int) -> None:
+            if index < len(positions):
+                position = positions[index]
+                buffer = buffers[index % len(buffers)]
+                pending.append(executor.submit(self.render, position, min(position + block_size, stop), buffer))
+
+        try:
+            for index in range(depth):
+                submit(index)
+            for index in range(len(positions)):
+                frames = pending.popleft().result()
+                submit(index + depth)
+                yield buffers[index % len(buffers)][:frames]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.services.mix_cache import CachedMix, MixCache
+from audio_editor.services.mixer import Mixer
+
+
+class ProjectPlayback:
+    """
+    Block-by-block project mixer for a streaming output callback.
+
+    Mixing is done by a `Mixer` built when playback starts, so later edits
+    on the UI thread never race with the audio thread. Each `render()` call
+    mixes the next block straight into the output buffer; nothing
+    proportional to the project length is allocated or computed up front.
+
+    `peak_level` picks the pyramid level the normalization gain is derived
+    from: the coarsest (default) is cheapest, level 0 is the tightest.
+    With a `mix_cache`, blocks are served from (and added to) the cache.
+    """
+
+    def __init__(
+        self,
+        tracks: List[AudioTrack],
+        block_size: int = 2048,
+        start: int = 0,
+        peak_level: int = -1,
+        mix_cache: MixCache | None = None,
+    ) -> None:
+        self.mixer: Mixer | CachedMix
+        if mix_cache is not None:
+            self.mixer = mix_cache.prepare(tracks, peak_level=peak_level)
+        else:
+            self.mixer = Mixer(tracks, peak_level=peak_level, scratch_size=block_size)
+        self.sample_rate = self.mixer.sample_rate
+        self.length = self.mixer.length
+        self.gain = self.mixer.gain
+        self.position = max(0, int(start))
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= self.length
+
+    def render(self, out: np.ndarray) -> bool:
+        """Fill `out` with the next block; return False once the project has ended."""
+        start = self.position
+        stop = min(start + out.shape[0], self.length)
+        if stop <= start:
+            out.fill(0.0)
+            return False
+        self.mixer.render(start, stop, out)
+        out[stop - start :].fill(0.0)
+        self.position = stop
+        return True
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class RecordingBuffer:
+    """
+    Growable chunked capture buffer for one writer (the audio callback) and
+    one reader (the UI).
+
+    Frames are copied into fixed-size preallocated chunks; a full chunk is
+    never moved or reallocated, so growth is O(1) per block. The writer
+    publishes progress by updating `frames` only after the samples are in
+    place, so readers never need a lock: anything below a `frames` value
+    they have read is complete and immutable.
+    """
+
+    CHUNK_FRAMES = 1 << 18
+
+    def __init__(self, chunk_frames: int = CHUNK_FRAMES) -> None:
+        self.chunk_frames = int(chunk_frames)
+        self._chunks: list[np.ndarray] = [np.empty(self.chunk_frames, dtype=np.float32)]
+        self._spare: np.ndarray | None = None
+        self.frames = 0
+
+    def reserve(self) -> None:
+        """Preallocate the next chunk outside the audio thread."""
+        if self._spare is None:
+            self._spare = np.empty(self.chunk_frames, dtype=np.float32)
+
+    def write(self, block: np.ndarray) -> None:
+        """Append frames (mono, or the first channel of a 2-D block)."""
+        samples = block[:, 0] if block.ndim == 2 else block
+        written = self.frames
+        remaining = samples.shape[0]
+        src = 0
+        while remaining > 0:
+            chunk_index, offset = divmod(written, self.chunk_frames)
+            if chunk_index == len(self._chunks):
+                spare, self._spare = self._spare, None
+                self._chunks.append(spare if spare is not None else np.empty(self.chunk_frames, dtype=np.float32))
+            n = min(remaining, self.chunk_frames - offset)
+            self._chunks[chunk_index][offset : offset + n] = samples[src : src + n]
+            src += n
+            written += n
+            remaining -= n
+        self.frames = written
+
+    def read(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Copy frames [start, stop) out of the buffer; stop defaults to everything written so far."""
+        available = self.frames
+        stop = available if stop is None else min(int(stop), available)
+        start = min(max(0, int(start)), stop)
+        out = np.empty(stop - start, dtype=np.float32)
+        pos = start
+        while pos < stop:
+            chunk_index, offset = divmod(pos, self.chunk_frames)
+            n = min(stop - pos, self.chunk_frames - offset)
+            out[pos - start : pos - start + n] = self._chunks[chunk_index][offset : offset + n]
+            pos += n
+        return out
+
+    def read_since(self, position: int) -> tuple[np.ndarray, int]:
+        """Return frames captured after `position` and the new position to pass next time."""
+        available = self.frames
+        self.reserve()
+        return self.read(position, available), available
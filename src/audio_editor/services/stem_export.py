@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.wav_file import WavWriter
+from audio_editor.services.mix_export import EXPORT_BLOCK_FRAMES, export_region
+from audio_editor.services.mixer import Mixer, mix_gain
+
+
+class ExportCancelled(Exception):
+    """Raised inside a worker when its export job has been cancelled."""
+
+
+@dataclass(frozen=True)
+class Stem:
+    """One output file of a stem export: the tracks mixed into it."""
+    name: str
+    tracks: tuple[AudioTrack, ...]
+
+
+@dataclass
+class ExportedStem:
+    """Outcome of rendering one stem; `error` is set when it was not written."""
+    index: int
+    stem: Stem
+    path: Path
+    frames: int = 0
+    error: Exception | None = None
+
+
+def track_stems(tracks: Iterable[AudioTrack]) -> list[Stem]:
+    """One stem per audible track, in project order."""
+    return [Stem(t.name, (t,)) for t in tracks if t.sample_count > 0 and not t.muted]
+
+
+def stem_file_names(stems: List[Stem], suffix: str = ".wav") -> list[str]:
+    """File names for the stems, made safe for the file system and unique."""
+    names = []
+    taken: set[str] = set()
+    for stem in stems:
+        base = re.sub(r"[^\w\- .()]+", "_", stem.name).strip(" .") or "stem"
+        name, count = base, 1
+        while name.lower() in taken:
+            count += 1
+            name = f"{base} ({count})"
+        taken.add(name.lower())
+        names.append(name + suffix)
+    return names
+
+
+class StemExportJob:
+    """
+    Renders stems to WAV files in `directory` on a thread pool.
+
+    Every stem is mixed with the track volumes applied and the gain of the
+    full mix of all stems, so the stems add up to the exported mix. Each
+    worker streams its stem block by block through a `WavWriter`; progress
+    is reported in frames across all stems, and `cancel()` stops every
+    stem at its next block and removes the partial files. `start`/`stop`
+    export the same region of every stem.
+    """
+
+    def __init__(
+        self,
+        stems: Iterable[Stem],
+        directory: str | os.PathLike,
+        sample_format: str = "pcm16",
+        block_size: int = EXPORT_BLOCK_FRAMES,
+        max_workers: int | None = None,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        self.stems = list(stems)
+        self.directory = Path(directory)
+        self.sample_format = sample_format
+        self.block_size = block_size
+        self.region = (start, stop)
+        self.max_workers = max_workers or max(1, min(len(self.stems), os.cpu_count() or 1))
+        self.paths = [self.directory / name for name in stem_file_names(self.stems)]
+        self._cancelled = threading.Event()
+        self._frames_total = [0] * len(self.stems)
+        self._frames_done = [0] * len(self.stems)
+        self._futures: list[Future] = []
+        self._next = 0
+
+    def start(self) -> None:
+        audible = [t for stem in self.stems for t in stem.tracks if t.sample_count > 0 and not t.muted]
+        gain = mix_gain(audible, level=0)
+        # Snapshots are captured here, on the caller's thread; workers only read them.
+        mixers = [Mixer(list(stem.tracks), peak_level=0, scratch_size=self.block_size, gain=gain) for stem in self.stems]
+        regions = [export_region(mixer.length, *self.region) for mixer in mixers]
+        self._frames_total = [stop - start for start, stop in regions]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stems")
+        self._futures = [
+            executor.submit(self._render, index, mixer, *region)
+            for index, (mixer, region) in enumerate(zip(mixers, regions))
+        ]
+        executor.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of all stem frames written so far."""
+        total = sum(self._frames_total)
+        if total == 0:
+            return 1.0 if self.finished else 0.0
+        return sum(self._frames_done) / total
+
+    @property
+    def finished(self) -> bool:
+        return self._next >= len(self._futures)
+
+    def take_ready(self) -> list[ExportedStem]:
+        """Results whose predecessors are all done, in stem order; never blocks."""
+        ready = []
+        while self._next < len(self._futures) and self._futures[self._next].done():
+            ready.append(self._futures[self._next].result())
+            self._next += 1
+        return ready
+
+    def wait(self) -> list[ExportedStem]:
+        """Block until every remaining stem is done and return their results in order."""
+        ready = []
+        while self._next < len(self._futures):
+            ready.append(self._futures[self._next].result())
+            self._next += 1
+        return ready
+
+    def _render(self, index: int, mixer: Mixer, start: int, stop: int) -> ExportedStem:
+        path = self.paths[index]
+        result = ExportedStem(index, self.stems[index], path)
+        created = False
+        try:
+            if self._cancelled.is_set():
+                raise ExportCancelled()
+            writer = WavWriter(path, mixer.sample_rate, self.sample_format)
+            created = True
+            with writer:
+                for block in mixer.iter_blocks(start, stop, self.block_size):
+                    if self._cancelled.is_set():
+                        raise ExportCancelled()
+                    writer.write(block)
+                    self._frames_done[index] += block.size
+            result.frames = stop - start
+        except Exception as exc:
+            result.error = exc
+            if created:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return result
@@ -1,9 +1,9 @@
 import json
 import os
 import sys
+import threading
 import time
-import wave
-from pathlib import Path
+from typing import TYPE_CHECKING
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -25,12 +25,16 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QFrame,
     QSizePolicy,
+    QProgressDialog,
 )
 from PySide6.QtCore import Qt, Slot, QSize, QTimer, QEvent, QPoint
 from PySide6.QtGui import QShortcut, QKeySequence, QAction
 
+from audio_editor.domain.activity_detector import ActivityDetector
 from audio_editor.domain.audio_track import AudioTrack
-from audio_editor.domain.project import Project
+from audio_editor.domain.edit_history import EditHistory
+from audio_editor.domain.project import PARAMS_CHANGED, SAMPLES_CHANGED, Project, ProjectChange
+from audio_editor.domain.segment_index import SegmentIndex
 from audio_editor.use_cases.add_track_to_project import AddTrackToProject
 from audio_editor.use_cases.delete_track_from_project import DeleteTrackFromProject
 from audio_editor.ui.styles import DARK_STYLE
@@ -41,6 +45,13 @@ from audio_editor.use_cases.stop_recording import StopRecording
 import numpy as np
 from audio_editor.ui.waveform_widget import WaveformWidget, TimelineWidget
 
+# File I/O, import, export and mixing services are imported where they are
+# first used, so none of them delays the first window paint.
+if TYPE_CHECKING:
+    from audio_editor.services.file_import import FileImportJob
+    from audio_editor.services.mix_cache import MixCache
+    from audio_editor.services.stem_export import StemExportJob
+
 
 class MainWindow(QMainWindow):
     TOOL_NONE = "None"
@@ -49,22 +60,27 @@ class MainWindow(QMainWindow):
     TOOL_SPLIT_SAMPLE = "Split Sample Tool"
     TOOL_CUT_BACKWARD = "Backward Cut Tool"
     TOOL_CUT_FORWARD = "Forward Cut Tool"
+    EXPORT_FORMAT_FILTERS = {
+        "WAV 16-bit PCM (*.wav)": "pcm16",
+        "WAV 24-bit PCM (*.wav)": "pcm24",
+        "WAV 32-bit float (*.wav)": "float32",
+    }
 
     def __init__(self):
         super().__init__()
         self.audio_engine = AudioEngine()
-        self.track_waveform_widgets: dict[int, WaveformWidget] = {}
+        self.track_waveform_widgets: dict[str, WaveformWidget] = {}
         self.transport_timer = QTimer(self)
         self.transport_timer.setInterval(33)
         self.transport_timer.timeout.connect(self.update_transport_visuals)
         self.transport_mode: str | None = None
         self.transport_start_time = 0.0
         self.transport_duration_seconds = 0.0
-        self.transport_track_ids: set[int] = set()
-        self.transport_record_track_id: int | None = None
+        self.transport_track_ids: set[str] = set()
+        self.transport_record_track_id: str | None = None
         self.transport_record_sample_rate = 44100
         self.transport_record_base_duration_seconds = 0.0
-        self.transport_record_base_audio = np.array([], dtype=np.float32)
+        self.transport_record_frames = 0
         self.transport_timeline_duration_seconds = 0.0
         self.record_visual_window_seconds = 15.0
         self.display_timeline_duration_seconds = self.record_visual_window_seconds
@@ -73,8 +89,8 @@ class MainWindow(QMainWindow):
         self.timeline_zoom_max = 8.0
         self.timeline_zoom_step = 1.25
         self.current_edit_tool = self.TOOL_NONE
-        self.track_selection_ranges: dict[int, tuple[float, float]] = {}
-        self.track_edit_cursors: dict[int, float] = {}
+        self.track_selection_ranges: dict[str, tuple[float, float]] = {}
+        self.track_edit_cursors: dict[str, float] = {}
         self.edit_cursor_click_threshold = 0.0025
         self.clipboard_audio = np.array([], dtype=np.float32)
         self.clipboard_sample_rate = 44100
@@ -88,12 +104,26 @@ class MainWindow(QMainWindow):
         self.row_spacing = 10
         self.left_row_pitch = self.track_row_height + self.row_spacing
         self._syncing_scroll = False
-        self.undo_stack: list[dict] = []
-        self.redo_stack: list[dict] = []
-        # Keep undo/redo bounded to reduce large numpy snapshot churn.
-        self.max_history = 25
-        self._restoring_history = False
-        self._waveform_widgets_by_track_id: dict[int, WaveformWidget] = {}
+        # Undo records per-edit deltas; old entries are dropped past the memory budget.
+        self.activity_detector = ActivityDetector()
+        self.history = EditHistory(memory_budget_bytes=512 * 1024 * 1024)
+        self._waveform_widgets_by_track_id: dict[str, WaveformWidget] = {}
+        # Insert File decodes on a worker pool; the timer moves finished files into the project.
+        self.import_job: FileImportJob | None = None
+        self.import_progress: QProgressDialog | None = None
+        self.import_timer = QTimer(self)
+        self.import_timer.setInterval(50)
+        self.import_timer.timeout.connect(self._poll_import_job)
+        self._import_added_count = 0
+        self._import_errors: list[str] = []
+        # Export Stems renders on a worker pool; the timer reports progress and results.
+        self.stem_job: StemExportJob | None = None
+        self.stem_progress: QProgressDialog | None = None
+        self.stem_timer = QTimer(self)
+        self.stem_timer.setInterval(50)
+        self.stem_timer.timeout.connect(self._poll_stem_job)
+        self._stem_errors: list[str] = []
+        self._stem_written = 0
         self.global_playhead_position: float | None = None
 
         self.setWindowTitle("VibeCore Audio")
@@ -103,6 +133,13 @@ class MainWindow(QMainWindow):
 
         # ===== Domain State =====
         self.project = Project("My Project")
+        # Filled by project change events; consumed by _sync_dirty_waveforms().
+        self._dirty_waveform_track_ids: set[str] = set()
+        self._waveform_structure_dirty = False
+        self._waveform_row_ids: list[str] = []
+        self.project.subscribe(self._on_project_changed)
+        # Rendered mix blocks reused across project playbacks; created on first play.
+        self.mix_cache: MixCache | None = None
 
         # ===== Central Widget =====
         central_widget = QWidget()
@@ -167,6 +204,10 @@ class MainWindow(QMainWindow):
         self.file_export_action.triggered.connect(self.handle_export_mix)
         self.file_menu.addAction(self.file_export_action)
 
+        self.file_export_stems_action = QAction("Export Stems...", self)
+        self.file_export_stems_action.triggered.connect(self.handle_export_stems)
+        self.file_menu.addAction(self.file_export_stems_action)
+
         self.add_button = QPushButton("Add Track")
         self.add_button.setObjectName("actionButton")
         self.add_button.clicked.connect(self.handle_add_track)
@@ -413,10 +454,10 @@ class MainWindow(QMainWindow):
                 item_text = item.text()
                 track_name = item_text.split(" (")[0]
             
-            track = next((t for t in self.project.get_tracks() if t.name == track_name), None)
+            track = next((t for t in self.project.tracks if t.name == track_name), None)
             if track:
                 new_order.append(track)
-        self.project._tracks = new_order
+        self.project.replace_tracks(new_order)
         self.refresh_waveform_panel()
 
     # ----- Handlers -----
@@ -510,7 +551,7 @@ class MainWindow(QMainWindow):
         editor.setText(track.name)
         self.sync_waveform_for_track(track)
 
-    def add_waveform_ui_item(self, track: AudioTrack):
+    def add_waveform_ui_item(self, track: AudioTrack, row_index: int | None = None):
         self.empty_state_widget.setVisible(False)
         self.waveforms_list.setVisible(True)
         row = QWidget()
@@ -534,12 +575,12 @@ class MainWindow(QMainWindow):
             )
         )
         waveform.set_interaction_mode(self._waveform_interaction_mode_for_tool())
-        selected_range = self.track_selection_ranges.get(id(track))
+        selected_range = self.track_selection_ranges.get(track.track_id)
         if selected_range:
             waveform.set_selection_range(selected_range[0], selected_range[1])
         else:
             waveform.clear_selection()
-        waveform.set_edit_cursor_position(self.track_edit_cursors.get(id(track)))
+        waveform.set_edit_cursor_position(self.track_edit_cursors.get(track.track_id))
         row_layout.addWidget(waveform)
         row_layout.addStretch(1)
 
@@ -547,17 +588,25 @@ class MainWindow(QMainWindow):
         row.setMinimumHeight(self.track_row_height)
         item = QListWidgetItem()
         item.setSizeHint(QSize(0, self.left_row_pitch))
-        self.waveforms_list.addItem(item)
+        if row_index is None:
+            self.waveforms_list.addItem(item)
+            self._waveform_row_ids.append(track.track_id)
+        else:
+            self.waveforms_list.insertItem(row_index, item)
+            self._waveform_row_ids.insert(row_index, track.track_id)
         self.waveforms_list.setItemWidget(item, row)
-        self.track_waveform_widgets[id(track)] = waveform
-        self._waveform_widgets_by_track_id[id(track)] = waveform
+        self.track_waveform_widgets[track.track_id] = waveform
+        self._waveform_widgets_by_track_id[track.track_id] = waveform
         self.update_empty_state_visibility()
 
     def refresh_waveform_panel(self):
         self.waveforms_list.clear()
         self.track_waveform_widgets.clear()
         self._waveform_widgets_by_track_id.clear()
-        for track in self.project.get_tracks():
+        self._waveform_row_ids = []
+        self._dirty_waveform_track_ids.clear()
+        self._waveform_structure_dirty = False
+        for track in self.project.tracks:
             self.add_waveform_ui_item(track)
         self._sync_waveform_widths()
         self._update_timeline_scale()
@@ -603,21 +652,74 @@ class MainWindow(QMainWindow):
             self.waveform_playhead_overlay.hide()
 
     def sync_waveform_for_track(self, track: AudioTrack):
-        waveform = self.track_waveform_widgets.get(id(track))
+        self._dirty_waveform_track_ids.discard(track.track_id)
+        waveform = self.track_waveform_widgets.get(track.track_id)
         if waveform:
             self._apply_track_visual_state(track, waveform)
-            selected_range = self.track_selection_ranges.get(id(track))
-            if selected_range:
-                waveform.set_selection_range(selected_range[0], selected_range[1])
-            else:
-                waveform.clear_selection()
-            waveform.set_edit_cursor_position(self.track_edit_cursors.get(id(track)))
+            self._apply_selection_visuals(track, waveform)
+        self._sync_waveform_widths()
+        self._update_timeline_scale()
+
+    def _apply_selection_visuals(self, track: AudioTrack, waveform: WaveformWidget):
+        selected_range = self.track_selection_ranges.get(track.track_id)
+        if selected_range:
+            waveform.set_selection_range(selected_range[0], selected_range[1])
+        else:
+            waveform.clear_selection()
+        waveform.set_edit_cursor_position(self.track_edit_cursors.get(track.track_id))
+
+    def _on_project_changed(self, change: ProjectChange):
+        """Record what an edit touched; _sync_dirty_waveforms() applies it to the UI."""
+        if change.kind in (SAMPLES_CHANGED, PARAMS_CHANGED):
+            if change.track is not None:
+                self._dirty_waveform_track_ids.add(change.track.track_id)
+        else:
+            self._waveform_structure_dirty = True
+
+    def _sync_dirty_waveforms(self):
+        """Redraw lanes whose track changed; other lanes only refresh selection and cursor."""
+        if self._waveform_structure_dirty:
+            self._reconcile_waveform_panel()
+        dirty = self._dirty_waveform_track_ids
+        self._dirty_waveform_track_ids = set()
+        for track in self.project.tracks:
+            waveform = self.track_waveform_widgets.get(track.track_id)
+            if waveform is None:
+                continue
+            if track.track_id in dirty:
+                self._apply_track_visual_state(track, waveform)
+            self._apply_selection_visuals(track, waveform)
         self._sync_waveform_widths()
         self._update_timeline_scale()
+        self._update_right_row_selection_visual()
+
+    def _reconcile_waveform_panel(self):
+        """Add and remove lanes to match the project; rebuild only when lanes were reordered."""
+        self._waveform_structure_dirty = False
+        tracks = self.project.tracks
+        live_ids = [track.track_id for track in tracks]
+        live_set = set(live_ids)
+        shown_set = set(self._waveform_row_ids)
+        if [i for i in self._waveform_row_ids if i in live_set] != [i for i in live_ids if i in shown_set]:
+            self.refresh_waveform_panel()
+            return
+        for row_index in range(len(self._waveform_row_ids) - 1, -1, -1):
+            track_id = self._waveform_row_ids[row_index]
+            if track_id in live_set:
+                continue
+            item = self.waveforms_list.item(row_index)
+            self.waveforms_list.removeItemWidget(item)
+            self.waveforms_list.takeItem(row_index)
+            del self._waveform_row_ids[row_index]
+            self.track_waveform_widgets.pop(track_id, None)
+            self._waveform_widgets_by_track_id.pop(track_id, None)
+        for row_index, track in enumerate(tracks):
+            if track.track_id not in shown_set:
+                self.add_waveform_ui_item(track, row_index=row_index)
+        self.update_empty_state_visibility()
 
     def _select_track_from_waveform(self, track: AudioTrack):
-        tracks = self.project.get_tracks()
-        row = next((i for i, existing in enumerate(tracks) if id(existing) == id(track)), -1)
+        row = self.project.index_of(track.track_id)
         if row < 0:
             return
         self.track_list.blockSignals(True)
@@ -631,10 +733,10 @@ class MainWindow(QMainWindow):
         self._update_right_row_selection_visual()
 
     def _project_duration_seconds(self) -> float:
-        tracks = self.project.get_tracks()
+        tracks = self.project.tracks
         if not tracks:
             return 0.0
-        return max((len(track.data) / max(track.sample_rate, 1)) for track in tracks)
+        return max((track.sample_count / max(track.sample_rate, 1)) for track in tracks)
 
     def _update_timeline_scale(self):
         self._update_display_timeline_duration()
@@ -662,8 +764,8 @@ class MainWindow(QMainWindow):
         self._update_timeline_scale()
 
     def _effective_track_duration_seconds(self, track: AudioTrack, recording_elapsed_seconds: float = 0.0) -> float:
-        base_duration = len(track.data) / max(track.sample_rate, 1)
-        if self.transport_mode == "record" and id(track) == self.transport_record_track_id:
+        base_duration = track.sample_count / max(track.sample_rate, 1)
+        if self.transport_mode == "record" and track.track_id == self.transport_record_track_id:
             return max(base_duration, self.transport_record_base_duration_seconds + max(0.0, recording_elapsed_seconds))
         return base_duration
 
@@ -672,7 +774,7 @@ class MainWindow(QMainWindow):
         project_duration_override: float | None = None,
         recording_elapsed_seconds: float = 0.0,
     ):
-        tracks = self.project.get_tracks()
+        tracks = self.project.tracks
         if not tracks or not self._waveform_widgets_by_track_id:
             return
 
@@ -690,7 +792,7 @@ class MainWindow(QMainWindow):
             return
 
         for track in tracks:
-            waveform = self._waveform_widgets_by_track_id.get(id(track))
+            waveform = self._waveform_widgets_by_track_id.get(track.track_id)
             if waveform is None:
                 continue
             track_duration = self._effective_track_duration_seconds(track, recording_elapsed_seconds)
@@ -703,13 +805,13 @@ class MainWindow(QMainWindow):
             waveform.setFixedWidth(min(lane_width, target_width))
         self._update_waveform_overlay_playhead()
 
-    def refresh_track_list(self, selected_track_id: int | None = None):
+    def refresh_track_list(self, selected_track_id: str | None = None):
         self.track_list.blockSignals(True)
         self.track_list.clear()
         selected_row = -1
-        for idx, track in enumerate(self.project.get_tracks()):
+        for idx, track in enumerate(self.project.tracks):
             self.add_track_ui_item(track)
-            if selected_track_id is not None and id(track) == selected_track_id:
+            if selected_track_id is not None and track.track_id == selected_track_id:
                 selected_row = idx
         self.track_list.blockSignals(False)
         if selected_row >= 0:
@@ -752,9 +854,9 @@ class MainWindow(QMainWindow):
     def start_transport(
         self,
         mode: str,
-        track_ids: set[int],
+        track_ids: set[str],
         duration_seconds: float,
-        record_track_id: int | None = None,
+        record_track_id: str | None = None,
         record_sample_rate: int = 44100,
         record_base_duration_seconds: float = 0.0,
     ):
@@ -795,7 +897,7 @@ class MainWindow(QMainWindow):
         self.transport_record_track_id = None
         self.transport_record_sample_rate = 44100
         self.transport_record_base_duration_seconds = 0.0
-        self.transport_record_base_audio = np.array([], dtype=np.float32)
+        self.transport_record_frames = 0
         self.transport_timeline_duration_seconds = 0.0
         self.clear_all_playheads()
 
@@ -815,18 +917,16 @@ class MainWindow(QMainWindow):
             if waveform is None:
                 return
 
-            preview = self.audio_engine.get_recording_preview()
-            if self.transport_record_base_audio.size > 0 and preview.size > 0:
-                visual_audio = np.concatenate((self.transport_record_base_audio, preview))
-            elif self.transport_record_base_audio.size > 0:
-                visual_audio = self.transport_record_base_audio
-            else:
-                visual_audio = preview
-            waveform.set_audio_data(visual_audio)
+            # Only frames captured since the last tick are fetched.
+            new_frames, self.transport_record_frames = self.audio_engine.read_recording_since(
+                self.transport_record_frames
+            )
+            if new_frames.size > 0:
+                waveform.append_audio(new_frames)
 
             # Use recorded sample count for indicator timing so playhead pace
             # matches the visible waveform growth exactly.
-            preview_seconds = preview.size / max(self.transport_record_sample_rate, 1)
+            preview_seconds = self.transport_record_frames / max(self.transport_record_sample_rate, 1)
             absolute_record_time = self.transport_record_base_duration_seconds + preview_seconds
             while absolute_record_time > self.transport_timeline_duration_seconds:
                 self.transport_timeline_duration_seconds += self.record_visual_window_seconds
@@ -937,7 +1037,7 @@ class MainWindow(QMainWindow):
                     return True
 
                 row = index.row()
-                tracks = self.project.get_tracks()
+                tracks = self.project.tracks
                 if row < 0 or row >= len(tracks):
                     event.ignore()
                     return True
@@ -1005,8 +1105,8 @@ class MainWindow(QMainWindow):
         if tool_name != self.TOOL_SELECT:
             self.track_selection_ranges.clear()
             self.track_edit_cursors.clear()
-        for track in self.project.get_tracks():
-            waveform = self.track_waveform_widgets.get(id(track))
+        for track in self.project.tracks:
+            waveform = self.track_waveform_widgets.get(track.track_id)
             if waveform:
                 waveform.set_interaction_mode(self._waveform_interaction_mode_for_tool())
                 if tool_name != self.TOOL_SELECT:
@@ -1022,98 +1122,56 @@ class MainWindow(QMainWindow):
         return "click"
 
     def _track_data_array(self, track: AudioTrack) -> np.ndarray:
-        return np.asarray(track.data, dtype=np.float32).flatten()
+        # Read-only contiguous view; only materialized once per edit.
+        return track.data
 
     def _track_key(self, track: AudioTrack) -> str:
-        return str(id(track))
+        return track.track_id
 
     def _find_track_by_key(self, track_key: str) -> AudioTrack | None:
-        return next((track for track in self.project.get_tracks() if self._track_key(track) == track_key), None)
+        return self.project.get_track(track_key)
 
     def _apply_track_visual_state(self, track: AudioTrack, waveform: WaveformWidget):
-        data = self._track_data_array(track)
-        waveform.set_audio_data(data)
-        waveform.set_segment_markers(list(track.sample_boundaries), len(data))
+        waveform.set_peak_source(track.peaks)
+        waveform.set_segment_markers(list(track.sample_boundaries), track.sample_count)
 
     def _sample_index_from_normalized(self, track: AudioTrack, position: float) -> int:
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return 0
-        return int(np.clip(position, 0.0, 1.0) * data.size)
-
-    def _find_audio_runs(self, track: AudioTrack, threshold: float = 1e-3) -> list[tuple[int, int]]:
-        data = self._track_data_array(track)
-        if data.size == 0:
-            return []
-        # Use a short envelope window so zero-crossings inside real audio do not
-        # break one clip into many tiny runs.
-        window = max(1, int(max(track.sample_rate, 1) * 0.02))  # 20 ms
-        abs_data = np.abs(data)
-        if window > 1:
-            kernel = np.ones(window, dtype=np.float32) / float(window)
-            envelope = np.convolve(abs_data, kernel, mode="same")
-        else:
-            envelope = abs_data
-
-        # More permissive floor for whole-clip picking in None tool mode.
-        mask = envelope > max(1e-6, threshold * 0.25)
-        if not np.any(mask):
-            return []
-
-        runs: list[tuple[int, int]] = []
-        in_run = False
-        start = 0
-        for i, is_audio in enumerate(mask):
-            if is_audio and not in_run:
-                in_run = True
-                start = i
-            elif not is_audio and in_run:
-                runs.append((start, i))
-                in_run = False
-        if in_run:
-            runs.append((start, data.size))
-
-        if not runs:
-            return []
-
-        # Merge runs separated by tiny silent holes so a single sample still
-        # selects as one full region with None tool.
-        merge_gap = max(1, int(max(track.sample_rate, 1) * 0.2))  # 200 ms
-        merged: list[tuple[int, int]] = [runs[0]]
-        for run_start, run_end in runs[1:]:
-            prev_start, prev_end = merged[-1]
-            if run_start - prev_end <= merge_gap:
-                merged[-1] = (prev_start, run_end)
-            else:
-                merged.append((run_start, run_end))
-        return merged
+        return int(np.clip(position, 0.0, 1.0) * sample_count)
 
     def _timeline_sample_index_from_normalized(self, track: AudioTrack, position: float) -> int:
         visible_seconds = self._visible_timeline_duration_seconds()
         timeline_samples = int(max(1.0, visible_seconds) * max(track.sample_rate, 1))
-        data_samples = len(self._track_data_array(track))
+        data_samples = track.sample_count
         span_samples = max(data_samples, timeline_samples)
         return int(np.clip(position, 0.0, 1.0) * span_samples)
 
-    def _clip_boundaries(self, track: AudioTrack) -> list[int]:
-        boundaries: set[int] = {0}
-        runs = self._find_audio_runs(track, threshold=self.drop_silence_threshold)
-        for start, end in runs:
-            if start > 0:
-                boundaries.add(int(start))
-            boundaries.add(int(end))
-        for boundary in track.sample_boundaries:
-            boundary_int = int(max(0, boundary))
-            if boundary_int > 0:
-                boundaries.add(boundary_int)
-        return sorted(boundaries)
+    def _clip_boundaries(self, track: AudioTrack) -> SegmentIndex:
+        boundaries = track.sample_boundaries.copy()
+        boundaries.add(0)
+        for boundary in self.activity_detector.run_boundaries(track, self.drop_silence_threshold):
+            boundaries.add(boundary)
+        return boundaries
 
     def _nearest_clip_boundary(self, track: AudioTrack, raw_index: int) -> int:
         idx = int(max(0, raw_index))
-        boundaries = self._clip_boundaries(track)
-        if not boundaries:
-            return 0
-        return min(boundaries, key=lambda boundary: abs(boundary - idx))
+        nearest = self._clip_boundaries(track).nearest(idx)
+        return 0 if nearest is None else nearest
+
+    @staticmethod
+    def _nearest_to_any(boundaries: SegmentIndex, points: list[int]) -> tuple[int, int] | None:
+        """Return (distance, boundary) for the boundary closest to any point."""
+        best: tuple[int, int] | None = None
+        for point in points:
+            boundary = boundaries.nearest(point)
+            if boundary is None:
+                continue
+            candidate = (abs(point - boundary), int(boundary))
+            if best is None or candidate < best:
+                best = candidate
+        return best
 
     def _resolve_drop_insert_index(self, track: AudioTrack, raw_index: int) -> int:
         nearest = self._nearest_clip_boundary(track, raw_index)
@@ -1134,21 +1192,17 @@ class MainWindow(QMainWindow):
         segment_len: int = 0,
     ) -> int | None:
         boundaries = self._clip_boundaries(track)
-        if not boundaries:
-            return None
         threshold_samples = max(1, int(max(track.sample_rate, 1) * self.drop_snap_threshold_seconds))
         idx = int(max(0, drop_index))
-        best: tuple[int, int] | None = None  # (distance, boundary)
-        edge_start = int(max(0, desired_start if desired_start is not None else idx))
-        edge_end = int(max(edge_start, edge_start + max(0, segment_len)))
-        for boundary in boundaries:
-            distance = abs(idx - boundary)
-            # Also consider dragged clip edges; this makes append/insert feel natural.
-            if desired_start is not None and segment_len > 0:
-                distance = min(distance, abs(edge_start - boundary), abs(edge_end - boundary))
-            if distance <= threshold_samples and (best is None or distance < best[0]):
-                best = (distance, int(boundary))
-        return best[1] if best is not None else None
+        points = [idx]
+        # Also consider dragged clip edges; this makes append/insert feel natural.
+        if desired_start is not None and segment_len > 0:
+            edge_start = int(max(0, desired_start))
+            points.extend([edge_start, edge_start + segment_len])
+        best = self._nearest_to_any(boundaries, points)
+        if best is None or best[0] > threshold_samples:
+            return None
+        return best[1]
 
     def _nearest_boundary_for_segment(
         self,
@@ -1156,16 +1210,9 @@ class MainWindow(QMainWindow):
         desired_start: int,
         segment_len: int,
     ) -> int | None:
-        boundaries = self._clip_boundaries(track)
-        if not boundaries:
-            return None
         start = int(max(0, desired_start))
         end = int(max(start, start + max(0, segment_len)))
-        best: tuple[int, int] | None = None
-        for boundary in boundaries:
-            distance = min(abs(start - boundary), abs(end - boundary))
-            if best is None or distance < best[0]:
-                best = (distance, int(boundary))
+        best = self._nearest_to_any(self._clip_boundaries(track), [start, end])
         return best[1] if best is not None else None
 
     def _insert_index_for_boundary(
@@ -1201,32 +1248,27 @@ class MainWindow(QMainWindow):
         return int(max(0, start_index))
 
     def _track_has_audio(self, track: AudioTrack, threshold: float | None = None) -> bool:
-        data = self._track_data_array(track)
-        if data.size == 0:
+        if track.sample_count == 0:
             return False
         threshold = self.drop_silence_threshold if threshold is None else threshold
-        return bool(np.any(np.abs(data) > threshold))
+        return not track.is_silent(0, track.sample_count, threshold)
 
     def _clip_span_at_index(self, track: AudioTrack, sample_index: int) -> tuple[int, int] | None:
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return None
 
-        idx = int(np.clip(sample_index, 0, data.size - 1))
+        idx = int(np.clip(sample_index, 0, sample_count - 1))
         boundaries = self._clip_boundaries(track)
-        if len(boundaries) < 2:
+        start = boundaries.previous_before(idx + 1)
+        end = boundaries.next_after(idx)
+        if start is None or end is None:
             return None
 
-        for i in range(len(boundaries) - 1):
-            start = boundaries[i]
-            end = boundaries[i + 1]
-            if start <= idx < end:
-                segment = data[start:end]
-                if segment.size == 0:
-                    return None
-                if np.any(np.abs(segment) > self.drop_silence_threshold):
-                    return int(start), int(end)
-                return None
+        if min(end, sample_count) <= start:
+            return None
+        if not track.is_silent(start, end, self.drop_silence_threshold):
+            return int(start), int(end)
         return None
 
     def _can_place_segment_in_gap(
@@ -1239,50 +1281,39 @@ class MainWindow(QMainWindow):
         if segment_len <= 0:
             return False
         threshold = self.drop_silence_threshold if threshold is None else threshold
-        data = self._track_data_array(track)
         start = int(max(0, start_index))
         end = start + int(segment_len)
-        if start >= data.size:
+        if start >= track.sample_count:
             return True
-        occupied = data[start:min(end, data.size)]
-        return not bool(np.any(np.abs(occupied) > threshold))
+        return track.is_silent(start, end, threshold)
 
     def _refresh_track_boundaries_from_audio(self, track: AudioTrack):
-        runs = self._find_audio_runs(track, threshold=self.drop_silence_threshold)
-        boundaries: set[int] = set()
-        for start, end in runs:
-            if start > 0:
-                boundaries.add(int(start))
-            boundaries.add(int(end))
-        track.sample_boundaries = sorted(boundaries)
-        track._normalize_boundaries()
+        track.set_boundaries(self.activity_detector.run_boundaries(track, self.drop_silence_threshold))
 
     def _remove_source_segment_for_move(self, track: AudioTrack, start: int, end: int) -> bool:
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return False
-        start_idx = int(np.clip(start, 0, data.size))
-        end_idx = int(np.clip(end, 0, data.size))
+        start_idx = int(np.clip(start, 0, sample_count))
+        end_idx = int(np.clip(end, 0, sample_count))
         if end_idx <= start_idx:
             return False
 
         threshold = self.drop_silence_threshold
-        touches_left = start_idx > 0 and abs(float(data[start_idx - 1])) > threshold
-        touches_right = end_idx < data.size and abs(float(data[end_idx])) > threshold
+        touches_left = start_idx > 0 and abs(float(track.read(start_idx - 1, start_idx)[0])) > threshold
+        touches_right = end_idx < sample_count and abs(float(track.read(end_idx, end_idx + 1)[0])) > threshold
         collapse = touches_left and touches_right
 
         if collapse:
             track.cut_range(start_idx, end_idx)
             return True
 
-        cleared = data.copy()
-        cleared[start_idx:end_idx] = 0.0
-        track.set_data(cleared, reset_boundaries=False)
+        track.clear_range(start_idx, end_idx)
         self._refresh_track_boundaries_from_audio(track)
         return False
 
     def _generate_unique_track_name(self, base_name: str) -> str:
-        existing = {t.name for t in self.project.get_tracks()}
+        existing = {t.name for t in self.project.tracks}
         if base_name not in existing:
             return base_name
         counter = 2
@@ -1293,14 +1324,11 @@ class MainWindow(QMainWindow):
             counter += 1
 
     def _clip_run_at_index(self, track: AudioTrack, sample_index: int) -> tuple[int, int] | None:
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return None
-        idx = int(np.clip(sample_index, 0, data.size - 1))
-        for start, end in self._find_audio_runs(track, threshold=self.drop_silence_threshold):
-            if start <= idx < end:
-                return start, end
-        return None
+        idx = int(np.clip(sample_index, 0, sample_count - 1))
+        return self.activity_detector.run_at(track, idx, self.drop_silence_threshold)
 
     def on_waveform_selection_changed(self, track: AudioTrack, start: float, end: float):
         self._select_track_from_waveform(track)
@@ -1311,15 +1339,15 @@ class MainWindow(QMainWindow):
         end_norm = float(np.clip(max(start, end), 0.0, 1.0))
         if abs(end_norm - start_norm) <= self.edit_cursor_click_threshold:
             cursor_position = float((start_norm + end_norm) * 0.5)
-            self.track_selection_ranges.pop(id(track), None)
-            self.track_edit_cursors[id(track)] = cursor_position
+            self.track_selection_ranges.pop(track.track_id, None)
+            self.track_edit_cursors[track.track_id] = cursor_position
             self.sync_waveform_for_track(track)
             self.sub_label.setText(f"Cursor set at {int(cursor_position * 100)}% on {track.name}")
             self.update_cut_controls()
             return
 
-        self.track_edit_cursors.pop(id(track), None)
-        self.track_selection_ranges[id(track)] = (start_norm, end_norm)
+        self.track_edit_cursors.pop(track.track_id, None)
+        self.track_selection_ranges[track.track_id] = (start_norm, end_norm)
         self.sync_waveform_for_track(track)
         self.sub_label.setText(
             f"Selected {int(start_norm * 100)}% - {int(end_norm * 100)}% on {track.name}"
@@ -1342,16 +1370,16 @@ class MainWindow(QMainWindow):
         if source_track is None:
             return
 
-        source_data = self._track_data_array(source_track)
-        if source_data.size == 0:
+        source_count = source_track.sample_count
+        if source_count == 0:
             return
 
-        src_start = int(np.clip(min(selection_start, selection_end), 0.0, 1.0) * source_data.size)
-        src_end = int(np.clip(max(selection_start, selection_end), 0.0, 1.0) * source_data.size)
+        src_start = int(np.clip(min(selection_start, selection_end), 0.0, 1.0) * source_count)
+        src_end = int(np.clip(max(selection_start, selection_end), 0.0, 1.0) * source_count)
         if src_end <= src_start:
             return
 
-        moved_segment = source_data[src_start:src_end].copy()
+        moved_segment = source_track.read(src_start, src_end)
         if moved_segment.size == 0:
             return
 
@@ -1556,15 +1584,15 @@ class MainWindow(QMainWindow):
             self.cut_track_forward(track, position)
 
     def select_entire_clip_at(self, track: AudioTrack, position: float):
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return
 
         idx = self._sample_index_from_normalized(track, position)
-        idx = int(np.clip(idx, 0, data.size - 1))
+        idx = int(np.clip(idx, 0, sample_count - 1))
         span = self._clip_span_at_index(track, idx)
         if span is None:
-            self.track_selection_ranges.pop(id(track), None)
+            self.track_selection_ranges.pop(track.track_id, None)
             self.sync_waveform_for_track(track)
             self.update_cut_controls()
             self.sub_label.setText(f"No clip at clicked position in {track.name}")
@@ -1572,11 +1600,11 @@ class MainWindow(QMainWindow):
         clip_start, clip_end = span
 
         self.track_selection_ranges.clear()
-        self.track_selection_ranges[id(track)] = (
-            clip_start / data.size,
-            clip_end / data.size,
+        self.track_selection_ranges[track.track_id] = (
+            clip_start / sample_count,
+            clip_end / sample_count,
         )
-        for existing_track in self.project.get_tracks():
+        for existing_track in self.project.tracks:
             self.sync_waveform_for_track(existing_track)
         self.update_cut_controls()
         self.sub_label.setText(f"Selected clip in {track.name}")
@@ -1584,130 +1612,77 @@ class MainWindow(QMainWindow):
     def update_cut_controls(self):
         has_selection = bool(self.track_selection_ranges)
         selected_track = self.get_selected_track()
-        has_cursor = selected_track is not None and id(selected_track) in self.track_edit_cursors
+        has_cursor = selected_track is not None and selected_track.track_id in self.track_edit_cursors
         can_cut = self.current_edit_tool in (self.TOOL_SELECT, self.TOOL_NONE) and (has_selection or has_cursor)
         self.cut_button.setEnabled(can_cut)
         self.copy_button.setEnabled(has_selection)
         self.paste_button.setEnabled(self.clipboard_audio.size > 0)
-        self.undo_button.setEnabled(len(self.undo_stack) > 0)
-        self.redo_button.setEnabled(len(self.redo_stack) > 0)
-
-    def capture_editor_state(self) -> dict:
-        selected_row = self.track_list.currentRow()
-        tracks_state = []
-        track_index_by_id: dict[int, int] = {}
-        tracks = self.project.get_tracks()
-        for idx, track in enumerate(tracks):
-            track_index_by_id[id(track)] = idx
-            tracks_state.append(
-                {
-                    "name": track.name,
-                    "sample_rate": track.sample_rate,
-                    "data": self._track_data_array(track).copy(),
-                    "file_path": track.file_path,
-                    "volume": track.volume,
-                    "muted": track.muted,
-                    "sample_boundaries": list(track.sample_boundaries),
-                }
-            )
-
-        selections_by_index: dict[int, tuple[float, float]] = {}
-        for track_id, selection in self.track_selection_ranges.items():
-            idx = track_index_by_id.get(track_id)
-            if idx is not None:
-                selections_by_index[idx] = selection
+        self.undo_button.setEnabled(self.history.can_undo())
+        self.redo_button.setEnabled(self.history.can_redo())
 
+    def _history_context(self) -> dict:
+        selected = self.get_selected_track()
         return {
-            "tracks": tracks_state,
-            "selected_row": selected_row,
-            "selections_by_index": selections_by_index,
+            "selected_track_id": selected.track_id if selected is not None else None,
+            "selections": dict(self.track_selection_ranges),
         }
 
-    def restore_editor_state(self, state: dict) -> None:
-        self._restoring_history = True
-        try:
-            restored_tracks: list[AudioTrack] = []
-            for item in state.get("tracks", []):
-                track = AudioTrack(
-                    name=item["name"],
-                    sample_rate=item["sample_rate"],
-                    data=np.asarray(item["data"], dtype=np.float32),
-                    file_path=item.get("file_path"),
-                    volume=item.get("volume", 1.0),
-                    muted=item.get("muted", False),
-                )
-                track.sample_boundaries = list(item.get("sample_boundaries", []))
-                track._normalize_boundaries()
-                restored_tracks.append(track)
-
-            self.project._tracks = restored_tracks
-            self.track_selection_ranges.clear()
-            self.track_edit_cursors.clear()
-            for idx, selection in state.get("selections_by_index", {}).items():
-                if 0 <= idx < len(restored_tracks):
-                    self.track_selection_ranges[id(restored_tracks[idx])] = tuple(selection)
-
-            self.stop_transport()
-            selected_row = state.get("selected_row", -1)
-            selected_track_id = None
-            if isinstance(selected_row, int) and 0 <= selected_row < len(restored_tracks):
-                selected_track_id = id(restored_tracks[selected_row])
-
-            self.refresh_track_list(selected_track_id=selected_track_id)
-            self.refresh_waveform_panel()
-            self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
-            self.update_cut_controls()
-        finally:
-            self._restoring_history = False
-
     def push_undo_state(self):
-        if self._restoring_history:
-            return
-        self.undo_stack.append(self.capture_editor_state())
-        if len(self.undo_stack) > self.max_history:
-            self.undo_stack.pop(0)
-        self.redo_stack.clear()
+        self.history.begin(self.project, self._history_context())
         self.update_cut_controls()
 
+    def _restore_after_history(self, transaction) -> None:
+        """Refresh the UI after undo/redo, rebuilding only the lanes that changed."""
+        self.stop_transport()
+        context = transaction.context
+        live_ids = {track.track_id for track in self.project.tracks}
+        self.track_selection_ranges.clear()
+        self.track_edit_cursors.clear()
+        for track_id, selection in context.get("selections", {}).items():
+            if track_id in live_ids:
+                self.track_selection_ranges[track_id] = tuple(selection)
+
+        self.refresh_track_list(selected_track_id=context.get("selected_track_id"))
+        self._sync_dirty_waveforms()
+        self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
+
     def handle_undo(self):
-        if not self.undo_stack:
+        if not self.history.can_undo():
             return
-        current_state = self.capture_editor_state()
-        state = self.undo_stack.pop()
-        self.redo_stack.append(current_state)
-        self.restore_editor_state(state)
+        transaction = self.history.undo(self.project, self._history_context())
+        if transaction is not None:
+            self._restore_after_history(transaction)
         self.update_cut_controls()
 
     def handle_redo(self):
-        if not self.redo_stack:
+        if not self.history.can_redo():
             return
-        current_state = self.capture_editor_state()
-        state = self.redo_stack.pop()
-        self.undo_stack.append(current_state)
-        self.restore_editor_state(state)
+        transaction = self.history.redo(self.project, self._history_context())
+        if transaction is not None:
+            self._restore_after_history(transaction)
         self.update_cut_controls()
 
     def _selection_for_copy(self) -> tuple[AudioTrack, int, int] | None:
         selected_track = self.get_selected_track()
-        if selected_track and id(selected_track) in self.track_selection_ranges:
-            selection = self.track_selection_ranges[id(selected_track)]
-            data = self._track_data_array(selected_track)
-            if data.size == 0:
+        if selected_track and selected_track.track_id in self.track_selection_ranges:
+            selection = self.track_selection_ranges[selected_track.track_id]
+            sample_count = selected_track.sample_count
+            if sample_count == 0:
                 return None
-            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * data.size)
-            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * data.size)
+            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * sample_count)
+            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * sample_count)
             if end > start:
                 return selected_track, start, end
 
-        for track in self.project.get_tracks():
-            selection = self.track_selection_ranges.get(id(track))
+        for track in self.project.tracks:
+            selection = self.track_selection_ranges.get(track.track_id)
             if not selection:
                 continue
-            data = self._track_data_array(track)
-            if data.size == 0:
+            sample_count = track.sample_count
+            if sample_count == 0:
                 continue
-            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * data.size)
-            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * data.size)
+            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * sample_count)
+            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * sample_count)
             if end > start:
                 return track, start, end
         return None
@@ -1717,8 +1692,7 @@ class MainWindow(QMainWindow):
         if selected is None:
             return
         track, start, end = selected
-        data = self._track_data_array(track)
-        self.clipboard_audio = data[start:end].copy()
+        self.clipboard_audio = track.read(start, end)
         self.clipboard_sample_rate = track.sample_rate
         self.sub_label.setText(f"Copied selection from {track.name}")
         self.update_cut_controls()
@@ -1729,7 +1703,7 @@ class MainWindow(QMainWindow):
 
         target_track = self.get_selected_track()
         if target_track is None:
-            tracks = self.project.get_tracks()
+            tracks = self.project.tracks
             target_track = tracks[0] if tracks else None
         if target_track is None:
             return
@@ -1741,12 +1715,12 @@ class MainWindow(QMainWindow):
             )
             return
 
-        target_data = self._track_data_array(target_track)
-        selection = self.track_selection_ranges.get(id(target_track))
+        target_count = target_track.sample_count
+        selection = self.track_selection_ranges.get(target_track.track_id)
         if selection:
-            base_index = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * target_data.size)
+            base_index = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * target_count)
         else:
-            base_index = target_data.size
+            base_index = target_count
 
         insert_index = target_track.nearest_boundary(base_index)
         self.push_undo_state()
@@ -1754,88 +1728,20 @@ class MainWindow(QMainWindow):
             return
 
         new_end = insert_index + self.clipboard_audio.size
-        total_len = max(1, len(target_track.data))
+        total_len = max(1, target_track.sample_count)
         self.track_selection_ranges.clear()
-        self.track_selection_ranges[id(target_track)] = (
+        self.track_selection_ranges[target_track.track_id] = (
             insert_index / total_len,
             new_end / total_len,
         )
         self.stop_transport()
-        for track in self.project.get_tracks():
-            self.sync_waveform_for_track(track)
+        self._sync_dirty_waveforms()
         self.sub_label.setText(f"Pasted into {target_track.name}")
         self.update_cut_controls()
 
-    def _read_wav_file(self, file_path: str) -> tuple[np.ndarray, int]:
-        with wave.open(file_path, "rb") as wav_file:
-            channels = wav_file.getnchannels()
-            sample_width = wav_file.getsampwidth()
-            sample_rate = wav_file.getframerate()
-            frame_count = wav_file.getnframes()
-            frames = wav_file.readframes(frame_count)
-
-        if sample_width == 1:
-            data = np.frombuffer(frames, dtype=np.uint8).astype(np.float32)
-            data = (data - 128.0) / 128.0
-        elif sample_width == 2:
-            data = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-        elif sample_width == 3:
-            raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
-            ints = (
-                raw[:, 0].astype(np.int32)
-                | (raw[:, 1].astype(np.int32) << 8)
-                | (raw[:, 2].astype(np.int32) << 16)
-            )
-            sign_bit = 1 << 23
-            ints = (ints ^ sign_bit) - sign_bit
-            data = ints.astype(np.float32) / float(1 << 23)
-        elif sample_width == 4:
-            data = np.frombuffer(frames, dtype=np.int32).astype(np.float32) / 2147483648.0
-        else:
-            raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
-
-        if channels > 1:
-            data = data.reshape(-1, channels).mean(axis=1)
-
-        return np.clip(data, -1.0, 1.0).astype(np.float32), sample_rate
-
-    def _write_wav_file(self, file_path: str, data: np.ndarray, sample_rate: int):
-        clipped = np.clip(np.asarray(data, dtype=np.float32), -1.0, 1.0)
-        pcm = (clipped * 32767.0).astype(np.int16)
-        with wave.open(file_path, "wb") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(pcm.tobytes())
-
-    def _render_project_mix(self) -> tuple[np.ndarray, int] | None:
-        tracks = self.project.get_tracks()
-        if not tracks:
-            return None
-
-        non_empty = [t for t in tracks if len(t.data) > 0]
-        if not non_empty:
-            return None
-
-        sample_rate = non_empty[0].sample_rate
-        max_len = max(len(t.data) for t in non_empty)
-        mix = np.zeros(max_len, dtype=np.float32)
-
-        for track in non_empty:
-            if track.muted:
-                continue
-            track_data = np.asarray(track.data, dtype=np.float32).flatten() * float(track.volume)
-            if len(track_data) < max_len:
-                track_data = np.pad(track_data, (0, max_len - len(track_data)))
-            mix += track_data
-
-        max_abs = np.max(np.abs(mix)) if mix.size > 0 else 0.0
-        if max_abs > 1.0:
-            mix = mix / max_abs
-
-        return mix.astype(np.float32), sample_rate
-
     def handle_insert_file(self):
+        if self.import_job is not None:
+            return
         paths, _ = QFileDialog.getOpenFileNames(
             self,
             "Insert Audio File",
@@ -1845,56 +1751,74 @@ class MainWindow(QMainWindow):
         if not paths:
             return
 
-        added_count = 0
-        for path in paths:
-            try:
-                audio_data, sample_rate = self._read_wav_file(path)
-            except Exception as exc:
-                QMessageBox.warning(self, "Insert File", f"Failed to load {path}:\n{exc}")
+        from audio_editor.services.file_import import FileImportJob
+
+        job = FileImportJob(paths)
+        job.start()
+        self.import_job = job
+        self._import_added_count = 0
+        self._import_errors = []
+        self.import_progress = QProgressDialog("Importing audio files...", "Cancel", 0, 1000, self)
+        self.import_progress.setWindowTitle("Insert File")
+        self.import_progress.setWindowModality(Qt.WindowModal)
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.canceled.connect(job.cancel)
+        self.import_timer.start()
+        self._poll_import_job()
+
+    def _poll_import_job(self):
+        """Add decoded files to the project in selection order as they become ready."""
+        from audio_editor.services.file_import import ImportCancelled
+
+        job = self.import_job
+        if job is None:
+            self.import_timer.stop()
+            return
+        added = False
+        for imported in job.take_ready():
+            if imported.error is not None:
+                if not isinstance(imported.error, ImportCancelled):
+                    self._import_errors.append(f"{imported.path}:\n{imported.error}")
                 continue
-            if added_count == 0:
+            if self._import_added_count == 0:
                 self.push_undo_state()
-
-            base_name = Path(path).stem or f"Track {self.project.track_count() + 1}"
-            track_name = self._generate_unique_track_name(base_name)
-            track = AudioTrack(
-                name=track_name,
-                sample_rate=sample_rate,
-                data=audio_data,
-                file_path=Path(path),
+            track = imported.track
+            track.name = self._generate_unique_track_name(
+                imported.path.stem or f"Track {self.project.track_count() + 1}"
             )
-
-            add_use_case = AddTrackToProject(self.project)
-            add_use_case.execute(track)
-            added_count += 1
-
-        if added_count == 0:
+            AddTrackToProject(self.project).execute(track)
+            self._import_added_count += 1
+            added = True
+        if added:
+            self.refresh_track_list()
+            self._sync_dirty_waveforms()
+        if not job.finished:
+            self.import_progress.setValue(int(job.progress * 1000))
             return
 
-        self.refresh_track_list()
-        self.refresh_waveform_panel()
-        self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
+        self.import_timer.stop()
+        self.import_job = None
+        self.import_progress.canceled.disconnect(job.cancel)
+        self.import_progress.close()
+        self.import_progress.deleteLater()
+        self.import_progress = None
+        if self._import_errors:
+            QMessageBox.warning(self, "Insert File", "Failed to load:\n\n" + "\n\n".join(self._import_errors))
+        if self._import_added_count:
+            self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
         self.update_cut_controls()
 
     def save_project_to_path(self, file_path: str):
-        payload = {
-            "version": 1,
-            "name": self.project.name,
-            "tracks": [
-                {
-                    "name": track.name,
-                    "sample_rate": track.sample_rate,
-                    "data": self._track_data_array(track).tolist(),
-                    "file_path": str(track.file_path) if track.file_path else None,
-                    "volume": track.volume,
-                    "muted": track.muted,
-                    "sample_boundaries": list(track.sample_boundaries),
-                }
-                for track in self.project.get_tracks()
-            ],
-        }
-        with open(file_path, "w", encoding="utf-8") as out_file:
-            json.dump(payload, out_file)
+        from audio_editor.infrastructure.persistence.project_file import save_project
+
+        # Playback and the mix cache hold sample snapshots that may map the file being replaced.
+        self.audio_engine.stop()
+        if self.transport_mode in ("play_track", "play_project"):
+            self.stop_transport()
+        if self.mix_cache is not None:
+            self.mix_cache.close()
+            self.mix_cache = None
+        save_project(self.project, file_path, history=self.history)
         self.project_file_path = file_path
         self.sub_label.setText(f"Saved project: {os.path.basename(file_path)}")
 
@@ -1903,7 +1827,7 @@ class MainWindow(QMainWindow):
             self,
             "Save Project As",
             self.project_file_path or "project.vcoreproj",
-            "VibeCore Project (*.vcoreproj);;JSON Files (*.json)",
+            "VibeCore Project (*.vcoreproj)",
         )
         if not path:
             return
@@ -1916,32 +1840,16 @@ class MainWindow(QMainWindow):
         self.save_project_to_path(self.project_file_path)
 
     def load_project_from_path(self, file_path: str):
-        with open(file_path, "r", encoding="utf-8") as in_file:
-            payload = json.load(in_file)
-
-        tracks_payload = payload.get("tracks", [])
-        restored_tracks: list[AudioTrack] = []
-        for item in tracks_payload:
-            track = AudioTrack(
-                name=item["name"],
-                sample_rate=int(item["sample_rate"]),
-                data=np.asarray(item.get("data", []), dtype=np.float32),
-                file_path=Path(item["file_path"]) if item.get("file_path") else None,
-                volume=float(item.get("volume", 1.0)),
-                muted=bool(item.get("muted", False)),
-            )
-            track.sample_boundaries = list(item.get("sample_boundaries", []))
-            track._normalize_boundaries()
-            restored_tracks.append(track)
+        from audio_editor.infrastructure.persistence.project_file import load_project
 
+        loaded = load_project(file_path)
         self.stop_transport()
-        self.project._tracks = restored_tracks
-        self.project.name = str(payload.get("name", "My Project"))
+        self.project.replace_tracks(loaded.get_tracks())
+        self.project.name = loaded.name
         self.track_selection_ranges.clear()
         self.track_edit_cursors.clear()
         self.project_file_path = file_path
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+        self.history.clear()
         self.refresh_track_list()
         self.refresh_waveform_panel()
         self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
@@ -1962,29 +1870,100 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Open Project", f"Failed to open project:\n{exc}")
 
     def handle_export_mix(self):
-        rendered = self._render_project_mix()
-        if rendered is None:
+        if not any(track.sample_count > 0 for track in self.project.tracks):
             QMessageBox.information(self, "Export Mix", "Nothing to export.")
             return
-        mix_data, sample_rate = rendered
 
-        path, _ = QFileDialog.getSaveFileName(
+        path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Export Mix",
             "project_mix.wav",
-            "WAV Files (*.wav)",
+            ";;".join(self.EXPORT_FORMAT_FILTERS),
         )
         if not path:
             return
+        sample_format = self.EXPORT_FORMAT_FILTERS.get(selected_filter, "pcm16")
+        from audio_editor.services.mix_export import export_mix_wav
+
         try:
-            self._write_wav_file(path, mix_data, sample_rate)
+            export_mix_wav(self.project.get_tracks(), path, sample_format=sample_format)
             self.sub_label.setText(f"Exported mix: {os.path.basename(path)}")
         except Exception as exc:
             QMessageBox.warning(self, "Export Mix", f"Failed to export mix:\n{exc}")
 
+    def handle_export_stems(self):
+        if self.stem_job is not None:
+            return
+        from audio_editor.services.stem_export import StemExportJob, track_stems
+
+        stems = track_stems(self.project.tracks)
+        if not stems:
+            QMessageBox.information(self, "Export Stems", "Nothing to export.")
+            return
+
+        directory = QFileDialog.getExistingDirectory(self, "Export Stems To")
+        if not directory:
+            return
+        format_name, ok = QInputDialog.getItem(
+            self, "Export Stems", "Format:", list(self.EXPORT_FORMAT_FILTERS), 0, False
+        )
+        if not ok:
+            return
+
+        job = StemExportJob(stems, directory, sample_format=self.EXPORT_FORMAT_FILTERS[format_name])
+        existing = [path.name for path in job.paths if path.exists()]
+        if existing:
+            answer = QMessageBox.question(
+                self,
+                "Export Stems",
+                "Overwrite existing files?\n\n" + "\n".join(existing),
+            )
+            if answer != QMessageBox.Yes:
+                return
+        job.start()
+        self.stem_job = job
+        self._stem_errors = []
+        self._stem_written = 0
+        self.stem_progress = QProgressDialog("Exporting stems...", "Cancel", 0, 1000, self)
+        self.stem_progress.setWindowTitle("Export Stems")
+        self.stem_progress.setWindowModality(Qt.WindowModal)
+        self.stem_progress.setMinimumDuration(300)
+        self.stem_progress.canceled.connect(job.cancel)
+        self.stem_timer.start()
+        self._poll_stem_job()
+
+    def _poll_stem_job(self):
+        from audio_editor.services.stem_export import ExportCancelled
+
+        job = self.stem_job
+        if job is None:
+            self.stem_timer.stop()
+            return
+        for exported in job.take_ready():
+            if exported.error is None:
+                self._stem_written += 1
+            elif not isinstance(exported.error, ExportCancelled):
+                self._stem_errors.append(f"{exported.path.name}:\n{exported.error}")
+        if not job.finished:
+            self.stem_progress.setValue(int(job.progress * 1000))
+            return
+
+        self.stem_timer.stop()
+        self.stem_job = None
+        self.stem_progress.canceled.disconnect(job.cancel)
+        self.stem_progress.close()
+        self.stem_progress.deleteLater()
+        self.stem_progress = None
+        if self._stem_errors:
+            QMessageBox.warning(self, "Export Stems", "Failed to export:\n\n" + "\n\n".join(self._stem_errors))
+        if job.cancelled:
+            self.sub_label.setText("Stem export cancelled")
+        else:
+            self.sub_label.setText(f"Exported {self._stem_written} stem(s) to {job.directory.name or job.directory}")
+
     def handle_delete_key(self):
         selected_track = self.get_selected_track()
-        has_cursor = selected_track is not None and id(selected_track) in self.track_edit_cursors
+        has_cursor = selected_track is not None and selected_track.track_id in self.track_edit_cursors
         if self.current_edit_tool in (self.TOOL_SELECT, self.TOOL_NONE) and (self.track_selection_ranges or has_cursor):
             self.handle_cut_selection()
             return
@@ -1997,7 +1976,7 @@ class MainWindow(QMainWindow):
             selected_track = self.get_selected_track()
             if selected_track is None:
                 return
-            cursor_position = self.track_edit_cursors.get(id(selected_track))
+            cursor_position = self.track_edit_cursors.get(selected_track.track_id)
             if cursor_position is None:
                 return
             self.split_track_at(selected_track, cursor_position)
@@ -2005,29 +1984,27 @@ class MainWindow(QMainWindow):
 
         self.push_undo_state()
         changed = False
-        for track in self.project.get_tracks():
-            selection = self.track_selection_ranges.get(id(track))
+        for track in self.project.tracks:
+            selection = self.track_selection_ranges.get(track.track_id)
             if not selection:
                 continue
 
-            data = self._track_data_array(track)
-            if data.size == 0:
+            sample_count = track.sample_count
+            if sample_count == 0:
                 continue
 
-            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * data.size)
-            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * data.size)
+            start = int(np.clip(min(selection[0], selection[1]), 0.0, 1.0) * sample_count)
+            end = int(np.clip(max(selection[0], selection[1]), 0.0, 1.0) * sample_count)
             if end <= start:
                 continue
 
             track.cut_range(start, end)
-            self.sync_waveform_for_track(track)
             changed = True
 
         if changed:
             self.stop_transport()
             self.track_selection_ranges.clear()
-            for track in self.project.get_tracks():
-                self.sync_waveform_for_track(track)
+            self._sync_dirty_waveforms()
             self.sub_label.setText("Selection cut")
         self.update_cut_controls()
 
@@ -2041,20 +2018,20 @@ class MainWindow(QMainWindow):
             self.sub_label.setText("Split sample marker ignored (edge or duplicate)")
 
     def split_track_at(self, track: AudioTrack, position: float):
-        data = self._track_data_array(track)
-        if data.size < 2:
+        sample_count = track.sample_count
+        if sample_count < 2:
             QMessageBox.information(self, "Split Tool", "Track is too short to split.")
             return
 
         split_index = self._sample_index_from_normalized(track, position)
-        if split_index <= 0 or split_index >= data.size:
+        if split_index <= 0 or split_index >= sample_count:
             QMessageBox.information(self, "Split Tool", "Click inside the waveform to split.")
             return
 
         self.push_undo_state()
-        first_part = data[:split_index].copy()
-        second_part = data[split_index:].copy()
-        track.set_data(first_part, reset_boundaries=True)
+        second_part = track.read(split_index, sample_count)
+        track.cut_range(split_index, sample_count)
+        track.reset_boundaries()
 
         new_track_name = self._generate_unique_track_name(f"{track.name} (Part 2)")
         new_track = AudioTrack(
@@ -2068,16 +2045,16 @@ class MainWindow(QMainWindow):
 
         self.project.insert_track_after(track, new_track)
 
-        self.track_selection_ranges.pop(id(track), None)
+        self.track_selection_ranges.pop(track.track_id, None)
         self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
         self.stop_transport()
-        self.refresh_track_list(selected_track_id=id(track))
-        self.refresh_waveform_panel()
+        self.refresh_track_list(selected_track_id=track.track_id)
+        self._sync_dirty_waveforms()
         self.update_cut_controls()
 
     def cut_track_backward(self, track: AudioTrack, position: float):
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return
         cut_index = self._sample_index_from_normalized(track, position)
         run = self._clip_run_at_index(track, cut_index)
@@ -2089,14 +2066,14 @@ class MainWindow(QMainWindow):
             return
         self.push_undo_state()
         track.cut_range(clip_start, cut_end)
-        self.track_selection_ranges.pop(id(track), None)
+        self.track_selection_ranges.pop(track.track_id, None)
         self.stop_transport()
         self.sync_waveform_for_track(track)
         self.update_cut_controls()
 
     def cut_track_forward(self, track: AudioTrack, position: float):
-        data = self._track_data_array(track)
-        if data.size == 0:
+        sample_count = track.sample_count
+        if sample_count == 0:
             return
         cut_index = self._sample_index_from_normalized(track, position)
         run = self._clip_run_at_index(track, cut_index)
@@ -2108,7 +2085,7 @@ class MainWindow(QMainWindow):
             return
         self.push_undo_state()
         track.cut_range(cut_start, clip_end)
-        self.track_selection_ranges.pop(id(track), None)
+        self.track_selection_ranges.pop(track.track_id, None)
         self.stop_transport()
         self.sync_waveform_for_track(track)
         self.update_cut_controls()
@@ -2131,7 +2108,7 @@ class MainWindow(QMainWindow):
             item_text = item.text()
             track_name = item_text.split(" (")[0]
         
-        track_to_delete = next((t for t in self.project.get_tracks() if t.name == track_name), None)
+        track_to_delete = next((t for t in self.project.tracks if t.name == track_name), None)
 
         if not track_to_delete:
             QMessageBox.warning(self, "Error", "Track not found in project.")
@@ -2142,15 +2119,15 @@ class MainWindow(QMainWindow):
         delete_use_case = DeleteTrackFromProject(self.project)
         delete_use_case.execute(track_to_delete)
 
-        if id(track_to_delete) in self.transport_track_ids or id(track_to_delete) == self.transport_record_track_id:
+        if track_to_delete.track_id in self.transport_track_ids or track_to_delete.track_id == self.transport_record_track_id:
             self.stop_transport()
 
         # Remove from sidebar
-        self.track_selection_ranges.pop(id(track_to_delete), None)
-        self.track_edit_cursors.pop(id(track_to_delete), None)
+        self.track_selection_ranges.pop(track_to_delete.track_id, None)
+        self.track_edit_cursors.pop(track_to_delete.track_id, None)
         self.refresh_track_list()
         self.sub_label.setText(f"{self.project.track_count()} track(s) in project")
-        self.refresh_waveform_panel()
+        self._sync_dirty_waveforms()
         self.update_cut_controls()
 
     def handle_rename_track(self):
@@ -2170,7 +2147,7 @@ class MainWindow(QMainWindow):
             item_text = item.text()
             track_name = item_text.split(" (")[0]
         
-        track_to_rename = next((t for t in self.project.get_tracks() if t.name == track_name), None)
+        track_to_rename = next((t for t in self.project.tracks if t.name == track_name), None)
 
         if not track_to_rename:
             QMessageBox.warning(self, "Error", "Track not found in project.")
@@ -2211,7 +2188,7 @@ class MainWindow(QMainWindow):
             item_text = item.text()
             track_name = item_text.split(" (")[0]
         
-        return next((t for t in self.project.get_tracks() if t.name == track_name), None)
+        return next((t for t in self.project.tracks if t.name == track_name), None)
 
 
     def handle_play(self):
@@ -2220,46 +2197,47 @@ class MainWindow(QMainWindow):
             print("No track selected")
             return
         
-        print(f"Attempting to play {track.name}: muted={track.muted}, volume={track.volume}, data_len={len(track.data)}")
+        print(f"Attempting to play {track.name}: muted={track.muted}, volume={track.volume}, data_len={track.sample_count}")
         
         if track.muted:
             print(f"Track {track.name} is muted, skipping playback")
             return
             
-        if len(track.data) == 0:
+        if track.sample_count == 0:
             print(f"Track {track.name} has no data")
             return
 
         self.stop_transport()
         data_to_play = np.array(track.data, dtype="float32") * track.volume
         self.audio_engine.play(data_to_play, track.sample_rate)
-        duration_seconds = len(track.data) / max(track.sample_rate, 1)
-        self.start_transport("play_track", {id(track)}, duration_seconds)
+        duration_seconds = track.sample_count / max(track.sample_rate, 1)
+        self.start_transport("play_track", {track.track_id}, duration_seconds)
         print(f"Playing {track.name}")
 
     
     def handle_play_project(self):
-        if not self.project.get_tracks():
+        if not self.project.tracks:
             QMessageBox.information(self, "Info", "No tracks to play.")
             return
 
         self.stop_transport()
         from audio_editor.use_cases.play_project import PlayProject
-        play_use_case = PlayProject(self.audio_engine)
+        if self.mix_cache is None:
+            from audio_editor.services.mix_cache import MixCache
+            self.mix_cache = MixCache(self.project)
+        play_use_case = PlayProject(self.audio_engine, self.mix_cache)
         play_use_case.execute(self.project.get_tracks())
         durations = [
-            len(t.data) / max(t.sample_rate, 1)
-            for t in self.project.get_tracks()
-            if len(t.data) > 0
+            t.sample_count / max(t.sample_rate, 1)
+            for t in self.project.tracks
+            if t.sample_count > 0
         ]
         max_duration = max(durations) if durations else 0.0
-        track_ids = {id(t) for t in self.project.get_tracks()}
+        track_ids = {t.track_id for t in self.project.tracks}
         self.start_transport("play_project", track_ids, max_duration)
 
-    def _find_track_by_id(self, track_id: int | None):
-        if track_id is None:
-            return None
-        return next((t for t in self.project.get_tracks() if id(t) == track_id), None)
+    def _find_track_by_id(self, track_id: str | None):
+        return self.project.get_track(track_id)
 
     def _stop_active_recording(self) -> bool:
         """Stop and commit an active recording session if one is running."""
@@ -2297,25 +2275,31 @@ class MainWindow(QMainWindow):
             if not track:
                 return
             self.stop_transport()
-            # Freeze the pre-record track waveform so live preview extends from it.
-            self.transport_record_base_audio = np.array(track.data, dtype=np.float32).copy()
+            waveform = self.track_waveform_widgets.get(track.track_id)
+            if waveform is not None:
+                # The live preview grows from a snapshot of the pre-record audio.
+                waveform.begin_live_audio(track.sample_snapshot(), track.peaks)
             start_use_case = StartRecording(self.audio_engine)
             start_use_case.execute(track.sample_rate)
             self.record_button.setText("■")
             self.record_button.setToolTip("Stop Recording")
             self.start_transport(
                 "record",
-                {id(track)},
+                {track.track_id},
                 0.0,
-                record_track_id=id(track),
+                record_track_id=track.track_id,
                 record_sample_rate=track.sample_rate,
-                record_base_duration_seconds=(len(track.data) / max(track.sample_rate, 1)),
+                record_base_duration_seconds=(track.sample_count / max(track.sample_rate, 1)),
             )
         else:
             self._stop_active_recording()
 
             # Update the track name label (not needed for sample count since we use widgets now)
     
+    def start_audio_warm_up(self):
+        """Load and initialize the audio backend off the UI thread, so the first Play does not stall."""
+        threading.Thread(target=self.audio_engine.warm_up, name="audio-warm-up", daemon=True).start()
+
     def on_volume_changed(self, track, value):
         """Handle volume slider changes"""
         track.volume = value / 100
@@ -2331,6 +2315,8 @@ def main():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # Runs once the event loop has painted the window.
+    QTimer.singleShot(0, window.start_audio_warm_up)
     sys.exit(app.exec())
 
 
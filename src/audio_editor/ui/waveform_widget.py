@@ -6,6 +6,9 @@ from PySide6.QtCore import Qt, Signal, QMimeData
 from PySide6.QtGui import QColor, QPainter, QPen, QDrag
 from PySide6.QtWidgets import QWidget
 
+from audio_editor.domain.peak_pyramid import PeakPyramid
+from audio_editor.domain.sample_store import SampleStore
+
 
 class WaveformWidget(QWidget):
     """Simple waveform preview widget for a mono or stereo numpy signal."""
@@ -16,6 +19,11 @@ class WaveformWidget(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._audio_data = np.array([], dtype=np.float32)
+        self._peak_source: PeakPyramid | None = None
+        self._live_store: SampleStore | None = None
+        self._peaks_cache: np.ndarray | None = None
+        # (source kind, width, source id, source version); arrays have no version and use 0.
+        self._peaks_cache_key: tuple[str, int, int, int] | None = None
         self._playhead_position: float | None = None
         self._edit_cursor_position: float | None = None
         self._segment_markers: list[float] = []
@@ -37,8 +45,69 @@ class WaveformWidget(QWidget):
             self._audio_data = np.array([], dtype=np.float32)
         else:
             self._audio_data = self._normalize_to_mono(np.asarray(data, dtype=np.float32))
+        self._peak_source = None
+        self._live_store = None
+        self._peaks_cache_key = None
+        self.update()
+
+    def set_peak_source(self, pyramid: PeakPyramid | None) -> None:
+        """Draw from a track's peak pyramid instead of scanning raw samples."""
+        self._audio_data = np.array([], dtype=np.float32)
+        self._peak_source = pyramid
+        self._live_store = None
+        self._peaks_cache_key = None
+        self.update()
+
+    def begin_live_audio(self, base: SampleStore | None = None, base_peaks: PeakPyramid | None = None) -> None:
+        """
+        Start a growing waveform (e.g. a recording) on top of existing samples.
+
+        Passing the pyramid that already summarizes `base` avoids rescanning it.
+        """
+        self._start_live_audio(base, base_peaks)
+
+    def _start_live_audio(self, base: SampleStore | None, base_peaks: PeakPyramid | None) -> tuple[SampleStore, PeakPyramid]:
+        self._audio_data = np.array([], dtype=np.float32)
+        store = base if base is not None else SampleStore()
+        peaks = base_peaks.fork(store) if base_peaks is not None else PeakPyramid(store)
+        self._live_store = store
+        self._peak_source = peaks
+        self._peaks_cache_key = None
+        self.update()
+        return store, peaks
+
+    def append_audio(self, block: np.ndarray) -> None:
+        """Extend a live waveform; only peak buckets covering the new tail are computed."""
+        store, peaks = self._live_store, self._peak_source
+        if store is None or peaks is None:
+            store, peaks = self._start_live_audio(None, None)
+        samples = self._normalize_to_mono(np.asarray(block, dtype=np.float32))
+        if samples.size == 0:
+            return
+        end = len(store)
+        store.splice(end, end, samples)
+        peaks.invalidate(end, end, end + samples.size)
         self.update()
 
+    def _peaks_for_width(self, width: int) -> np.ndarray | None:
+        """Return per-pixel peaks, reusing the last result until data or width change."""
+        if self._peak_source is not None:
+            self._peak_source.refresh()
+            if self._peak_source.sample_count == 0:
+                return None
+            key = ("pyramid", width, id(self._peak_source), self._peak_source.version)
+        else:
+            if self._audio_data.size == 0:
+                return None
+            key = ("array", width, id(self._audio_data), 0)
+        if key != self._peaks_cache_key or self._peaks_cache is None:
+            if self._peak_source is not None:
+                self._peaks_cache = self._peak_source.peak_envelope(width)
+            else:
+                self._peaks_cache = self.build_peaks(self._audio_data, width)
+            self._peaks_cache_key = key
+        return self._peaks_cache
+
     def set_playhead_position(self, position: float | None) -> None:
         """Set playhead location as normalized [0,1], or None to hide it."""
         if position is None:
@@ -108,16 +177,12 @@ class WaveformWidget(QWidget):
         if data.size == 0:
             return np.zeros(bins, dtype=np.float32)
 
-        clipped = np.clip(data.astype(np.float32), -1.0, 1.0)
-        chunk_size = max(1, int(np.ceil(len(clipped) / bins)))
-
-        peaks: list[float] = []
-        for start in range(0, len(clipped), chunk_size):
-            chunk = clipped[start : start + chunk_size]
-            peaks.append(float(np.max(np.abs(chunk))))
+        magnitudes = np.abs(np.clip(data.astype(np.float32), -1.0, 1.0))
+        chunk_size = max(1, int(np.ceil(len(magnitudes) / bins)))
+        peaks = np.maximum.reduceat(magnitudes, np.arange(0, len(magnitudes), chunk_size))
 
         if len(peaks) < bins:
-            peaks.extend([0.0] * (bins - len(peaks)))
+            peaks = np.concatenate([peaks, np.zeros(bins - len(peaks), dtype=np.float32)])
 
         return np.asarray(peaks[:bins], dtype=np.float32)
 
@@ -141,10 +206,9 @@ class WaveformWidget(QWidget):
         painter.setPen(axis_pen)
         painter.drawLine(0, int(mid_y), width, int(mid_y))
 
-        if self._audio_data.size == 0:
+        peaks = self._peaks_for_width(width)
+        if peaks is None:
             return
-
-        peaks = self.build_peaks(self._audio_data, width)
         # Draw contiguous clip-region blocks (not per-pixel stripes).
         clip_bg_color = QColor(110, 231, 255, 24)
         active = peaks > 1e-3
@@ -1,11 +1,15 @@
+from __future__ import annotations
+
 from typing import List
 from audio_editor.services.audio_engine import AudioEngine
+from audio_editor.services.mix_cache import MixCache
 from audio_editor.domain.audio_track import AudioTrack
 
 
 class PlayProject:
-    def __init__(self, audio_engine: AudioEngine):
+    def __init__(self, audio_engine: AudioEngine, mix_cache: MixCache | None = None):
         self.audio_engine = audio_engine
+        self.mix_cache = mix_cache
 
     def execute(self, tracks: List[AudioTrack]):
-        self.audio_engine.play_project(tracks)
+        self.audio_engine.play_project(tracks, mix_cache=self.mix_cache)
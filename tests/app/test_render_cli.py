@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from audio_editor.app.render_cli import main
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.project import Project
+from audio_editor.infrastructure.audio.wav_file import read_wav
+from audio_editor.infrastructure.persistence.project_file import save_project
+
+
+def _save(tmp_path):
+    project = Project("Song")
+    for name, value in (("Kick", 0.25), ("Snare", 0.125), ("Bass", 0.5)):
+        project.add_track(AudioTrack(name=name, sample_rate=100, data=np.full(400, value, dtype=np.float32)))
+    path = tmp_path / "song.vcoreproj"
+    save_project(project, path)
+    return path
+
+
+def test_mix_region_of_selected_tracks(tmp_path):
+    project = _save(tmp_path)
+    output = tmp_path / "mix.wav"
+
+    code = main(["mix", str(project), str(output), "--format", "float32", "--start", "1", "--end", "2.5", "--track", "Kick", "--track", "Bass"])
+
+    samples, rate = read_wav(output)
+    assert code == 0 and rate == 100
+    assert np.allclose(samples, np.full(150, 0.75))
+
+
+def test_stems_with_groups(tmp_path):
+    project = _save(tmp_path)
+
+    code = main(["stems", str(project), str(tmp_path / "stems"), "--format", "float32", "--group", "Drums=Kick,Snare", "--track", "Bass"])
+
+    drums, _ = read_wav(tmp_path / "stems" / "Drums.wav")
+    bass, _ = read_wav(tmp_path / "stems" / "Bass.wav")
+    assert code == 0
+    assert np.allclose(drums, 0.375) and np.allclose(bass, 0.5)
+    assert main(["stems", str(project), str(tmp_path), "--track", "Missing"]) == 2
+
+
+def test_import_pulls_in_no_gui_or_audio_device():
+    script = "import sys, audio_editor.app.render_cli; print(sorted(m for m in sys.modules if m.split('.')[0] in ('PySide6', 'sounddevice')))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
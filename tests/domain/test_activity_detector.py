@@ -0,0 +1,37 @@
+import numpy as np
+
+from audio_editor.domain.activity_detector import ActivityDetector, moving_average_envelope
+from audio_editor.domain.audio_track import AudioTrack
+
+
+def test_envelope_matches_convolution():
+    samples = np.random.default_rng(3).uniform(-1, 1, 257).astype(np.float32)
+
+    for window in (1, 4, 7):
+        expected = np.convolve(np.abs(samples), np.ones(window) / window, mode="same")
+        assert np.allclose(moving_average_envelope(samples, window), expected, atol=1e-6)
+
+
+def test_runs_merge_short_gaps_and_split_long_ones():
+    data = np.zeros(1000, dtype=np.float32)
+    data[100:200] = 0.5
+    data[250:300] = 0.5  # 50-sample gap: merged (limit is 200 ms = 200 samples)
+    data[700:800] = 0.5
+
+    runs = ActivityDetector().detect(data, sample_rate=1000)
+
+    assert runs == [(91, 310), (691, 810)]
+
+
+def test_runs_are_cached_until_the_track_changes():
+    track = AudioTrack(name="A", sample_rate=1000, data=np.zeros(1000, dtype=np.float32))
+    track.place_data_at(400, np.full(100, 0.5, dtype=np.float32), overwrite_silence_only=False)
+    detector = ActivityDetector()
+
+    first = detector.runs(track)
+    assert detector.runs(track) is first
+    assert detector.run_at(track, 450) == first[0]
+    assert detector.run_at(track, 10) is None
+
+    track.clear_range(0, 1000)
+    assert detector.runs(track) == []
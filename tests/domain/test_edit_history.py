@@ -0,0 +1,75 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.edit_history import EditHistory
+from audio_editor.domain.project import Project
+
+
+def _project_with(*tracks):
+    project = Project("History")
+    for track in tracks:
+        project.add_track(track)
+    return project
+
+
+def test_undo_redo_restores_samples_and_boundaries():
+    track = AudioTrack(name="A", sample_rate=10, data=np.arange(8, dtype=np.float32))
+    project = _project_with(track)
+    history = EditHistory()
+
+    history.begin(project)
+    track.cut_range(2, 5)
+    track.insert_data(1, np.ones(2, dtype=np.float32))
+    edited = track.data.copy()
+    edited_boundaries = track.sample_boundaries.tolist()
+
+    history.undo(project)
+    assert np.array_equal(track.data, np.arange(8, dtype=np.float32))
+    assert track.sample_boundaries == [8]
+
+    history.redo(project)
+    assert np.array_equal(track.data, edited)
+    assert track.sample_boundaries == edited_boundaries
+
+
+def test_history_only_stores_removed_samples():
+    track = AudioTrack(name="A", sample_rate=10, data=np.zeros(100_000, dtype=np.float32))
+    project = _project_with(track)
+    history = EditHistory()
+
+    history.begin(project)
+    track.cut_range(0, 10)
+    history.close(project)
+
+    assert history.nbytes < 1024
+
+
+def test_memory_budget_drops_oldest_entries():
+    track = AudioTrack(name="A", sample_rate=10, data=np.zeros(1000, dtype=np.float32))
+    project = _project_with(track)
+    history = EditHistory(memory_budget_bytes=1500)
+
+    for _ in range(3):
+        history.begin(project)
+        track.cut_range(0, 200)
+    history.close(project)
+
+    assert history.undo(project) is not None
+    assert not history.can_undo()
+    assert track.sample_count == 600
+
+
+def test_undo_restores_track_order_and_parameters():
+    first = AudioTrack(name="A", sample_rate=10, data=np.zeros(4, dtype=np.float32))
+    second = AudioTrack(name="B", sample_rate=10, data=np.zeros(4, dtype=np.float32))
+    project = _project_with(first, second)
+    history = EditHistory()
+
+    history.begin(project)
+    project.remove_track(first)
+    second.volume = 0.5
+    second.rename("Renamed")
+
+    history.undo(project)
+    assert [t.name for t in project.get_tracks()] == ["A", "B"]
+    assert second.volume == 1.0
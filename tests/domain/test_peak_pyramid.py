@@ -0,0 +1,81 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.peak_pyramid import PeakPyramid
+from audio_editor.domain.sample_store import SampleStore
+
+
+def _full_rebuild(samples: np.ndarray) -> PeakPyramid:
+    return PeakPyramid(SampleStore(samples), bucket_sizes=(4, 16)).refresh()
+
+
+def test_levels_summarize_min_max_and_rms():
+    samples = np.array([0.5, -1.0, 0.25, 0.0, 1.0, 1.0], dtype=np.float32)
+
+    pyramid = _full_rebuild(samples)
+    mins, maxs, rms = pyramid.level(0)
+
+    assert np.allclose(mins, [-1.0, 1.0])
+    assert np.allclose(maxs, [0.5, 1.0])
+    assert np.allclose(rms, [np.sqrt((0.25 + 1.0 + 0.0625) / 4), 1.0])
+
+
+def test_track_edits_refresh_to_same_result_as_full_rebuild():
+    rng = np.random.default_rng(7)
+    track = AudioTrack(name="Peaks", sample_rate=10, data=rng.uniform(-1, 1, 200).astype(np.float32))
+    track._peaks = PeakPyramid(track._store, bucket_sizes=(4, 16))
+    track.peaks.refresh()
+
+    track.place_data_at(40, np.full(10, 0.9, dtype=np.float32), overwrite_silence_only=False)
+    track.insert_data(101, rng.uniform(-1, 1, 7).astype(np.float32))
+    track.cut_range(3, 9)
+    track.peaks.refresh()
+
+    expected = _full_rebuild(np.asarray(track.data))
+    for level in range(2):
+        for actual, wanted in zip(track.peaks.level(level), expected.level(level)):
+            assert np.allclose(actual, wanted)
+
+
+def test_peak_envelope_matches_brute_force_peaks_on_bucket_aligned_bins():
+    samples = np.linspace(-1.0, 1.0, 64, dtype=np.float32)
+    pyramid = _full_rebuild(samples)
+
+    envelope = pyramid.peak_envelope(4)
+
+    expected = np.abs(samples).reshape(4, 16).max(axis=1)
+    assert np.allclose(envelope, expected)
+
+
+def test_appending_to_a_forked_pyramid_only_extends_the_tail():
+    base = SampleStore(np.linspace(-1.0, 1.0, 40, dtype=np.float32))
+    original = PeakPyramid(base, bucket_sizes=(4, 16)).refresh()
+    live = original.fork(base.snapshot())
+
+    for _ in range(5):
+        block = np.full(6, 0.5, dtype=np.float32)
+        end = len(live._source)
+        live._source.splice(end, end, block)
+        live.invalidate(end, end, end + block.size)
+        live.refresh()
+
+    expected = _full_rebuild(live._source.to_array())
+    for level in range(2):
+        for actual, wanted in zip(live.level(level), expected.level(level)):
+            assert np.allclose(actual, wanted)
+
+
+def test_snapshot_keeps_describing_the_samples_it_was_taken_from():
+    track = AudioTrack(name="Peaks", sample_rate=10, data=np.zeros(64, dtype=np.float32))
+    track._peaks = PeakPyramid(track._store, bucket_sizes=(4, 16))
+    track.place_data_at(8, np.ones(4, dtype=np.float32), overwrite_silence_only=False)
+    frozen = track.peaks.snapshot(track.sample_snapshot())
+
+    track.cut_range(0, 40)
+    track.place_data_at(0, np.ones(24, dtype=np.float32), overwrite_silence_only=False)
+    track.peaks.refresh()
+
+    assert frozen.sample_count == 64
+    assert frozen.audible_spans(0, 64) == [(8, 64)]
+    assert frozen.max_abs(20, 64) == 0.0
+    assert track.peaks.max_abs(0, 24) == 1.0
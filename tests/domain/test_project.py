@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.project import Project
+
+
+def _track(name):
+    return AudioTrack(name=name, sample_rate=10, data=np.zeros(4, dtype=np.float32))
+
+
+def test_tracks_are_found_by_stable_id():
+    project = Project("Lookup")
+    a, b, c = _track("A"), _track("B"), _track("C")
+    project.add_track(a)
+    project.add_track(c)
+    project.insert_track_after(a, b)
+
+    assert project.get_track(b.track_id) is b
+    assert [project.index_of(t.track_id) for t in (a, b, c)] == [0, 1, 2]
+    project.remove_track(a)
+    assert project.get_track(a.track_id) is None
+    assert project.index_of(c.track_id) == 1
+    assert a.track_id != b.track_id
+
+
+def test_tracks_view_is_live_and_rejects_duplicate_ids():
+    project = Project("View")
+    a = _track("A")
+    view = project.tracks
+    project.add_track(a)
+
+    assert list(view) == [a] and view[0] is a
+    with pytest.raises(ValueError):
+        project.add_track(AudioTrack(name="Copy", sample_rate=10, data=np.zeros(1, dtype=np.float32), track_id=a.track_id))
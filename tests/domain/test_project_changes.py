@@ -0,0 +1,54 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.project import (
+    PARAMS_CHANGED,
+    SAMPLES_CHANGED,
+    TRACK_ADDED,
+    TRACK_REMOVED,
+    TRACKS_REORDERED,
+    Project,
+)
+
+
+def _track(name, size=10):
+    return AudioTrack(name=name, sample_rate=10, data=np.zeros(size, dtype=np.float32))
+
+
+def test_project_reports_structure_sample_and_param_changes():
+    project = Project("Events")
+    events = []
+    project.subscribe(events.append)
+    first, second = _track("A"), _track("B")
+
+    project.add_track(first)
+    project.add_track(second)
+    first.clear_range(2, 4)
+    second.volume = 0.5
+    project.replace_tracks([second, first])
+    project.remove_track(second)
+    second.volume = 0.25
+
+    assert [(e.kind, e.track.name if e.track else None) for e in events] == [
+        (TRACK_ADDED, "A"),
+        (TRACK_ADDED, "B"),
+        (SAMPLES_CHANGED, "A"),
+        (PARAMS_CHANGED, "B"),
+        (TRACKS_REORDERED, None),
+        (TRACK_REMOVED, "B"),
+    ]
+    assert (events[2].start, events[2].stop) == (2, 4)
+
+
+def test_track_version_and_dirty_range_accumulate_until_taken():
+    track = _track("A", size=100)
+    version = track.version
+
+    track.clear_range(10, 20)
+    track.clear_range(50, 60)
+    assert track.version == version + 2
+    assert track.take_dirty_range() == (10, 60)
+    assert track.dirty_range is None
+
+    track.insert_data(30, np.ones(5, dtype=np.float32))
+    assert track.take_dirty_range() == (30, 105)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.range_max_tree import RangeMaxTree
+
+
+def test_query_and_first_above_follow_updates_and_resizes():
+    values = np.array([0.1, 0.0, 0.7, 0.2, 0.0], dtype=np.float32)
+    tree = RangeMaxTree(values)
+
+    assert tree.query(0, 5) == np.float32(0.7)
+    assert tree.query(3, 5) == np.float32(0.2)
+    assert tree.first_above(0, 0.15) == 2
+    assert tree.first_above(3, 0.5) is None
+
+    tree.update(3, np.array([0.9], dtype=np.float32))
+    tree.resize(9)
+    tree.update(8, np.array([0.95], dtype=np.float32))
+    assert tree.first_above(4, 0.9) == 8
+    tree.resize(4)
+    assert tree.query(0, 9) == np.float32(0.9)
+
+
+def test_track_silence_queries_use_the_index():
+    data = np.zeros(5000, dtype=np.float32)
+    data[3001] = 0.5
+    track = AudioTrack(name="A", sample_rate=1000, data=data)
+
+    assert track.is_silent(0, 3001)
+    assert not track.is_silent(2900, 3100, threshold=0.1)
+    assert track.next_audio_index(100) == 3001
+    assert track.next_audio_index(3002) is None
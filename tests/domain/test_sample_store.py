@@ -0,0 +1,46 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.sample_store import SampleStore
+
+
+def test_splice_inserts_without_touching_existing_buffers():
+    original = np.arange(6, dtype=np.float32)
+    store = SampleStore(original)
+
+    removed = store.splice(2, 2, np.array([9.0, 9.0], dtype=np.float32))
+
+    assert removed == []
+    assert store.piece_count == 3
+    assert np.array_equal(store.to_array(), np.array([0, 1, 9, 9, 2, 3, 4, 5], dtype=np.float32))
+
+
+def test_splice_returns_removed_pieces_across_boundaries():
+    store = SampleStore([np.arange(3, dtype=np.float32), np.arange(3, 6, dtype=np.float32)])
+
+    removed = store.splice(1, 5)
+
+    assert np.array_equal(np.concatenate(removed), np.array([1, 2, 3, 4], dtype=np.float32))
+    assert np.array_equal(store.read(0, len(store)), np.array([0, 5], dtype=np.float32))
+
+
+def test_to_array_is_cached_until_next_edit():
+    store = SampleStore([np.ones(2, dtype=np.float32), np.zeros(2, dtype=np.float32)])
+
+    first = store.to_array()
+    assert store.to_array() is first
+    assert not first.flags.writeable
+
+    store.splice(0, 1)
+    assert store.to_array() is not first
+
+
+def test_track_data_is_materialized_lazily_after_edits():
+    track = AudioTrack(name="Lazy", sample_rate=10, data=np.zeros(4, dtype=np.float32))
+
+    track.insert_data(2, np.ones(2, dtype=np.float32))
+
+    assert "data" not in track.__dict__
+    assert track.sample_count == 6
+    assert np.array_equal(track.data, np.array([0, 0, 1, 1, 0, 0], dtype=np.float32))
+    assert track.sample_boundaries == [4, 6]
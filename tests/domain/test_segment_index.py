@@ -0,0 +1,52 @@
+from audio_editor.domain.segment_index import SegmentIndex
+
+
+def test_lookups_use_sorted_boundaries():
+    index = SegmentIndex([300, 100, 200, 100])
+
+    assert index.tolist() == [100, 200, 300]
+    assert index.nearest(149) == 100
+    assert index.nearest(150) == 100  # ties resolve to the smaller boundary
+    assert index.next_after(200) == 300
+    assert index.previous_before(200) == 100
+    assert index.next_after(300) is None
+    assert index.previous_before(100) is None
+
+
+def test_add_rejects_duplicates():
+    index = SegmentIndex([10])
+
+    assert index.add(5) is True
+    assert index.add(10) is False
+    assert index == [5, 10]
+
+
+def test_shift_from_moves_only_later_boundaries():
+    index = SegmentIndex([10, 20, 30])
+
+    index.shift_from(20, 5)
+
+    assert index == [10, 25, 35]
+
+
+def test_ripple_cut_drops_and_pulls_back_boundaries():
+    index = SegmentIndex([10, 20, 30, 40])
+
+    index.ripple_cut(15, 30)
+
+    assert index == [10, 25]
+
+
+def test_many_inserts_and_removals_stay_sorted_across_blocks():
+    values = list(range(0, 20000, 7))
+    index = SegmentIndex()
+    for value in reversed(values):
+        index.add(value)
+    for value in values[::3]:
+        index.discard(value)
+
+    expected = [v for i, v in enumerate(values) if i % 3]
+    assert index.tolist() == expected and len(index) == len(expected)
+    assert len(index._blocks) > 1
+    assert index.next_after(7) == 14 and index.previous_before(21) == 14
+    assert index.nearest(10004) == 10003
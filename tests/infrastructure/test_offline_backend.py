@@ -0,0 +1,61 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from audio_editor.infrastructure.audio.backend import CallbackStop
+from audio_editor.infrastructure.audio.offline_backend import OfflineBackend
+from audio_editor.infrastructure.audio.wav_file import read_wav
+
+
+def test_manual_clock_runs_blocks_in_time_order():
+    backend = OfflineBackend(input=lambda start, frames: np.arange(start, start + frames, dtype=np.float32))
+    calls = []
+
+    def record(name):
+        def callback(data, frames, time, status):
+            calls.append((name, round(time.currentTime, 6), float(data[0, 0])))
+        return callback
+
+    backend.open_input(100, 1, record("in"), block_size=30).start()
+    backend.open_output(40, 1, record("out"), block_size=10).start()
+    backend.advance(0.6)
+
+    assert calls == [
+        ("out", 0.25, 0.0),
+        ("in", 0.3, 0.0),
+        ("out", 0.5, 0.0),
+        ("in", 0.6, 30.0),
+    ]
+    assert backend.time == 0.6
+
+
+def test_paced_clock_streams_output_to_file(tmp_path):
+    path = tmp_path / "out.wav"
+    with OfflineBackend(speed=math.inf, output_path=path) as backend:
+        backend.play(np.linspace(-1, 1, 1000, dtype=np.float32), 8000)
+        [stream] = backend.streams
+        while stream.active:
+            time.sleep(0.001)
+        assert stream.stats.callbacks == 2 and stream.load >= 0.0
+        # Without capture=True nothing accumulates in memory.
+        with pytest.raises(RuntimeError):
+            backend.captured_output()
+
+    samples, rate = read_wav(path)
+    assert rate == 8000 and samples.size == 1024
+    assert np.array_equal(samples[:1000], np.linspace(-1, 1, 1000, dtype=np.float32))
+
+
+def test_callback_stop_finishes_after_current_block():
+    backend = OfflineBackend(capture=True)
+
+    def callback(data, frames, time, status):
+        data.fill(0.5)
+        raise CallbackStop
+
+    backend.open_output(100, 2, callback, block_size=4).start()
+
+    assert backend.run_until_idle() == 1
+    assert backend.captured_output().shape == (4, 2)
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.peak_pyramid import PeakPyramid
+from audio_editor.domain.project import Project
+from audio_editor.infrastructure.persistence.peak_file import load_peaks, peak_file_path, save_peaks
+from audio_editor.infrastructure.persistence.project_file import load_project, save_project
+
+
+def test_project_reopens_with_cached_peaks(tmp_path, monkeypatch):
+    project = Project("Peaks")
+    rng = np.random.default_rng(5)
+    for name in "AB":
+        project.add_track(AudioTrack(name=name, sample_rate=8000, data=rng.uniform(-1, 1, 70000).astype(np.float32)))
+    path = tmp_path / "peaks.vcoreproj"
+    save_project(project, path)
+
+    def no_scan(self, first, last):
+        raise AssertionError("peaks were rebuilt from samples")
+
+    monkeypatch.setattr(PeakPyramid, "_rebuild_base", no_scan)
+    loaded = load_project(path)
+
+    assert peak_file_path(path).exists()
+    for original, track in zip(project.tracks, loaded.tracks):
+        assert np.array_equal(track.peaks.peak_envelope(300), original.peaks.peak_envelope(300))
+        assert track.peaks.max_abs(0, track.sample_count) == original.peaks.max_abs(0, original.sample_count)
+
+
+def test_stale_sidecar_is_ignored(tmp_path):
+    media = tmp_path / "take.wav"
+    media.write_bytes(b"x" * 1000)
+    track = AudioTrack(name="T", sample_rate=10, data=np.ones(600, dtype=np.float32))
+    assert save_peaks(media, {"mono": track.peaks})
+    assert load_peaks(media)["mono"].sample_count == 600
+
+    media.write_bytes(b"y" * 1000)
+    os.utime(media, ns=(0, 0))
+
+    assert load_peaks(media) == {}
@@ -0,0 +1,106 @@
+import json
+import weakref
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.edit_history import EditHistory
+from audio_editor.domain.project import Project
+from audio_editor.infrastructure.persistence.project_file import MAGIC, load_project, save_project
+from audio_editor.services.mix_cache import MixCache
+
+
+def test_container_round_trips_tracks(tmp_path):
+    project = Project("Song")
+    track = AudioTrack(name="Vox", sample_rate=48000, data=np.linspace(-1, 1, 1000, dtype=np.float32), volume=0.5)
+    track.insert_data(10, np.ones(5, dtype=np.float32))
+    project.add_track(track)
+    project.add_track(AudioTrack(name="Empty", sample_rate=44100, data=np.array([], dtype=np.float32), muted=True))
+    path = tmp_path / "song.vcoreproj"
+
+    save_project(project, path)
+    loaded = load_project(path)
+
+    assert path.read_bytes().startswith(MAGIC)
+    assert loaded.name == "Song"
+    vox, empty = loaded.get_tracks()
+    assert vox.track_id == track.track_id and loaded.get_track(track.track_id) is vox
+    assert np.array_equal(vox.data, track.data)
+    assert vox.sample_boundaries == track.sample_boundaries.tolist()
+    assert (vox.sample_rate, vox.volume) == (48000, 0.5)
+    assert empty.sample_count == 0 and empty.muted
+
+
+def test_loads_version_1_json(tmp_path):
+    path = tmp_path / "old.vcoreproj"
+    path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "name": "Old",
+                "tracks": [
+                    {
+                        "name": "A",
+                        "sample_rate": 8000,
+                        "data": [0.0, 0.5, -0.5, 0.25],
+                        "file_path": None,
+                        "volume": 1.0,
+                        "muted": False,
+                        "sample_boundaries": [2, 4],
+                    }
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    loaded = load_project(path)
+
+    (track,) = loaded.get_tracks()
+    assert np.array_equal(track.data, np.array([0.0, 0.5, -0.5, 0.25], dtype=np.float32))
+    assert track.sample_boundaries == [2, 4]
+
+
+def test_container_tracks_are_memory_mapped_until_edited(tmp_path):
+    project = Project("Mapped")
+    project.add_track(AudioTrack(name="A", sample_rate=8000, data=np.arange(100, dtype=np.float32)))
+    path = tmp_path / "mapped.vcoreproj"
+    save_project(project, path)
+
+    (track,) = load_project(path).get_tracks()
+    (piece,) = track._store.iter_chunks(0, track.sample_count)
+    assert not piece.flags.owndata and not piece.flags.writeable
+
+    track.cut_range(10, 20)
+    assert track.read(0, 12).tolist() == [*range(10), 20, 21]
+
+
+def test_saving_over_the_mapped_file_releases_the_mapping(tmp_path):
+    project = Project("Mapped")
+    project.add_track(AudioTrack(name="A", sample_rate=8000, data=np.arange(100, dtype=np.float32)))
+    project.add_track(AudioTrack(name="B", sample_rate=8000, data=np.ones(50, dtype=np.float32)))
+    path = tmp_path / "mapped.vcoreproj"
+    save_project(project, path)
+    loaded = load_project(path, mmap=True)
+    track, untouched = loaded.get_tracks()
+    mapping = next(track._store.iter_chunks(0, 1))
+    while not isinstance(mapping, np.memmap):
+        mapping = mapping.base
+    mapping = weakref.ref(mapping)
+    history = EditHistory()
+    history.begin(loaded)
+    track.cut_range(10, 20)
+    history.close(loaded)
+    assert untouched.data.size == 50
+    # Rendering queues background fills that hold snapshots until the cache is closed.
+    cache = MixCache(loaded, block_frames=32)
+    cache.prepare(loaded.get_tracks()).render(0, 16, np.empty(16, dtype=np.float32))
+    cache.close()
+
+    save_project(loaded, path, history=history)
+
+    # On Windows os.replace fails while any view of the old mapping is alive.
+    assert mapping() is None
+    assert load_project(path).get_tracks()[0].read(0, 12).tolist() == [*range(10), 20, 21]
+    history.undo(loaded)
+    assert track.read(0, 100).tolist() == list(range(100))
@@ -0,0 +1,87 @@
+import os
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from audio_editor.infrastructure.audio.wav_file import WavWriter, probe_wav, read_wav, write_wav
+
+
+def _write(path, frames: bytes, width: int, channels: int = 1, rate: int = 8000):
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(width)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(frames)
+
+
+def test_probe_reads_header_only(tmp_path):
+    path = tmp_path / "stereo.wav"
+    _write(path, np.zeros(2 * 300, dtype=np.int16).tobytes(), width=2, channels=2, rate=22050)
+
+    info = probe_wav(path)
+
+    assert (info.sample_rate, info.channels, info.sample_width, info.frames) == (22050, 2, 2, 300)
+
+
+@pytest.mark.parametrize("block_frames", [7, 1 << 16])
+def test_blocks_decode_24_bit_stereo(tmp_path, block_frames):
+    ints = np.array([0, 1, -1, 8388607, -8388608, 4096, -70000, 123456], dtype=np.int32)
+    frames = b"".join(struct.pack("<i", int(v))[:3] for v in ints)
+    path = tmp_path / "pcm24.wav"
+    _write(path, frames, width=3, channels=2)
+
+    samples, rate = read_wav(path, block_frames=block_frames)
+
+    expected = (ints.astype(np.float32) / float(1 << 23)).reshape(-1, 2).mean(axis=1)
+    assert rate == 8000
+    assert np.allclose(samples, np.clip(expected, -1.0, 1.0))
+
+
+def test_decodes_8_and_16_bit(tmp_path):
+    path8, path16 = tmp_path / "u8.wav", tmp_path / "s16.wav"
+    _write(path8, bytes([0, 128, 255]), width=1)
+    _write(path16, np.array([-32768, 0, 16384], dtype="<i2").tobytes(), width=2)
+
+    assert np.allclose(read_wav(path8)[0], [-1.0, 0.0, 127 / 128])
+    assert np.allclose(read_wav(path16)[0], [-1.0, 0.0, 0.5])
+
+
+@pytest.mark.parametrize("sample_format, tolerance", [("pcm16", 2 / 32767), ("pcm24", 2 / 8388607), ("pcm32", 1e-7), ("float32", 0)])
+def test_writer_round_trips_every_format(tmp_path, sample_format, tolerance):
+    samples = np.linspace(-1.0, 1.0, 1001, dtype=np.float32)
+    path = tmp_path / f"{sample_format}.wav"
+
+    frames = write_wav(path, [samples[:500], samples[500:]], 96000, sample_format)
+    decoded, rate = read_wav(path)
+
+    assert (frames, rate) == (1001, 96000)
+    assert np.allclose(decoded, samples, atol=tolerance, rtol=0)
+
+
+def test_float32_data_is_written_verbatim(tmp_path):
+    samples = np.array([0.25, -1.5, 2.0], dtype=np.float32)
+    path = tmp_path / "float.wav"
+
+    write_wav(path, samples, 8000, "float32")
+
+    info = probe_wav(path)
+    assert info.is_float and info.sample_width == 4
+    assert path.read_bytes()[info.data_offset :][:12] == samples.tobytes()
+
+
+def test_rf64_sizes_come_from_ds64(tmp_path):
+    path = tmp_path / "big.wav"
+    data_bytes = 0x1_0000_0000
+    with WavWriter(path, 48000, "pcm16") as writer:
+        # Pretend the data passed the RIFF limit so close() switches to RF64.
+        writer.data_bytes = data_bytes
+    header_size = path.stat().st_size
+    os.truncate(path, header_size + data_bytes)  # sparse; nothing is written
+
+    info = probe_wav(path)
+
+    with open(path, "rb") as handle:
+        assert handle.read(4) == b"RF64"
+    assert (info.data_offset, info.frames) == (header_size, data_bytes // 2)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.offline_backend import OfflineBackend
+from audio_editor.services.audio_engine import AudioEngine
+from audio_editor.services.mixer import Mixer
+
+
+def test_recording_captures_backend_input():
+    signal = np.sin(np.arange(2000, dtype=np.float32) / 10.0)
+    backend = OfflineBackend(input=signal)
+    engine = AudioEngine(backend)
+    block = backend.DEFAULT_BLOCK_SIZE
+
+    engine.start_recording(1000)
+    backend.advance((block - 1) / 1000)
+    partial = engine.recorded_frame_count()
+    backend.advance((block + 1) / 1000)
+    recorded = engine.stop_recording()
+
+    assert partial == 0
+    assert np.array_equal(recorded, signal[: 2 * block])
+
+
+def test_project_playback_is_captured_block_by_block():
+    tracks = [
+        AudioTrack(name="A", sample_rate=100, data=np.linspace(-0.5, 0.5, 90, dtype=np.float32)),
+        AudioTrack(name="B", sample_rate=100, data=np.full(40, 0.25, dtype=np.float32), volume=0.5),
+    ]
+    backend = OfflineBackend(capture=True)
+    engine = AudioEngine(backend)
+
+    engine.play_project(tracks, block_size=16)
+    blocks = backend.run_until_idle()
+
+    # The block after the end is silent: the callback only learns there that the project ended.
+    expected = np.zeros(112, dtype=np.float32)
+    Mixer(tracks).render(0, 90, expected)
+    [stream] = backend.streams
+    assert blocks == 7 and stream.stats.frames == 112 and not stream.active
+    assert np.array_equal(backend.captured_output(), expected)
+
+
+def test_default_backend_is_loaded_on_warm_up(monkeypatch):
+    monkeypatch.setenv("VIBECORE_AUDIO_BACKEND", "offline")
+    engine = AudioEngine()
+
+    assert engine._backend is None
+    assert engine.warm_up() and engine.backend.name == "offline"
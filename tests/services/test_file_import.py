@@ -0,0 +1,50 @@
+import wave
+
+import numpy as np
+
+from audio_editor.services.file_import import FileImportJob, ImportCancelled
+
+
+def _write(path, samples):
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes((np.asarray(samples) * 32767).astype(np.int16).tobytes())
+
+
+def test_results_come_back_in_selection_order_with_peaks(tmp_path):
+    paths = []
+    for i, size in enumerate([30000, 10, 5000]):
+        path = tmp_path / f"take{i}.wav"
+        _write(path, np.full(size, 0.1 * (i + 1)))
+        paths.append(path)
+    broken = tmp_path / "broken.wav"
+    broken.write_bytes(b"not a wav")
+    job = FileImportJob(paths[:2] + [broken] + paths[2:], max_workers=3)
+
+    job.start()
+    results = job.wait()
+
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert isinstance(results[2].error, ValueError)
+    tracks = [r.track for r in results if r.track is not None]
+    assert [t.name for t in tracks] == ["take0", "take1", "take2"]
+    assert [t.sample_count for t in tracks] == [30000, 10, 5000]
+    assert tracks[2].peaks.sample_count == 5000
+    assert job.finished and job.progress == 1.0
+
+
+def test_cancel_stops_pending_files(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.wav"
+        _write(path, np.zeros(100))
+        paths.append(path)
+    job = FileImportJob(paths, max_workers=1)
+    job.cancel()
+
+    job.start()
+    results = job.wait()
+
+    assert all(isinstance(r.error, ImportCancelled) for r in results)
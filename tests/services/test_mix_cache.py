@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.domain.project import Project
+from audio_editor.services.mix_cache import MixCache
+from audio_editor.services.mixer import Mixer
+
+
+def _project():
+    project = Project("Mix")
+    rng = np.random.default_rng(3)
+    for name, size in (("A", 1000), ("B", 700), ("C", 300)):
+        data = (rng.standard_normal(size) * 0.1).astype(np.float32)
+        project.add_track(AudioTrack(name=name, sample_rate=100, data=data))
+    return project
+
+
+def _render(mix):
+    out = np.empty(mix.length, dtype=np.float32)
+    mix.render(0, mix.length, out)
+    return out
+
+
+def _filled(mix):
+    mix.fill(0, mix.length)
+    return mix
+
+
+def _fresh(project):
+    return _render(Mixer(project.get_tracks()))
+
+
+def test_unchanged_project_is_served_from_cache():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+
+    first = _render(_filled(cache.prepare(project.get_tracks())))
+    second = _render(cache.prepare(project.get_tracks()))
+
+    assert cache.stats.rendered == 8
+    assert cache.stats.hits == 2 * 8
+    assert np.array_equal(first, second)
+    assert np.allclose(second, _fresh(project))
+
+
+def test_edit_rerenders_only_overlapping_blocks():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+    _filled(cache.prepare(project.get_tracks()))
+
+    project.tracks[1].clear_range(300, 400)
+    mixed = _render(_filled(cache.prepare(project.get_tracks())))
+
+    assert cache.stats.rendered == 8 + 2
+    assert np.allclose(mixed, _fresh(project))
+
+
+def test_volume_and_mute_changes_patch_cached_blocks():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+    _filled(cache.prepare(project.get_tracks()))
+
+    project.tracks[0].volume = 0.25
+    project.tracks[2].muted = True
+    mixed = _render(_filled(cache.prepare(project.get_tracks())))
+
+    assert cache.stats.rendered == 8
+    assert cache.stats.updated == 8
+    assert np.allclose(mixed, _fresh(project), atol=1e-6)
+
+
+def test_mix_prepared_before_an_edit_does_not_store_stale_blocks():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+    before = cache.prepare(project.get_tracks())
+
+    project.tracks[0].clear_range(0, 1000)
+    _render(before)
+    before.fill(0, before.length)
+    mixed = _render(cache.prepare(project.get_tracks()))
+    cache.close()
+
+    assert cache.stats.hits == 0
+    assert np.allclose(mixed, _fresh(project))
+
+
+def test_misses_are_mixed_at_the_requested_size_and_filled_in_the_background():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+    mix = cache.prepare(project.get_tracks())
+
+    out = np.empty(32, dtype=np.float32)
+    mix.render(200, 232, out)
+    cache.close()
+
+    assert np.allclose(out, _fresh(project)[200:232])
+    # Closing waits for the background worker.
+    assert cache.stats.rendered == 1
+
+
+def test_render_does_not_wait_for_the_cache_lock():
+    project = _project()
+    cache = MixCache(project, block_frames=128)
+    mix = _filled(cache.prepare(project.get_tracks()))
+    project.tracks[0].volume = 0.5
+    mix = cache.prepare(project.get_tracks())
+    out = np.empty(mix.length, dtype=np.float32)
+
+    with cache._lock:
+        # Stands in for the UI thread invalidating blocks during an edit.
+        renderer = threading.Thread(target=mix.render, args=(0, mix.length, out))
+        renderer.start()
+        renderer.join(timeout=5)
+        assert not renderer.is_alive()
+    cache.close()
+
+    assert np.allclose(out, _fresh(project), atol=1e-6)
@@ -0,0 +1,37 @@
+import wave
+
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.services.mix_export import export_mix_wav
+
+
+def _read_pcm(path):
+    with wave.open(str(path), "rb") as wav_file:
+        return wav_file.getframerate(), np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+
+def test_streamed_export_matches_full_mix(tmp_path):
+    rng = np.random.default_rng(3)
+    first = AudioTrack(name="A", sample_rate=8000, data=rng.uniform(-0.4, 0.4, 5000).astype(np.float32), volume=0.5)
+    second = AudioTrack(name="B", sample_rate=8000, data=rng.uniform(-0.4, 0.4, 3001).astype(np.float32))
+    path = tmp_path / "mix.wav"
+
+    frames = export_mix_wav([first, second], path, block_size=512)
+
+    expected = first.data * np.float32(0.5)
+    expected[: second.sample_count] += second.data
+    rate, pcm = _read_pcm(path)
+    assert (frames, rate) == (5000, 8000)
+    assert np.array_equal(pcm, (expected * 32767.0).astype(np.int16))
+
+
+def test_loud_export_is_normalized_from_peaks(tmp_path):
+    data = np.zeros(2048, dtype=np.float32)
+    data[700] = 2.0
+    path = tmp_path / "loud.wav"
+
+    export_mix_wav([AudioTrack(name="Loud", sample_rate=8000, data=data)], path, block_size=256)
+
+    _, pcm = _read_pcm(path)
+    assert pcm[700] == 32767 and np.count_nonzero(pcm) == 1
@@ -0,0 +1,68 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.services.mixer import Mixer
+from audio_editor.services.playback import ProjectPlayback
+
+
+def test_blocks_match_full_mix():
+    first = AudioTrack(name="A", sample_rate=10, data=np.full(25, 0.25, dtype=np.float32), volume=0.5)
+    first.insert_data(5, np.full(3, 0.75, dtype=np.float32))
+    second = AudioTrack(name="B", sample_rate=10, data=np.full(10, 0.5, dtype=np.float32))
+    muted = AudioTrack(name="C", sample_rate=10, data=np.ones(40, dtype=np.float32), muted=True)
+    playback = ProjectPlayback([first, second, muted], block_size=8)
+
+    blocks = []
+    out = np.empty(8, dtype=np.float32)
+    while playback.render(out):
+        blocks.append(out.copy())
+
+    expected = np.zeros(40, dtype=np.float32)
+    expected[: first.sample_count] += first.data * 0.5
+    expected[: second.sample_count] += second.data
+    assert np.allclose(np.concatenate(blocks), expected)
+
+
+def test_loud_mix_is_scaled_into_range():
+    tracks = [AudioTrack(name=str(i), sample_rate=10, data=np.full(16, 0.8, dtype=np.float32)) for i in range(2)]
+    playback = ProjectPlayback(tracks, block_size=16)
+
+    out = np.empty(16, dtype=np.float32)
+    playback.render(out)
+
+    assert np.allclose(out, 1.0)
+
+
+def test_mixer_skips_silence_and_renders_any_window():
+    data = np.zeros(5000, dtype=np.float32)
+    data[1200:1300] = 0.5
+    data[4000] = -0.25
+    quiet = AudioTrack(name="Q", sample_rate=10, data=data)
+    steady = AudioTrack(name="S", sample_rate=10, data=np.full(3000, 0.1, dtype=np.float32), volume=0.5)
+    mixer = Mixer([quiet, steady])
+
+    spans = mixer.sources[0].audible_spans(0, 5000)
+    out = np.empty(2000, dtype=np.float32)
+    frames = mixer.render(3500, 5500, out)
+
+    assert sum(stop - start for start, stop in spans) <= 2 * 16 * 256
+    expected = np.zeros(2000, dtype=np.float32)
+    expected[500] = -0.25
+    assert frames == 2000 and np.array_equal(out, expected)
+    mixer.render(1000, 1400, out)
+    assert np.allclose(out[:400], data[1000:1400] + 0.05)
+
+
+def test_parallel_blocks_match_serial_render():
+    rng = np.random.default_rng(5)
+    tracks = [
+        AudioTrack(name=str(i), sample_rate=10, data=(rng.standard_normal(3000 + 700 * i) * 0.2).astype(np.float32))
+        for i in range(4)
+    ]
+    mixer = Mixer(tracks)
+    expected = np.empty(mixer.length, dtype=np.float32)
+    mixer.render(0, mixer.length, expected)
+
+    blocks = [block.copy() for block in mixer.iter_blocks(0, mixer.length, 512, workers=3)]
+
+    assert np.array_equal(np.concatenate(blocks), expected)
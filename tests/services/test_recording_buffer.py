@@ -0,0 +1,26 @@
+import numpy as np
+
+from audio_editor.services.recording_buffer import RecordingBuffer
+
+
+def test_writes_span_chunks_and_read_since_returns_only_new_frames():
+    buffer = RecordingBuffer(chunk_frames=4)
+    buffer.write(np.arange(3, dtype=np.float32).reshape(-1, 1))
+
+    first, position = buffer.read_since(0)
+    buffer.write(np.arange(3, 10, dtype=np.float32).reshape(-1, 1))
+    second, position = buffer.read_since(position)
+
+    assert first.tolist() == [0, 1, 2]
+    assert second.tolist() == list(range(3, 10))
+    assert position == buffer.frames == 10
+    assert buffer.read().tolist() == list(range(10))
+
+
+def test_read_since_is_empty_without_new_frames():
+    buffer = RecordingBuffer(chunk_frames=4)
+    buffer.write(np.ones(4, dtype=np.float32))
+
+    data, position = buffer.read_since(4)
+
+    assert data.size == 0 and position == 4
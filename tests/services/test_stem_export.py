@@ -0,0 +1,46 @@
+import numpy as np
+
+from audio_editor.domain.audio_track import AudioTrack
+from audio_editor.infrastructure.audio.wav_file import read_wav
+from audio_editor.services.mix_export import export_mix_wav
+from audio_editor.services.stem_export import ExportCancelled, Stem, StemExportJob, track_stems
+
+
+def _tracks():
+    rng = np.random.default_rng(8)
+    return [
+        AudioTrack(name="Drums", sample_rate=8000, data=rng.uniform(-0.8, 0.8, 5000).astype(np.float32)),
+        AudioTrack(name="Bass", sample_rate=8000, data=rng.uniform(-0.8, 0.8, 3000).astype(np.float32), volume=0.5),
+        AudioTrack(name="Drums", sample_rate=8000, data=rng.uniform(-0.8, 0.8, 4000).astype(np.float32)),
+        AudioTrack(name="Muted", sample_rate=8000, data=np.ones(100, dtype=np.float32), muted=True),
+    ]
+
+
+def test_stems_add_up_to_the_mix(tmp_path):
+    tracks = _tracks()
+    job = StemExportJob(track_stems(tracks), tmp_path, sample_format="float32", block_size=512, max_workers=3)
+    job.start()
+    results = job.wait()
+
+    assert [r.path.name for r in results] == ["Drums.wav", "Bass.wav", "Drums (2).wav"]
+    assert all(r.error is None for r in results) and job.progress == 1.0
+    export_mix_wav(tracks, tmp_path / "mix.wav", sample_format="float32")
+    mix, _ = read_wav(tmp_path / "mix.wav")
+    total = np.zeros_like(mix)
+    for result in results:
+        stem, rate = read_wav(result.path)
+        assert rate == 8000 and stem.size == result.frames
+        total[: stem.size] += stem
+    assert np.allclose(total, mix, atol=1e-6)
+
+
+def test_cancelled_export_leaves_no_files(tmp_path):
+    tracks = _tracks()
+    job = StemExportJob([Stem("All", tuple(tracks))], tmp_path, block_size=256)
+    job.cancel()
+    job.start()
+
+    [result] = job.wait()
+
+    assert isinstance(result.error, ExportCancelled)
+    assert list(tmp_path.iterdir()) == []